@@ -6,13 +6,14 @@ package_root = os.path.abspath("../../../packages")
 sys.path.append(os.path.join(package_root, "ingest-logic", "src"))
 sys.path.append(os.path.join(package_root, "contracts", "src"))
      
+from ingest_logic.archive import read_id_scheme
 from ingest_logic.people.manager import PersonManager
  
 # Point to the backend's local tmp_data
 ROOT_DIR = os.path.abspath("tmp_data")
 print(f"Creating person in: {ROOT_DIR}")
  
-manager = PersonManager(ROOT_DIR)
+manager = PersonManager(ROOT_DIR, id_scheme=read_id_scheme(ROOT_DIR))
  
 person = manager.create_person(
     family="Doe",
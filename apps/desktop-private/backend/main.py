@@ -1,18 +1,29 @@
-from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Request, UploadFile, File, Form
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
-from ingest_logic.common.fs_utils import write_safe, write_safe_stream
-from ingest_logic.common.yaml_utils import load_yaml, save_yaml
-from ingest_logic.people.manager import PersonManager
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.requests import ClientDisconnect
+from ingest_logic.common import metrics
+from ingest_logic.common.fs_utils import StreamWriteResult, fsync_dir, write_safe, write_safe_stream
+from ingest_logic.common.yaml_utils import load_yaml
+from ingest_logic.recordings.uploads import CompletedUpload, UploadBusy, UploadCorrupt, UploadNotFound, UploadOffsetMismatch, UploadSession
 from ingest_logic.transcription import TranscriptionManager
+from ingest_logic.transcription.audio import discard_derived
+from ingest_logic.transcription.cache import TranscriptCache
+from ingest_logic.transcription.progress import PartialTranscript, ProgressTracker
+from ingest_logic.transcription.segments import to_vtt
+from ingest_logic.transcription.queue import TranscriptionJob, TranscriptionQueue, parse_provider_limits
 from ingest_logic.config import ConfigManager
 from pydantic import BaseModel
+import asyncio
+import json
 import os
+from typing import Optional
 import shutil
+import time
 from routers import people
 from pathlib import Path
-from ingest_logic.archive import bootstrap_archive, cleanup_temp_files
+from ingest_logic.archive import ArchiveSession, ArchiveSessionRegistry, TempSweeper, bootstrap_archive
 from contracts.models import Person
 
 app = FastAPI()
@@ -27,47 +38,144 @@ app.add_middleware(
 
 app.include_router(people.router)
 
+# Per-stage timings (fs, yaml, people, transcription) and per-route HTTP
+# latency, served at /metrics. METRICS_ENABLED=0 turns recording off.
+if os.getenv("METRICS_ENABLED", "1") != "0":
+    metrics.enable()
+
+HTTP_SECONDS = metrics.REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to the response start, by route.", ["method", "route"]
+)
+HTTP_REQUESTS = metrics.REGISTRY.counter(
+    "http_requests_total", "Requests by route and status code.", ["method", "route", "status"]
+)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    if not metrics.is_enabled():
+        return await call_next(request)
+    request.state.received_at = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # The route template, not the raw path, keeps label cardinality bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        HTTP_SECONDS.observe(time.perf_counter() - request.state.received_at, method=request.method, route=path)
+        HTTP_REQUESTS.inc(method=request.method, route=path, status=status)
+
 templates = Jinja2Templates(directory="templates")
 
 STORAGE_ROOT = os.getenv("SSD_MOUNT_PATH", os.path.abspath("./tmp_data"))
-person_manager = PersonManager(STORAGE_ROOT)
-
-transcription_manager = TranscriptionManager()
 config_manager = ConfigManager()
+# The archive being served: the root set via /config/archive-root, else
+# SSD_MOUNT_PATH. Each root gets one warm session (index, people cache,
+# recordings, uploads); handlers fetch it with archives.current().
+archives = ArchiveSessionRegistry(config_manager, STORAGE_ROOT)
+app.state.archives = archives
+
+# Finished transcripts are cached by audio hash, provider, model and
+# prompt version; TRANSCRIPT_CACHE_MAX_MB caps the cache's size.
+transcript_cache = TranscriptCache(
+    str(config_manager.transcript_cache_path()),
+    max_bytes=int(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512")) * 1024 * 1024,
+)
+transcription_manager = TranscriptionManager(cache=transcript_cache)
+transcription_progress = ProgressTracker()
+
+# Removes temps abandoned by interrupted safe writes, in the background;
+# ones modified within TEMP_SWEEP_MIN_AGE_SECONDS may still be in use.
+temp_sweeper = TempSweeper(min_age_seconds=float(os.getenv("TEMP_SWEEP_MIN_AGE_SECONDS", "3600")))
+
+# Transcription Job
+def _set_ingest_status(meta_path: str, status: str, **fields) -> None:
+    """
+    Updates a recording's metadata under its lock, re-reading it first:
+    a re-import may be adding a reference to it at the same time.
+    """
+    def update(meta: dict) -> bool:
+        meta['ingest_status'] = status
+        meta.update(fields)
+        return True
+
+    archives.session_for_path(meta_path).recordings.update_metadata(meta_path, update)
+
+def process_transcription(file_path: str, meta_path: str, job_id: Optional[int] = None):
+    # Segments are appended to <stem>.partial.vtt as they arrive and, for
+    # a queued job, published to its progress event stream.
+    partial = PartialTranscript(str(Path(file_path).with_suffix('.partial.vtt')))
+    if job_id is not None:
+        transcription_progress.start(job_id, file_path)
+
+    def on_progress(segments, processed_seconds, duration):
+        partial.append(segments)
+        if job_id is not None:
+            transcription_progress.add_segments(job_id, segments, processed_seconds, duration)
 
-# Background Task
-def process_transcription(file_path: str, meta_path: str):
     try:
         print(f"Starting transcription for {file_path}...")
-        transcript = transcription_manager.transcribe(file_path)
+        sha256 = None
+        if os.path.exists(meta_path):
+            sha256 = load_yaml(meta_path).get('sha256')
+        transcript = transcription_manager.transcribe_timed(file_path, sha256=sha256, on_progress=on_progress)
         
-        # Save transcript
+        # Save transcript, plus a WebVTT sidecar when we have timestamps
         txt_path = Path(file_path).with_suffix('.txt')
-        with open(txt_path, 'w') as f:
-            f.write(transcript)
+        write_safe(str(txt_path), transcript.text)
+        if transcript.segments:
+            write_safe(str(txt_path.with_suffix('.vtt')), to_vtt(transcript.segments))
+        partial.discard()
+        # The PCM cache and the compressed upload copy only exist to spare
+        # retries a decode
+        discard_derived(file_path)
             
         # Update metadata
-        if os.path.exists(meta_path):
-            meta = load_yaml(meta_path)
-            meta['ingest_status'] = 'transcribed'
-            # meta['transcript_path'] = str(txt_path) 
-            save_yaml(meta_path, meta)
+        _set_ingest_status(meta_path, 'transcribed')
             
         print(f"Transcription complete: {txt_path}")
+        if job_id is not None:
+            transcription_progress.finish(job_id)
         
     except Exception as e:
         print(f"Transcription failed for {file_path}: {e}")
         # Update metadata to failed
-        if os.path.exists(meta_path):
-            meta = load_yaml(meta_path)
-            meta['ingest_status'] = 'transcription_failed'
-            meta['error_message'] = str(e)
-            save_yaml(meta_path, meta)
+        _set_ingest_status(meta_path, 'transcription_failed', error_message=str(e))
+        if job_id is not None:
+            transcription_progress.finish(job_id, error=str(e))
+        # Let the queue record the job as failed
+        raise
+
+def run_transcription_job(job: TranscriptionJob):
+    process_transcription(job.media_path, job.meta_path, job_id=job.id)
+
+# Durable job queue (SQLite in the app config dir). Jobs survive restarts;
+# TRANSCRIPTION_WORKERS bounds how many run at once and
+# TRANSCRIPTION_PROVIDER_LIMITS (e.g. "local=1,gemini=4") caps each provider.
+transcription_queue = TranscriptionQueue(
+    str(config_manager.transcription_queue_path()),
+    run_transcription_job,
+    workers=int(os.getenv("TRANSCRIPTION_WORKERS", "2")),
+    provider_limits=parse_provider_limits(os.getenv("TRANSCRIPTION_PROVIDER_LIMITS")),
+)
+
+PEOPLE_PAGE_SIZE = 100
 
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
-    people_list = person_manager.list_people()
-    return templates.TemplateResponse("index.html", {"request": request, "people": people_list})
+    people_list, last_slug = archives.current().people.list_people_page(limit=PEOPLE_PAGE_SIZE)
+    next_cursor = people.encode_cursor(last_slug) if last_slug else None
+    return templates.TemplateResponse(request, "index.html", {"people": people_list, "next_cursor": next_cursor})
+
+@app.get("/people/options", response_class=HTMLResponse)
+def people_options(request: Request, cursor: str):
+    """Next page of <option> elements for the person picker."""
+    after = people.decode_cursor(cursor)
+    people_list, last_slug = archives.current().people.list_people_page(limit=PEOPLE_PAGE_SIZE, after=after)
+    next_cursor = people.encode_cursor(last_slug) if last_slug else None
+    return templates.TemplateResponse(request, "_people_options.html", {"people": people_list, "next_cursor": next_cursor})
 
 @app.post("/api/people", response_class=HTMLResponse)
 async def create_person(
@@ -77,7 +185,7 @@ async def create_person(
     bio: str = Form("")
 ):
     try:
-        person = person_manager.create_person(
+        person = archives.current().people.create_person(
             family=family_name,
             given=given_name,
             dob=dob,
@@ -89,64 +197,400 @@ async def create_person(
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+def _recording_target(archive: ArchiveSession, person_slug: str, filename: str, content_type: str) -> str:
+    """Path a recording is stored at; creates its directory."""
+    if "video" in content_type:
+        subdir = "video"
+    elif "audio" in content_type:
+        subdir = "audio"
+    else:
+        subdir = "video"
+
+    person_dir = os.path.join(archive.root, "people", person_slug)
+    target_dir = os.path.join(person_dir, "recordings", subdir)
+    
+    os.makedirs(target_dir, exist_ok=True)
+    
+    return os.path.join(target_dir, filename)
+
+def _duplicate_response(archive: ArchiveSession, duplicate_of: str, person_slug: str, filename: str) -> dict:
+    """Notes a re-import of identical content on the existing recording."""
+    archive.recordings.add_reference(duplicate_of, person_slug, filename)
+    existing = load_yaml(duplicate_of)
+    existing_path = os.path.join(os.path.dirname(duplicate_of), existing["original_filename"])
+    return {"status": "duplicate", "filename": filename, "path": existing_path, "message": "Recording already in archive. Transcription skipped."}
+
+def _register_recording(archive: ArchiveSession, target_path: str, content_type: str, written: StreamWriteResult) -> dict:
+    """Writes metadata for a recording now in place and queues its transcription."""
+    filename = os.path.basename(target_path)
+    meta_path = os.path.join(os.path.dirname(target_path), f"{Path(filename).stem}.yaml")
+    
+    metadata = {
+        "original_filename": filename,
+        "content_type": content_type,
+        "ingest_status": "pending_transcription",
+        "sha256": written.sha256,
+        "size_bytes": written.size,
+    }
+    archive.recordings.write_metadata(meta_path, metadata)
+    
+    # Queue transcription
+    job = transcription_queue.enqueue(target_path, meta_path, transcription_manager.provider_type)
+
+    return {"status": "success", "filename": filename, "path": target_path, "job_id": job.id, "message": "Upload complete. Transcription queued."}
+
 @app.post("/api/import/recording")
 async def import_recording(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
     person_slug: str = Form(...),
 ):
+    # FastAPI has parsed (and spooled) the multipart body by now
+    received_at = getattr(request.state, "received_at", None)
+    if received_at is not None:
+        metrics.observe("http.multipart_spool", time.perf_counter() - received_at)
+
     if not file.filename:
          raise HTTPException(status_code=400, detail="No file filename")
 
     # Validate person
-    person_data = person_manager.get_person(person_slug)
+    archive = archives.current()
+    person_data = archive.people.get_person(person_slug)
     if not person_data:
         raise HTTPException(status_code=404, detail="Person not found")
 
     content_type = file.content_type or ""
-    
-    if "video" in content_type:
-        subdir = "video"
-    elif "audio" in content_type:
-        subdir = "audio"
-    else:
-        subdir = "video"
-
-    person_dir = os.path.join(STORAGE_ROOT, "people", person_slug)
-    target_dir = os.path.join(person_dir, "recordings", subdir)
-    
-    os.makedirs(target_dir, exist_ok=True)
-    
-    target_path = os.path.join(target_dir, file.filename)
+    target_path = _recording_target(archive, person_slug, file.filename, content_type)
     
     try:
-        await write_safe_stream(target_path, file)
-        
-        file_stem = Path(file.filename).stem
-        meta_path = os.path.join(target_dir, f"{file_stem}.yaml")
-        
-        metadata = {
-            "original_filename": file.filename,
-            "content_type": content_type,
-            "ingest_status": "pending_transcription",
-        }
-        save_yaml(meta_path, metadata)
-        
-        # Trigger background transcription
-        background_tasks.add_task(process_transcription, target_path, meta_path)
+        # Identical content already in the archive: keep the existing copy,
+        # note the re-import on it and skip transcription.
+        duplicate_of = None
+        def accept(written):
+            nonlocal duplicate_of
+            duplicate_of = archive.recordings.find_duplicate(written.sha256)
+            return duplicate_of is None
+
+        written = await write_safe_stream(target_path, file, accept=accept)
 
-        return {"status": "success", "filename": file.filename, "path": target_path, "message": "Upload complete. Transcription queued."}
+        if duplicate_of:
+            return _duplicate_response(archive, duplicate_of, person_slug, file.filename)
+
+        return _register_recording(archive, target_path, content_type, written)
 
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- Resumable uploads ---
+# For recordings too large to send in one request. The client creates a
+# session, PUTs the bytes in chunks (each at the offset the server last
+# confirmed, from HEAD), then completes it. Sessions live on the archive
+# under .uploads/ and survive restarts.
+
+UPLOAD_BUFFER_SIZE = 1024 * 1024
+
+class UploadCreate(BaseModel):
+    person_slug: str
+    filename: str
+    content_type: str = ""
+    size: int
+
+def _upload_headers(session: UploadSession) -> dict:
+    return {
+        "Upload-Offset": str(session.offset),
+        "Upload-Length": str(session.size),
+        "Cache-Control": "no-store",
+    }
+
+def _get_upload(upload_id: str) -> UploadSession:
+    try:
+        return archives.current().uploads.get(upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+
+@app.post("/api/uploads", status_code=201)
+def create_upload(req: UploadCreate):
+    if not req.filename or req.filename != os.path.basename(req.filename):
+        raise HTTPException(status_code=400, detail="Invalid filename")
+    if req.size < 0:
+        raise HTTPException(status_code=400, detail="Invalid size")
+    archive = archives.current()
+    if not archive.people.get_person(req.person_slug):
+        raise HTTPException(status_code=404, detail="Person not found")
+
+    archive.uploads.expire()
+    try:
+        session = archive.uploads.create(req.person_slug, req.filename, req.content_type, req.size)
+    except OSError as e:
+        print(f"Failed to create upload session: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create upload session: {e}")
+    return JSONResponse(status_code=201, content=session.model_dump(), headers=_upload_headers(session))
+
+@app.head("/api/uploads/{upload_id}")
+def upload_offset(upload_id: str):
+    session = _get_upload(upload_id)
+    return Response(status_code=200, headers=_upload_headers(session))
+
+@app.get("/api/uploads/{upload_id}")
+def read_upload(upload_id: str):
+    session = _get_upload(upload_id)
+    return JSONResponse(content=session.model_dump(), headers=_upload_headers(session))
+
+def _upload_corrupt_detail(upload_id: str, error: UploadCorrupt) -> str:
+    print(f"Upload {upload_id} can't be resumed: {error}")
+    return f"{error}. Discard it (DELETE /api/uploads/{upload_id}) and start a new upload."
+
+@app.put("/api/uploads/{upload_id}", status_code=204)
+async def upload_chunk(upload_id: str, request: Request):
+    try:
+        offset = int(request.headers["Upload-Offset"])
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail="Missing or invalid Upload-Offset header")
+
+    try:
+        writer = await asyncio.to_thread(archives.current().uploads.open_chunk, upload_id, offset)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="Another chunk for this upload is in progress")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.expected)})
+    except UploadCorrupt as e:
+        raise HTTPException(status_code=409, detail=_upload_corrupt_detail(upload_id, e))
+
+    committed = False
+    try:
+        buffer = bytearray()
+        try:
+            async for data in request.stream():
+                buffer += data
+                if len(buffer) >= UPLOAD_BUFFER_SIZE:
+                    await asyncio.to_thread(writer.write, bytes(buffer))
+                    buffer.clear()
+        except ClientDisconnect:
+            # Keep what arrived; the client resumes from the new offset.
+            pass
+        if buffer:
+            await asyncio.to_thread(writer.write, bytes(buffer))
+        session = await asyncio.to_thread(writer.commit)
+        committed = True
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except OSError as e:
+        print(f"Failed to write upload chunk: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to write upload chunk: {e}")
+    finally:
+        if not committed:
+            writer.close()
+
+    return Response(status_code=204, headers=_upload_headers(session))
+
+@app.post("/api/uploads/{upload_id}/complete")
+async def complete_upload(upload_id: str):
+    archive = archives.current()
+    try:
+        completed = await asyncio.to_thread(archive.uploads.complete, upload_id)
+    except UploadNotFound:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    except UploadBusy:
+        raise HTTPException(status_code=409, detail="A chunk or completion for this upload is still in progress")
+    except UploadOffsetMismatch as e:
+        raise HTTPException(status_code=409, detail=f"Upload incomplete: {e.got} of {e.expected} bytes received")
+    except UploadCorrupt as e:
+        raise HTTPException(status_code=409, detail=_upload_corrupt_detail(upload_id, e))
+
+    # The session stays locked until it is discarded (or, on failure,
+    # released for a retry), so a second complete gets 409, then 404.
+    try:
+        return await asyncio.to_thread(_finalize_upload, archive, completed)
+    except OSError as e:
+        print(f"Failed to finalize upload {upload_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to finalize upload: {e}")
+    finally:
+        completed.close()
+
+def _finalize_upload(archive: ArchiveSession, completed: CompletedUpload) -> dict:
+    """Moves a completed upload into the archive (or notes it as a duplicate) and discards it."""
+    session, written = completed.session, completed.written
+    duplicate_of = archive.recordings.find_duplicate(written.sha256)
+    if duplicate_of:
+        result = _duplicate_response(archive, duplicate_of, session.person_slug, session.filename)
+    else:
+        target_path = _recording_target(archive, session.person_slug, session.filename, session.content_type)
+        # The part file was fsynced chunk by chunk; the rename is the commit.
+        os.replace(completed.part_path, target_path)
+        fsync_dir(os.path.dirname(target_path))
+        result = _register_recording(archive, target_path, session.content_type, written)
+    completed.discard()
+    return result
+
+@app.delete("/api/uploads/{upload_id}", status_code=204)
+def cancel_upload(upload_id: str):
+    _get_upload(upload_id)
+    archives.current().uploads.discard(upload_id)
+    return Response(status_code=204)
+
+
+@app.post("/reindex")
+def reindex():
+    """Rebuilds the disposable index from the filesystem."""
+    archive = archives.current()
+    try:
+        counts = archive.people.rebuild_index()
+        archive.recordings.refresh_index()
+        # Recordings imported before content hashing get hashed once here
+        counts["recordings_hashed"] = archive.recordings.backfill_hashes()
+    except OSError as e:
+        print(f"Reindex failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Reindex failed: {e}")
+    return {"status": "ok", **counts}
+
+@app.post("/reindex-lite")
+def reindex_lite():
+    """Reindexes only people whose bio.yaml changed (mtime/size) on disk."""
+    archive = archives.current()
+    try:
+        counts = archive.people.refresh_index()
+        archive.recordings.refresh_index()
+    except OSError as e:
+        print(f"Incremental reindex failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Incremental reindex failed: {e}")
+    return {"status": "ok", **counts}
+
+@app.get("/search")
+def search(q: str = "", limit: int = 50):
+    try:
+        people_list = archives.current().people.search_people(q, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {
+        "query": q,
+        "results": [
+            {"type": "person", "slug": p.slug, "id": p.id, "display_name": p.display_name}
+            for p in people_list
+        ],
+    }
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "message": "Backend is running"}
 
+@app.get("/stats")
+def read_stats():
+    archive = archives.current()
+    return {"archive_root": archive.root, "person_cache": archive.people.cache_info()}
+
+@app.get("/metrics")
+def read_metrics():
+    """Counters and latency histograms in the Prometheus text format."""
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/api/maintenance/temp-sweep")
+def read_temp_sweep():
+    """Progress of the background sweep for abandoned temp files."""
+    return temp_sweeper.status()
+
+@app.get("/api/transcription/queue")
+def read_transcription_queue():
+    """Queue depth, job counts and worker/provider limits."""
+    return transcription_queue.stats()
+
+@app.get("/api/transcription/cache")
+def read_transcript_cache():
+    """Cached transcript count/size and hit rate since startup."""
+    return transcript_cache.stats()
+
+@app.delete("/api/transcription/cache")
+def clear_transcript_cache():
+    return {"removed": transcript_cache.clear()}
+
+@app.get("/api/transcription/jobs")
+def list_transcription_jobs(status: Optional[str] = None, limit: int = 100):
+    return {"jobs": transcription_queue.list_jobs(status=status, limit=limit)}
+
+@app.get("/api/transcription/jobs/{job_id}")
+def read_transcription_job(job_id: int):
+    job = transcription_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# Keep-alive comment interval for event streams (also how often a closed
+# client is noticed while no progress arrives)
+SSE_KEEPALIVE_SECONDS = 15
+
+def _sse(event: str, data: str, event_id: Optional[str] = None) -> str:
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.extend(f"data: {line}" for line in (data.splitlines() or [""]))
+    return "\n".join(lines) + "\n\n"
+
+def _job_state(job: TranscriptionJob) -> dict:
+    """Progress state for a job this process isn't running (queued, or finished before a restart)."""
+    return {
+        "job_id": job.id,
+        "media_path": job.media_path,
+        "status": job.status,
+        "percent": 100.0 if job.status == "done" else None,
+        "processed_seconds": None,
+        "duration": None,
+        "segments": 0,
+        "recent": [],
+        "error": job.error,
+        "updated_at": job.updated_at,
+    }
+
+@app.get("/api/transcription/jobs/{job_id}/events")
+async def transcription_job_events(request: Request, job_id: int, format: str = "json"):
+    """
+    Server-sent progress for one recording's transcription job: a
+    'progress' event per update (JSON, or with format=html an HTML
+    fragment for the HTMX sse extension), then 'done' once it finished.
+    """
+    job = transcription_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # The final event carries id "done"; a browser reconnecting after it
+    # gets 204, which tells EventSource to stop.
+    if request.headers.get("last-event-id") == "done":
+        return Response(status_code=204)
+
+    def render(state: dict) -> str:
+        if format == "html":
+            return templates.get_template("_transcription_progress.html").render(state=state)
+        return json.dumps(state)
+
+    async def stream():
+        state, updates = transcription_progress.subscribe(job_id)
+        try:
+            if state is None:
+                state = _job_state(transcription_queue.get(job_id))
+            yield _sse("progress", render(state))
+            while state["status"] not in ("done", "failed"):
+                try:
+                    state = await asyncio.wait_for(updates.get(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                # Coalesce a burst of updates into the latest state
+                while not updates.empty():
+                    state = updates.get_nowait()
+                yield _sse("progress", render(state))
+            yield _sse("done", state["status"], event_id="done")
+        finally:
+            transcription_progress.unsubscribe(job_id, updates)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
+
 @app.get("/config")
 def read_config():
     cfg = config_manager.load()
@@ -154,6 +598,8 @@ def read_config():
 
 class ArchiveRootRequest(BaseModel):
     path: str
+    # Person ID scheme for a new archive ("legacy" or "compact"); see identity.ID_SCHEMES
+    id_scheme: Optional[str] = None
 
 @app.post("/config/archive-root")
 def set_archive_root(req: ArchiveRootRequest):
@@ -161,7 +607,7 @@ def set_archive_root(req: ArchiveRootRequest):
     p = Path(req.path).expanduser().resolve()
     
     try:
-        bootstrap_archive(p)
+        bootstrap_archive(p, id_scheme=req.id_scheme)
     except (ValueError, FileNotFoundError) as e:
         raise HTTPException(status_code=400, detail=str(e))
     except PermissionError as e:
@@ -171,16 +617,58 @@ def set_archive_root(req: ArchiveRootRequest):
         raise HTTPException(status_code=500, detail="Failed to initialize archive root due to an internal system error.")
     
     config_manager.set_archive_root(str(p))
-    # Cleanup any leftover temps in the new root
-    cleanup_temp_files(p)
-    return {"status": "updated", "archive_root": str(p)}
+    # A session opened before bootstrap wrote archive.yaml is rebuilt from it
+    archives.refresh_settings(str(p))
+    # No restart needed. An archive that isn't indexed yet is prepared in
+    # the background; the current one is served until it is ready.
+    archive = archives.switch_soon(str(p))
+    if archive.root != str(p):
+        return {"status": "preparing", "archive_root": str(p)}
+    return {"status": "updated", "archive_root": str(p), "id_scheme": archive.id_scheme}
+
+def _activate_archive(archive: ArchiveSession, counts: dict) -> None:
+    """Runs whenever a different archive starts being served (including at startup)."""
+    if counts.get("built"):
+        print(f"Archive {archive.root}: Built index with {counts['people']} people ({counts['errors']} errors).")
+    elif counts:
+        # Picked up edits made outside the app while it wasn't being served
+        changed = counts["added"] + counts["changed"] + counts["deleted"]
+        if changed > 0:
+            print(f"Archive {archive.root}: Reindexed {changed} changed people.")
+
+    # Recordings left pending by a lost queue or older versions; jobs that
+    # are already queued are not duplicated.
+    pending = 0
+    for media_path, meta_path in archive.recordings.pending_transcriptions():
+        transcription_queue.enqueue(media_path, meta_path, transcription_manager.provider_type)
+        pending += 1
+    if pending:
+        print(f"Archive {archive.root}: {pending} pending transcriptions queued.")
+
+    expired = archive.uploads.expire()
+    if expired > 0:
+        print(f"Archive {archive.root}: Removed {expired} stale upload sessions.")
+
+    # Leftover temps, in the background (progress: /api/maintenance/temp-sweep)
+    temp_sweeper.start(archive.root)
+
+archives.on_switch(_activate_archive)
 
 @app.on_event("startup")
 async def startup_event():
-    cfg = config_manager.load()
-    if cfg.archive_root:
-        p = Path(cfg.archive_root)
-        if p.exists() and p.is_dir():
-            count = cleanup_temp_files(p)
-            if count > 0:
-                print(f"Startup: Cleaned up {count} temporary files.")
+    # Start Whisper worker processes now so the model is warm by the
+    # first job (and never loads in this process)
+    transcription_manager.start()
+    requeued = transcription_queue.start()
+    if requeued:
+        print(f"Startup: {requeued} interrupted transcriptions queued.")
+    # Opens (and indexes) the configured archive, off the event loop
+    await asyncio.to_thread(archives.current)
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Running jobs are left to finish or die with the process; either way
+    # they are picked up again on the next start.
+    transcription_queue.stop(timeout=0)
+    transcription_manager.close()
+    temp_sweeper.stop(timeout=5)
@@ -1,14 +1,23 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import os
-from ingest_logic.people.manager import PersonManager
+from typing import Optional
+import base64
+import csv
+import binascii
+import io
+from ingest_logic.people.identity import is_person_id
+from ingest_logic.people.manager import PersonDataError, PersonManager
+from ingest_logic.people.bulk_import import ImportReport, detect_format, import_people, iter_rows
 
 router = APIRouter(prefix="/api/people", tags=["people"])
 
-def get_manager():
-    # In a real app, use dependency injection. For MVP, instantiate per request or use a global.
-    mount_path = os.getenv("SSD_MOUNT_PATH", "/data")
-    return PersonManager(mount_path)
+def get_manager(request: Request) -> PersonManager:
+    """
+    The warm PersonManager of the archive being served, from the app's
+    ArchiveSessionRegistry (app.state.archives).
+    """
+    return request.app.state.archives.current().people
 
 class PersonCreate(BaseModel):
     family_name: str
@@ -17,14 +26,44 @@ class PersonCreate(BaseModel):
     suffix: str = ""
     bio: str = ""
 
+def encode_cursor(slug: str) -> str:
+    """Opaque pagination cursor for the last slug of a page."""
+    return base64.urlsafe_b64encode(slug.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (binascii.Error, UnicodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
 @router.get("/")
-def list_people():
-    return get_manager().list_people()
+def list_people(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    manager: PersonManager = Depends(get_manager),
+):
+    after = decode_cursor(cursor) if cursor else None
+    people, last_slug = manager.list_people_page(limit=limit, after=after)
+    return {
+        "items": people,
+        "next_cursor": encode_cursor(last_slug) if last_slug else None,
+    }
+
+@router.get("/stream")
+def stream_people(manager: PersonManager = Depends(get_manager)):
+    """All people as newline-delimited JSON, written as they are loaded."""
+
+    def generate():
+        for person in manager.iter_listing():
+            yield person.model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.post("/")
-def create_person(person: PersonCreate):
+def create_person(person: PersonCreate, manager: PersonManager = Depends(get_manager)):
     try:
-        return get_manager().create_person(
+        return manager.create_person(
             family=person.family_name,
             given=person.given_name,
             dob=person.dob,
@@ -34,9 +73,44 @@ def create_person(person: PersonCreate):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/import", response_model=ImportReport)
+def bulk_import(file: UploadFile = File(...), manager: PersonManager = Depends(get_manager)):
+    """
+    Creates people from an uploaded .csv or .jsonl file (columns/keys as in
+    PersonCreate). Existing IDs are skipped; returns a per-row report.
+    """
+    try:
+        fmt = detect_format(file.filename)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8", newline="")
+    try:
+        return import_people(manager, iter_rows(stream, fmt))
+    except UnicodeDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"Import file is not valid UTF-8: {e}")
+    except csv.Error as e:
+        raise HTTPException(status_code=400, detail=f"Malformed CSV: {e}")
+    finally:
+        # Leave closing the spooled upload to FastAPI
+        stream.detach()
+
+@router.get("/by-id/{person_id}")
+def get_person_by_id(person_id: str, manager: PersonManager = Depends(get_manager)):
+    if not is_person_id(person_id):
+        raise HTTPException(status_code=400, detail="Invalid person ID")
+    try:
+        p = manager.get_person_by_id(person_id)
+    except PersonDataError as e:
+        # The file on disk is at fault, not the request
+        raise HTTPException(status_code=500, detail=str(e))
+    if not p:
+        raise HTTPException(status_code=404, detail="Person not found")
+    return p
+
 @router.get("/{slug}")
-def get_person(slug: str):
-    p = get_manager().get_person(slug)
+def get_person(slug: str, manager: PersonManager = Depends(get_manager)):
+    p = manager.get_person(slug)
     if not p:
         raise HTTPException(status_code=404, detail="Person not found")
     return p
@@ -37,6 +37,11 @@ class IngestStatus(str, Enum):
     TRANSCRIBED = "transcribed"
     TRANSCRIPTION_FAILED = "transcription_failed"
 
+class RecordingReference(BaseModel):
+    """A later import of identical content, kept instead of a second copy."""
+    person_slug: str
+    original_filename: str
+
 class Recording(BaseModel):
     # ID is technically implicit (filename or file stem) in current legacy code,
     # but we should strictly define it if possible to match "Protobuf-style".
@@ -49,3 +54,6 @@ class Recording(BaseModel):
     # Optional fields
     error_message: Optional[str] = None
     transcript_path: Optional[str] = None
+    sha256: Optional[str] = None  # Hex digest of the recording, computed at import
+    size_bytes: Optional[int] = None
+    references: List[RecordingReference] = Field(default_factory=list)
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: person ID encoding. Compares the old digit-at-a-time
+base36 loop with int_to_base36 (and int(s, 36) with base36_to_int) over
+realistic names and pathological ones (very long, many-part names), and
+shows legacy vs compact ID lengths.
+
+Usage (from packages/ingest-logic):
+    PYTHONPATH=src python benchmarks/bench_identity.py [--number 2000]
+"""
+import argparse
+import timeit
+
+from ingest_logic.people.identity import (
+    ID_SCHEME_COMPACT,
+    base36_to_int,
+    canonical_identity,
+    generate_person_id,
+    int_to_base36,
+)
+
+CASES = [
+    ("short", ("Doe", "Jane", "", "1950-01-01")),
+    ("typical", ("Hernández García", "María José", "", "1987-06-23")),
+    ("suffix", ("Montgomery-Wellington", "Alexander Jonathan", "III", "1932-11-05")),
+    ("multi-part", ("de la Cruz y Fernández de Córdoba", " ".join(["Juan"] * 40), "", "1901-02-03")),
+    ("1k chars", ("Ö" * 500, "x" * 10, "", "2000-01-01")),
+    ("20k chars", ("a" * 20000, "b", "", "2000-01-01")),
+]
+
+def old_int_to_base36(n: int) -> str:
+    """The encoder this module replaced."""
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    if n == 0:
+        return "0"
+    result = []
+    while n > 0:
+        n, r = divmod(n, 36)
+        result.append(chars[r])
+    return "".join(reversed(result))
+
+def per_call_us(fn, number: int) -> float:
+    return timeit.timeit(fn, number=number) / number * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="calls per case (scaled down for long names)")
+    args = parser.parse_args()
+
+    print(f"{'case':12s} {'bits':>7s} {'old enc':>11s} {'new enc':>11s} {'speedup':>8s} {'decode':>11s} {'legacy len':>10s} {'compact len':>11s}")
+    for name, identity in CASES:
+        canonical = canonical_identity(*identity)
+        n = int.from_bytes(canonical.encode("utf-8"), byteorder="big")
+        encoded = int_to_base36(n)
+        assert encoded == old_int_to_base36(n)
+        assert base36_to_int(encoded) == n
+
+        number = max(1, args.number * 64 // max(64, len(canonical)))
+        old = per_call_us(lambda: old_int_to_base36(n), number)
+        new = per_call_us(lambda: int_to_base36(n), number)
+        decode = per_call_us(lambda: base36_to_int(encoded), number)
+        compact = generate_person_id(*identity, scheme=ID_SCHEME_COMPACT)
+        print(
+            f"{name:12s} {n.bit_length():7d} {old:9.1f}us {new:9.1f}us {old / new:7.1f}x "
+            f"{decode:9.1f}us {len(encoded):10d} {len(compact):11d}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Startup guard: import cost of ingest_logic modules, measured with
+`python -X importtime` in fresh interpreters (the median of --repeat
+runs), plus a check that no heavy provider dependency is imported.
+
+Exits with status 1 if a module's cumulative import time exceeds
+--budget-ms or any --forbid module was imported, so it can run in CI.
+
+Usage (from packages/ingest-logic):
+    PYTHONPATH=src:../contracts/src python benchmarks/bench_import_time.py \\
+        [--module ingest_logic.transcription] [--budget-ms 150] [--repeat 5] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_MODULES = ["ingest_logic.transcription"]
+# Heavy dependencies that only the selected provider may import, and
+# the provider modules themselves
+DEFAULT_FORBIDDEN = [
+    "torch", "whisper", "numpy", "google.generativeai", "ffmpeg",
+    "ingest_logic.transcription.gemini",
+    "ingest_logic.transcription.local_whisper",
+    "ingest_logic.transcription.whisper_pool",
+]
+
+# Also constructs a manager: that must not create (or import) the provider
+SNIPPET = "import {module}\nfrom ingest_logic.transcription import TranscriptionManager\nTranscriptionManager()"
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self us, cumulative us) for each line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SNIPPET.format(module=module)],
+        capture_output=True, text=True, env=dict(os.environ, TRANSCRIPTION_PROVIDER="local"),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", action="append", help="module to import (repeatable)")
+    parser.add_argument("--budget-ms", type=float, default=150.0, help="max median cumulative import time per module")
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports to list")
+    parser.add_argument("--forbid", action="append", help="module that must not be imported (repeatable)")
+    args = parser.parse_args()
+
+    modules = args.module or DEFAULT_MODULES
+    forbidden = args.forbid or DEFAULT_FORBIDDEN
+    failed = False
+
+    for module in modules:
+        totals = []
+        self_times: Dict[str, List[int]] = {}
+        imported = set()
+        for _ in range(args.repeat):
+            rows = measure(module)
+            imported.update(name for name, _, _ in rows)
+            totals.append(next(c for name, _, c in reversed(rows) if name == module) / 1000)
+            for name, self_us, _ in rows:
+                self_times.setdefault(name, []).append(self_us)
+
+        total = statistics.median(totals)
+        over = total > args.budget_ms
+        print(f"{module}: {total:.1f} ms cumulative (budget {args.budget_ms:.0f} ms){'  OVER BUDGET' if over else ''}")
+        slowest = sorted(self_times.items(), key=lambda kv: statistics.median(kv[1]), reverse=True)[:args.top]
+        for name, times in slowest:
+            print(f"    {statistics.median(times) / 1000:8.1f} ms  {name}")
+
+        leaked = sorted(name for name in imported if name in forbidden)
+        if leaked:
+            print(f"    imported forbidden modules: {', '.join(leaked)}")
+        failed = failed or over or bool(leaked)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Transcription throughput benchmark: real-time factor (wall seconds per
+audio second), audio seconds transcribed per wall second, model load
+time and peak RSS, across model sizes, Whisper worker counts and clip
+lengths. Each configuration runs through TranscriptionManager with the
+"local" provider, in a fresh subprocess so RSS figures don't bleed into
+each other.
+
+Clips are synthetic (seeded tone bursts and pauses) with their PCM cache
+pre-written, so no ffmpeg is needed. By default the worker processes
+load a deterministic fake Whisper that burns CPU in proportion to the
+audio length, so the harness runs offline and measures our pipeline
+(decode cache, segmentation, process pool, stitching) rather than the
+model. --provider whisper uses the real model instead.
+
+Usage (from packages/ingest-logic):
+    PYTHONPATH=src python benchmarks/bench_transcription.py \\
+        [--models tiny,base] [--workers 0,1,4] [--clips 30,300] \\
+        [--provider fake|whisper] [--output results.json] [--baseline old.json]
+
+--workers 0 runs the model in-process (LocalWhisperProvider).
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+
+SAMPLE_RATE = 16000
+
+# Fake model speed (audio seconds per CPU second) and load cost (CPU
+# seconds), loosely shaped like the real sizes.
+FAKE_WHISPER = '''
+import time
+
+SPEED = {"tiny": 400.0, "base": 200.0, "small": 80.0, "medium": 30.0}
+LOAD = {"tiny": 0.05, "base": 0.15, "small": 0.5, "medium": 1.5}
+SAMPLE_RATE = 16000
+
+def _burn(cpu_seconds):
+    end = time.process_time() + cpu_seconds
+    while time.process_time() < end:
+        pass
+
+class _Model:
+    def __init__(self, size):
+        self.speed = SPEED.get(size, 200.0)
+
+    def transcribe(self, audio):
+        seconds = len(audio) / SAMPLE_RATE
+        _burn(seconds / self.speed)
+        segments = [
+            {"start": float(t), "end": float(min(t + 5, seconds)), "text": f" segment at {t}s"}
+            for t in range(0, int(seconds), 5)
+        ]
+        return {"text": "".join(s["text"] for s in segments), "segments": segments}
+
+def load_model(size):
+    _burn(LOAD.get(size, 0.15))
+    return _Model(size)
+'''
+
+
+def _peak_rss_mb(who) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def make_clip(directory: str, seconds: float, seed: int = 0) -> str:
+    """
+    Writes a mono 16 kHz WAV of tone bursts separated by short pauses,
+    plus its PCM cache, and returns the WAV's path.
+    """
+    import numpy as np
+
+    from ingest_logic.transcription.audio import PCM_SUFFIX, derived_path
+
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLE_RATE)
+    samples = np.zeros(total, dtype=np.int16)
+    pos = 0
+    while pos < total:
+        burst = int(rng.uniform(2, 6) * SAMPLE_RATE)
+        t = np.arange(min(burst, total - pos)) / SAMPLE_RATE
+        samples[pos:pos + len(t)] = (8000 * np.sin(2 * np.pi * rng.uniform(120, 300) * t)).astype(np.int16)
+        pos += burst + int(rng.uniform(0.3, 1.0) * SAMPLE_RATE)
+
+    path = os.path.join(directory, f"clip-{seconds:g}s.wav")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(samples.tobytes())
+    pcm = derived_path(path, PCM_SUFFIX)
+    samples.tofile(pcm)
+    # The cache must be newer than the recording to be used
+    st = os.stat(path)
+    os.utime(pcm, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    return path
+
+
+def run_one(config: dict) -> dict:
+    """Benchmarks one (model, workers) configuration over every clip."""
+    with tempfile.TemporaryDirectory() as tmp:
+        if config["provider"] == "fake":
+            with open(os.path.join(tmp, "whisper.py"), "w", encoding="utf-8") as f:
+                f.write(FAKE_WHISPER)
+            # Spawned workers inherit sys.path, so they import the fake too
+            sys.path.insert(0, tmp)
+
+        os.environ["WHISPER_MODEL"] = config["model"]
+        os.environ["WHISPER_PROCESSES"] = str(config["workers"])
+        os.environ["WHISPER_SEGMENT_SECONDS"] = str(config["segment_seconds"])
+        from ingest_logic.transcription import TranscriptionManager
+        from ingest_logic.transcription.local_whisper import LocalWhisperProvider
+        from ingest_logic.transcription.whisper_pool import WhisperProcessProvider
+
+        clips = [(seconds, make_clip(tmp, seconds, seed=i)) for i, seconds in enumerate(config["clips"])]
+
+        manager = TranscriptionManager("local")
+        start = time.perf_counter()
+        provider = manager.provider
+        if isinstance(provider, WhisperProcessProvider):
+            provider.pool.start(wait=True)
+            load_error = provider.pool.info()["load_error"]
+            if load_error:
+                raise RuntimeError(load_error)
+        elif isinstance(provider, LocalWhisperProvider):
+            provider.model
+        load_seconds = time.perf_counter() - start
+
+        results = []
+        try:
+            for seconds, path in clips:
+                walls = []
+                for _ in range(config["repeat"]):
+                    start = time.perf_counter()
+                    transcript = manager.transcribe_timed(path)
+                    walls.append(time.perf_counter() - start)
+                wall = statistics.median(walls)
+                results.append({
+                    "model": config["model"],
+                    "workers": config["workers"],
+                    "clip_seconds": seconds,
+                    "wall_seconds": round(wall, 4),
+                    "rtf": round(wall / seconds, 5),
+                    "audio_seconds_per_second": round(seconds / wall, 2),
+                    "segments": len(transcript.segments),
+                })
+        finally:
+            manager.close()
+
+    for result in results:
+        result["model_load_seconds"] = round(load_seconds, 4)
+        result["peak_rss_mb"] = round(_peak_rss_mb(resource.RUSAGE_SELF), 1)
+        # Largest single worker process (they have all exited by now)
+        result["peak_worker_rss_mb"] = round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+    return {"results": results}
+
+
+def _csv(value: str, cast):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def _key(result: dict):
+    return (result["model"], result["workers"], result["clip_seconds"])
+
+
+def print_table(results, baseline=None):
+    previous = {_key(r): r for r in (baseline or [])}
+    header = f"{'model':8s} {'workers':>7s} {'clip s':>7s} {'wall s':>8s} {'RTF':>8s} {'audio s/s':>10s} {'load s':>7s} {'RSS MB':>7s} {'worker MB':>9s}"
+    if previous:
+        header += f" {'vs baseline':>11s}"
+    print(header)
+    for r in results:
+        line = (
+            f"{r['model']:8s} {r['workers']:7d} {r['clip_seconds']:7g} {r['wall_seconds']:8.3f} "
+            f"{r['rtf']:8.4f} {r['audio_seconds_per_second']:10.1f} {r['model_load_seconds']:7.2f} "
+            f"{r['peak_rss_mb']:7.0f} {r['peak_worker_rss_mb']:9.0f}"
+        )
+        old = previous.get(_key(r))
+        if old:
+            line += f" {old['rtf'] / r['rtf']:10.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--models", default="base", help="comma-separated model sizes")
+    parser.add_argument("--workers", default=f"0,1,{os.cpu_count() or 1}", help="comma-separated WHISPER_PROCESSES values")
+    parser.add_argument("--clips", default="30,300", help="comma-separated clip lengths in seconds")
+    parser.add_argument("--segment-seconds", type=float, default=120, help="WHISPER_SEGMENT_SECONDS")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per clip (the median is reported)")
+    parser.add_argument("--provider", choices=("fake", "whisper"), default="fake")
+    parser.add_argument("--output", default="bench_transcription.json", help="JSON results file")
+    parser.add_argument("--baseline", help="earlier JSON results to compare RTF against")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        config = json.loads(args.run_one)
+        # Written to a file: providers and workers print to stdout
+        with open(config["result_path"], "w", encoding="utf-8") as f:
+            json.dump(run_one(config), f)
+        return
+
+    results = []
+    result_path = os.path.join(tempfile.mkdtemp(), "result.json")
+    for model in _csv(args.models, str):
+        for workers in _csv(args.workers, int):
+            config = {
+                "provider": args.provider,
+                "model": model,
+                "workers": workers,
+                "clips": _csv(args.clips, float),
+                "segment_seconds": args.segment_seconds,
+                "repeat": args.repeat,
+                "result_path": result_path,
+            }
+            print(f"model={model} workers={workers}...", file=sys.stderr)
+            # A fresh interpreter per configuration keeps peak RSS honest
+            subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--run-one", json.dumps(config)],
+                check=True, stdout=subprocess.DEVNULL,
+            )
+            with open(result_path, encoding="utf-8") as f:
+                results.extend(json.load(f)["results"])
+
+    report = {
+        "benchmark": "transcription",
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "provider": args.provider,
+        "segment_seconds": args.segment_seconds,
+        "repeat": args.repeat,
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print_table(results, baseline)
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Micro-benchmark: per-file cost of loading a bio.yaml with the round-trip
+loader (load_yaml) versus the read-only fast path (load_yaml_fast).
+
+Usage (from packages/ingest-logic):
+    PYTHONPATH=src python benchmarks/bench_yaml_load.py [--number 2000]
+"""
+import argparse
+import os
+import tempfile
+import timeit
+
+from ingest_logic.common.yaml_utils import load_yaml, load_yaml_fast
+
+SAMPLE_BIO = """\
+# Hand-written note that round-trip editing must preserve
+id: 7zs7i5xpzlnj3tqzq6kbz0z2flhc375
+names:
+  - type: primary
+    given: Jane
+    surname: Doe
+    suffix: ''
+  - type: maiden
+    given: Jane
+    surname: Roe
+    suffix: ''
+vitals:
+  birth:
+    date: '1990-01-01'
+bio: Grew up in a small town and later moved to the city to study music.
+"""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="loads per loader")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bio.yaml")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_BIO)
+
+        assert load_yaml(path) == load_yaml_fast(path)
+
+        results = {}
+        for name, fn in (("load_yaml", load_yaml), ("load_yaml_fast", load_yaml_fast)):
+            fn(path)  # warm up (loader construction, imports)
+            seconds = timeit.timeit(lambda: fn(path), number=args.number)
+            results[name] = seconds / args.number * 1e6
+            print(f"{name:16s} {results[name]:9.1f} us/file")
+
+        print(f"{'speedup':16s} {results['load_yaml'] / results['load_yaml_fast']:9.1f}x")
+
+if __name__ == "__main__":
+    main()
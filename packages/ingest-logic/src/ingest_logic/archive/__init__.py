@@ -1,2 +1,3 @@
-from .bootstrap import bootstrap_archive
-from .cleanup import cleanup_temp_files
+from .bootstrap import bootstrap_archive, read_id_scheme
+from .cleanup import TempSweeper, cleanup_temp_files, sweep_temp_files
+from .session import ArchiveSession, ArchiveSessionRegistry
@@ -1,16 +1,30 @@
 from pathlib import Path
+from typing import Optional
 import os
+from ..common.yaml_utils import load_yaml_fast, save_yaml
+from ..people.identity import ID_SCHEME_LEGACY, ID_SCHEMES
 
-def bootstrap_archive(root_path: Path) -> None:
+# Per-archive settings, kept on the archive itself
+SETTINGS_FILENAME = "archive.yaml"
+
+def read_id_scheme(root_path: Path) -> str:
+    """The person ID scheme of an archive (legacy unless set at bootstrap)."""
+    settings = load_yaml_fast(os.path.join(str(root_path), SETTINGS_FILENAME)) or {}
+    return settings.get("id_scheme", ID_SCHEME_LEGACY)
+
+def bootstrap_archive(root_path: Path, id_scheme: Optional[str] = None) -> None:
     """
     Validates and initializes the Archive Root.
     
     1. Checks if path exists and is a directory.
     2. Checks for write permissions.
     3. Creates required subdirectories (people/) if missing.
+    4. With id_scheme, records the person ID scheme in archive.yaml.
+       Only an archive without people can change scheme.
     
     Raises:
-        ValueError: If path is invalid.
+        ValueError: If path is invalid, id_scheme is unknown, or it
+            differs from an archive's existing people.
         PermissionError: If path is not writable.
     """
     if not root_path.exists():
@@ -28,3 +42,11 @@ def bootstrap_archive(root_path: Path) -> None:
         raise ValueError(f"Cannot create 'people' directory: a file with that name already exists in {root_path}")
         
     people_dir.mkdir(exist_ok=True)
+
+    if id_scheme is None or id_scheme == read_id_scheme(root_path):
+        return
+    if id_scheme not in ID_SCHEMES:
+        raise ValueError(f"Unknown ID scheme: {id_scheme}")
+    if any(people_dir.iterdir()):
+        raise ValueError(f"Cannot change the ID scheme of an archive that already has people: {root_path}")
+    save_yaml(str(root_path / SETTINGS_FILENAME), {"id_scheme": id_scheme})
@@ -1,12 +1,36 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
-def cleanup_temp_files(root_path: Path, pattern: str = "*.tmp") -> int:
+# Resumable upload sessions manage (and expire) their own files.
+SKIP_DIRS = (".uploads",)
+
+TEMP_SUFFIX = ".tmp"
+# Safe writes refresh their temp's mtime as they go (and an upload keeps
+# appending), so anything untouched this long was abandoned by a crash.
+DEFAULT_MIN_AGE_SECONDS = 60 * 60
+DEFAULT_SWEEP_WORKERS = 4
+
+# Subdirectory of a person directory that holds safe-written files
+RECORDINGS_DIR = "recordings"
+BIO_FILENAME = "bio.yaml"
+
+SweepCounts = Dict[str, int]
+
+def cleanup_temp_files(root_path: Path, pattern: str = "*.tmp", skip_dirs: Iterable[str] = SKIP_DIRS) -> int:
     """
     Recursively finds and deletes files matching the pattern within root_path.
     
+    Walks the whole tree and ignores file age; prefer sweep_temp_files
+    (or TempSweeper) on a live archive.
+
     Args:
         root_path: The root directory to scan.
         pattern: The glob pattern to match (default: *.tmp).
+        skip_dirs: Top-level directories to leave alone.
         
     Returns:
         int: The number of files deleted.
@@ -15,9 +39,12 @@ def cleanup_temp_files(root_path: Path, pattern: str = "*.tmp") -> int:
         return 0
         
     count = 0
+    skip = set(skip_dirs)
     # Recursive glob for the pattern
     # Note: rglob returns generator, allowing us to iterate efficiently
     for p in root_path.rglob(pattern):
+        if p.relative_to(root_path).parts[0] in skip:
+            continue
         if p.is_file():
             try:
                 p.unlink()
@@ -26,3 +53,206 @@ def cleanup_temp_files(root_path: Path, pattern: str = "*.tmp") -> int:
                 print(f"Failed to delete temp file {p}: {e}")
                 
     return count
+
+def _sweep_dir(path: str, cutoff: float, suffix: str) -> Tuple[List[str], int, int]:
+    """
+    Deletes stale temps directly inside path.
+    Returns (subdirectory names, deleted, errors).
+    """
+    subdirs: List[str] = []
+    deleted = errors = 0
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                    continue
+                if not entry.name.endswith(suffix):
+                    continue
+                try:
+                    if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                        continue  # Possibly still being written
+                    os.remove(entry.path)
+                    deleted += 1
+                except FileNotFoundError:
+                    pass  # Renamed into place or removed meanwhile
+                except OSError as e:
+                    print(f"Failed to delete temp file {entry.path}: {e}")
+                    errors += 1
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return subdirs, deleted, errors
+
+def _sweep_people_tree(
+    top: str, cutoff: float, suffix: str, should_stop: Callable[[], bool], on_dir: Callable[[int, int], None]
+) -> None:
+    """
+    Sweeps one shard of people/. Safe writes land in person directories
+    (bio.yaml) and their recordings/ subfolders (media, metadata,
+    transcripts, derived audio), so inside a person directory only
+    recordings/ and its immediate subdirectories are visited; photos and
+    other documents are never listed.
+    """
+    stack = [(top, False)]  # (path, inside recordings/)
+    while stack and not should_stop():
+        path, in_recordings = stack.pop()
+        subdirs, deleted, errors = _sweep_dir(path, cutoff, suffix)
+        on_dir(deleted, errors)
+        if in_recordings:
+            if os.path.basename(path) == RECORDINGS_DIR:
+                stack.extend((os.path.join(path, name), True) for name in subdirs)
+            continue
+        if os.path.exists(os.path.join(path, BIO_FILENAME)):
+            if RECORDINGS_DIR in subdirs:
+                stack.append((os.path.join(path, RECORDINGS_DIR), True))
+            continue
+        stack.extend((os.path.join(path, name), False) for name in subdirs)
+
+def sweep_temp_files(
+    root_path: Union[str, Path],
+    min_age_seconds: float = DEFAULT_MIN_AGE_SECONDS,
+    max_workers: int = DEFAULT_SWEEP_WORKERS,
+    suffix: str = TEMP_SUFFIX,
+    skip_dirs: Iterable[str] = SKIP_DIRS,
+    on_progress: Optional[Callable[[SweepCounts], None]] = None,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> SweepCounts:
+    """
+    Deletes safe-write temps (*{suffix}) older than min_age_seconds that
+    were left behind by crashes or power loss.
+
+    Only the archive root and the people tree are visited (see
+    _sweep_people_tree), with os.scandir, and the top-level shards of
+    people/ are walked in parallel by max_workers threads. Young temps
+    are kept because a concurrent request may still be writing them.
+
+    on_progress receives the running counts (shards, shards_done, dirs,
+    deleted, errors) after every directory; should_stop is polled between
+    directories to abandon the sweep early.
+
+    Returns:
+        The final counts.
+    """
+    root = str(root_path)
+    counts: SweepCounts = {"shards": 0, "shards_done": 0, "dirs": 0, "deleted": 0, "errors": 0}
+    if not os.path.isdir(root):
+        return counts
+
+    cutoff = time.time() - min_age_seconds
+    lock = threading.Lock()
+    stop = should_stop or (lambda: False)
+
+    def on_dir(deleted: int, errors: int) -> None:
+        with lock:
+            counts["dirs"] += 1
+            counts["deleted"] += deleted
+            counts["errors"] += errors
+            snapshot = dict(counts)
+        if on_progress is not None:
+            on_progress(snapshot)
+
+    # Root level: loose files only (other top-level folders don't hold safe writes)
+    root_subdirs, deleted, errors = _sweep_dir(root, cutoff, suffix)
+    on_dir(deleted, errors)
+    if "people" not in root_subdirs or "people" in set(skip_dirs):
+        return counts
+
+    people_dir = os.path.join(root, "people")
+    shard_names, deleted, errors = _sweep_dir(people_dir, cutoff, suffix)
+    shards = [os.path.join(people_dir, name) for name in sorted(shard_names)]
+    with lock:
+        counts["shards"] = len(shards)
+    on_dir(deleted, errors)
+
+    def sweep_shard(top: str) -> None:
+        _sweep_people_tree(top, cutoff, suffix, stop, on_dir)
+        with lock:
+            counts["shards_done"] += 1
+
+    workers = max(1, min(max_workers, len(shards)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="temp-sweep") as executor:
+        list(executor.map(sweep_shard, shards))
+    return dict(counts)
+
+class TempSweeper:
+    """
+    Runs sweep_temp_files in a background thread so neither startup nor
+    the request that switched archives waits for it. Starting a sweep of
+    another root stops the one in progress. status() reports progress.
+    """
+
+    def __init__(
+        self,
+        min_age_seconds: float = DEFAULT_MIN_AGE_SECONDS,
+        max_workers: int = DEFAULT_SWEEP_WORKERS,
+    ):
+        self.min_age_seconds = min_age_seconds
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+        self._status: Dict[str, object] = {"state": "idle"}
+
+    def start(self, root_path: Union[str, Path]) -> None:
+        with self._lock:
+            if self._stop is not None:
+                self._stop.set()
+            stop = self._stop = threading.Event()
+            self._status = {
+                "state": "running",
+                "root": str(root_path),
+                "started_at": time.time(),
+                "finished_at": None,
+                "shards": 0,
+                "shards_done": 0,
+                "dirs": 0,
+                "deleted": 0,
+                "errors": 0,
+            }
+            status = self._status
+            self._thread = threading.Thread(
+                target=self._run, args=(str(root_path), stop, status), name="temp-sweeper", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, root: str, stop: threading.Event, status: Dict[str, object]) -> None:
+        def on_progress(counts: SweepCounts) -> None:
+            with self._lock:
+                status.update(counts)
+
+        state = "done"
+        try:
+            counts = sweep_temp_files(
+                root, self.min_age_seconds, self.max_workers, on_progress=on_progress, should_stop=stop.is_set
+            )
+            on_progress(counts)
+            if stop.is_set():
+                state = "stopped"
+            elif counts["deleted"] > 0:
+                print(f"Cleaned up {counts['deleted']} temporary files in {root}.")
+        except Exception as e:
+            print(f"Temp file sweep of {root} failed: {e}")
+            state = "failed"
+        with self._lock:
+            status["state"] = state
+            status["finished_at"] = time.time()
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            return dict(self._status)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._lock:
+            stop, thread = self._stop, self._thread
+        if stop is not None:
+            stop.set()
+        if thread is not None:
+            thread.join(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, object]:
+        """Blocks until the current sweep finishes and returns its status."""
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.status()
@@ -0,0 +1,219 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from ..config import ConfigManager
+from ..index import ArchiveIndex, open_archive_index
+from ..people.manager import PersonManager
+from ..recordings import RecordingManager
+from ..recordings.uploads import UploadSessionStore
+from .bootstrap import read_id_scheme
+
+logger = logging.getLogger(__name__)
+
+# How often current() looks at config.json for an archive switch made
+# outside this process (one stat, amortized over every request meanwhile)
+CONFIG_CHECK_INTERVAL = 2.0
+
+
+class ArchiveSession:
+    """
+    Everything the app serves for one archive root: its index, a warm
+    PersonManager (with its person cache), the RecordingManager and the
+    resumable upload store. Built once per root and reused.
+    """
+
+    def __init__(self, root: str, config_manager: ConfigManager):
+        self.root = root
+        self.index: ArchiveIndex = open_archive_index(str(config_manager.index_path(root)))
+        # From archive.yaml, fixed for the session's life (see refresh_settings)
+        self.id_scheme = read_id_scheme(root)
+        self.people = PersonManager(root, index=self.index, id_scheme=self.id_scheme)
+        self.recordings = RecordingManager(root, index=self.index)
+        self.uploads = UploadSessionStore(root)
+        self._prepared = False
+        self._prepare_lock = threading.Lock()
+
+    def prepare(self) -> Dict[str, int]:
+        """
+        Brings the index up to date with the disk: a full build the first
+        time an archive is seen, otherwise a refresh that picks up edits
+        made while the app wasn't serving it. Runs once per session;
+        later calls return {}.
+        """
+        with self._prepare_lock:
+            if self._prepared:
+                return {}
+            if not self.index.is_built():
+                counts = self.people.rebuild_index()
+                counts["built"] = 1
+            else:
+                counts = self.people.refresh_index()
+                counts["built"] = 0
+            self.recordings.refresh_index()
+            self._prepared = True
+            return counts
+
+    @property
+    def ready(self) -> bool:
+        """Whether prepare() has run, i.e. the session can serve without indexing first."""
+        return self._prepared
+
+    def contains(self, path: str) -> bool:
+        root = os.path.abspath(self.root)
+        return os.path.abspath(path).startswith(root.rstrip(os.sep) + os.sep)
+
+
+SwitchListener = Callable[[ArchiveSession, Dict[str, int]], None]
+
+
+class ArchiveSessionRegistry:
+    """
+    Hands out the ArchiveSession for the configured archive root.
+
+    The root is config.json's archive_root (set via /config/archive-root)
+    when it exists, otherwise default_root. current() is the per-request
+    call: it returns the cached session without touching the filesystem,
+    except for one stat of config.json every check_interval seconds to
+    notice a switch made elsewhere. Such a switch never indexes on the
+    caller's thread (often the event loop): the new archive is prepared in
+    a background thread while current() keeps returning the old session,
+    and is swapped in once ready. switch_soon() does the same for a switch
+    made at runtime; switch() prepares inline. Sessions of earlier roots stay open, so switching
+    back is instant.
+    """
+
+    def __init__(
+        self,
+        config_manager: ConfigManager,
+        default_root: str,
+        check_interval: float = CONFIG_CHECK_INTERVAL,
+    ):
+        self.config_manager = config_manager
+        self.default_root = os.path.abspath(default_root)
+        self.check_interval = check_interval
+        self._sessions: Dict[str, ArchiveSession] = {}
+        self._current: Optional[ArchiveSession] = None
+        self._next_check = 0.0
+        self._lock = threading.RLock()
+        self._listeners: List[SwitchListener] = []
+        self._preparing: Set[str] = set()
+
+    def on_switch(self, listener: SwitchListener) -> None:
+        """
+        Calls listener(session, counts) whenever the current archive
+        changes; counts are from session.prepare() ({} if it was ready).
+        """
+        self._listeners.append(listener)
+
+    def current(self) -> ArchiveSession:
+        session = self._current
+        if session is not None and time.monotonic() < self._next_check:
+            return session
+        return self._reload()
+
+    def _configured_root(self) -> str:
+        root = self.config_manager.load().archive_root
+        if root and os.path.isdir(root):
+            return os.path.abspath(root)
+        return self.default_root
+
+    def _reload(self) -> ArchiveSession:
+        with self._lock:
+            root = self._configured_root()
+            self._next_check = time.monotonic() + self.check_interval
+        return self.switch_soon(root)
+
+    def switch_soon(self, root: str) -> ArchiveSession:
+        """
+        Makes root the current archive without indexing on the caller's
+        thread (the caller persists it to config.json first). If root's
+        session still has to be prepared, that runs in a background thread
+        and the old session keeps being served until it is swapped in.
+        Returns the session now current: root's if it was switched to at
+        once (it was ready, or there was nothing to serve meanwhile).
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            current = self._current
+            pending = self._sessions.get(root)
+            if current is not None and current is pending:
+                return current
+            # A different archive that must be indexed first. (The current
+            # root's session being rebuilt, see refresh_settings, is
+            # swapped at once: serving the old one would use stale settings.)
+            if current is not None and current.root != root and (pending is None or not pending.ready):
+                if root not in self._preparing:
+                    self._preparing.add(root)
+                    threading.Thread(
+                        target=self._switch_when_ready, args=(root,), name="archive-prepare", daemon=True
+                    ).start()
+                return current
+        return self.switch(root)
+
+    def _switch_when_ready(self, root: str) -> None:
+        try:
+            session = self.session_for(root)
+            counts = session.prepare()
+            # Unless another switch happened while indexing
+            self._activate(session, counts, if_configured=True)
+        except Exception:
+            logger.exception("Failed to open archive %s", root)
+        finally:
+            with self._lock:
+                self._preparing.discard(root)
+
+    def session_for(self, root: str) -> ArchiveSession:
+        """The session for root, creating it on first use (see prepare())."""
+        root = os.path.abspath(root)
+        with self._lock:
+            session = self._sessions.get(root)
+            if session is None:
+                session = self._sessions[root] = ArchiveSession(root, self.config_manager)
+            return session
+
+    def refresh_settings(self, root: str) -> None:
+        """
+        Call after root's archive.yaml changed (bootstrap_archive with an
+        id_scheme): a session opened with other settings is dropped, so
+        the next session_for/switch builds one from the new file. The
+        index is shared, so the new session's prepare() is a refresh.
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            session = self._sessions.get(root)
+            if session is not None and session.id_scheme != read_id_scheme(root):
+                del self._sessions[root]
+
+    def session_for_path(self, path: str) -> ArchiveSession:
+        """The open session whose root holds path (e.g. a recording), else the current one."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+        for session in sessions:
+            if session.contains(path):
+                return session
+        return self.current()
+
+    def switch(self, root: str) -> ArchiveSession:
+        """Makes root the current archive (the caller persists it to config.json)."""
+        session = self.session_for(root)
+        # Ready before any request is served from it
+        counts = session.prepare()
+        self._activate(session, counts)
+        return session
+
+    def _activate(self, session: ArchiveSession, counts: Dict[str, int], if_configured: bool = False) -> None:
+        with self._lock:
+            if if_configured and self._configured_root() != session.root:
+                return
+            previous, self._current = self._current, session
+            self._next_check = time.monotonic() + self.check_interval
+        if previous is not session:
+            for listener in self._listeners:
+                listener(session, counts)
+
+    def sessions(self) -> List[ArchiveSession]:
+        with self._lock:
+            return list(self._sessions.values())
@@ -1,13 +1,37 @@
+import asyncio
+import hashlib
 import os
 import shutil
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Union
 
+from . import metrics
+
+@metrics.timed("fs.fsync_dir")
+def fsync_dir(path: str) -> None:
+    """
+    Flushes a directory's entries (e.g. a completed rename) to disk.
+    No-op on platforms that can't open directories (Windows).
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@metrics.timed("fs.write_safe")
 def write_safe(path: str, content: Union[str, bytes]) -> None:
     """
     Writes content to a file using the 'Safe Write' pattern:
     1. Write to {path}.tmp
     2. Flush and fsync
     3. Rename {path}.tmp to {path} (atomic-ish replacement)
+    4. Fsync the parent directory so the rename itself is durable
     
     This mitigates data corruption on ExFAT if power is lost during write.
     """
@@ -18,7 +42,8 @@ def write_safe(path: str, content: Union[str, bytes]) -> None:
         with open(tmp_path, mode) as f:
             f.write(content)
             f.flush()
-            os.fsync(f.fileno())
+            with metrics.timer("fs.fsync"):
+                os.fsync(f.fileno())
             
         os.replace(tmp_path, path)
     except Exception as e:
@@ -27,27 +52,164 @@ def write_safe(path: str, content: Union[str, bytes]) -> None:
             os.remove(tmp_path)
         raise e
 
-async def write_safe_stream(path: str, file_obj) -> None:
+    fsync_dir(os.path.dirname(os.path.abspath(path)))
+
+def _fsync_path(path: str) -> None:
+    fd = os.open(path, os.O_RDWR)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class SafeWriteBatch:
+    """
+    Group-commit version of write_safe for writing many files at once.
+
+    write() stages content in {path}.tmp without syncing. commit() then
+    fsyncs all staged temps together (in a small thread pool, so the
+    syncs overlap), renames them into place, and fsyncs each affected
+    directory once. Every file still gets the write_safe guarantee (the
+    old or the new content, never a torn file), but the cost is one
+    round of syncs per batch instead of one per file.
+
+    Used as a context manager, the batch commits on success and discards
+    its temps if the block raises:
+
+        with SafeWriteBatch() as batch:
+            batch.write(path_a, "...")
+            batch.write(path_b, "...")
+    """
+
+    def __init__(self, max_workers: int = 8):
+        self.max_workers = max_workers
+        self._staged: Dict[str, str] = {}  # target path -> tmp path
+        self._callbacks: List[Callable[[], None]] = []
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._staged)
+
+    def write(self, path: str, content: Union[str, bytes]) -> None:
+        """Stages content for path. Writing the same path again replaces it."""
+        if self._closed:
+            raise RuntimeError("SafeWriteBatch is already committed or aborted")
+        tmp_path = path + ".tmp"
+        mode = 'wb' if isinstance(content, bytes) else 'w'
+        try:
+            with open(tmp_path, mode) as f:
+                f.write(content)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._staged[path] = tmp_path
+
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Registers a callback to run once all files are in place."""
+        self._callbacks.append(callback)
+
+    @metrics.timed("fs.batch_commit")
+    def commit(self) -> None:
+        if self._closed:
+            raise RuntimeError("SafeWriteBatch is already committed or aborted")
+        self._closed = True
+        if not self._staged:
+            return
+
+        workers = max(1, min(self.max_workers, len(self._staged)))
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # 1. Data reaches the disk before any rename
+                list(executor.map(_fsync_path, self._staged.values()))
+
+                # 2. Renames
+                for path, tmp_path in self._staged.items():
+                    os.replace(tmp_path, path)
+
+                # 3. One fsync per directory makes the renames durable
+                dirs = {os.path.dirname(os.path.abspath(p)) for p in self._staged}
+                list(executor.map(fsync_dir, dirs))
+        except Exception:
+            self._discard()
+            raise
+
+        self._staged.clear()
+        for callback in self._callbacks:
+            callback()
+
+    def abort(self) -> None:
+        """Removes all staged temps; targets are left untouched."""
+        self._closed = True
+        self._discard()
+
+    def _discard(self) -> None:
+        for tmp_path in self._staged.values():
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._staged.clear()
+
+    def __enter__(self) -> "SafeWriteBatch":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+class StreamWriteResult(NamedTuple):
+    sha256: str  # hex digest of the bytes written
+    size: int    # number of bytes written
+
+@metrics.timed("fs.write_safe_stream")
+async def write_safe_stream(
+    path: str,
+    file_obj,
+    chunk_size: int = 1024 * 1024,
+    accept: Optional[Callable[[StreamWriteResult], bool]] = None,
+) -> StreamWriteResult:
     """
     Async streaming version of write_safe for large files.
     'file_obj' should be a fastapi UploadFile or similar that has an async read method.
+
+    The SHA-256 and byte count are computed while the data is written, so
+    the upload is read exactly once. fsync runs in a worker thread to keep
+    the event loop responsive.
+
+    If 'accept' is given, it is called with the result once all data is
+    staged; returning False discards the temp file (without syncing it)
+    and leaves 'path' untouched.
     """
     import aiofiles
     tmp_path = path + ".tmp"
+    digest = hashlib.sha256()
+    size = 0
     
     try:
         async with aiofiles.open(tmp_path, 'wb') as f:
             while True:
-                chunk = await file_obj.read(1024 * 1024)  # 1MB chunks
+                chunk = await file_obj.read(chunk_size)
                 if not chunk:
                     break
-                await f.write(chunk)
-            await f.flush()
-            # Skipping explicit fsync due to aiofiles compatibility issues.
-            # The atomic rename below provides sufficient safety for this stage.
-            
+                # Hash in a thread while aiofiles writes in another
+                # (hashlib releases the GIL for large buffers).
+                await asyncio.gather(f.write(chunk), asyncio.to_thread(digest.update, chunk))
+                size += len(chunk)
+            result = StreamWriteResult(sha256=digest.hexdigest(), size=size)
+            discard = accept is not None and not accept(result)
+            if not discard:
+                await f.flush()
+                with metrics.timer("fs.fsync"):
+                    await asyncio.to_thread(os.fsync, f.fileno())
+
+        if discard:
+            os.remove(tmp_path)
+            return result
         os.replace(tmp_path, path)
     except Exception as e:
         if os.path.exists(tmp_path):
             os.remove(tmp_path)
         raise e
+
+    await asyncio.to_thread(fsync_dir, os.path.dirname(os.path.abspath(path)))
+    return result
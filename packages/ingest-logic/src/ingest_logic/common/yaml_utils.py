@@ -1,8 +1,15 @@
+import os
+import threading
 from ruamel.yaml import YAML
-from typing import Any
-from .fs_utils import write_safe
+from typing import Any, Optional
+from . import metrics
+from .fs_utils import SafeWriteBatch, write_safe
 from io import StringIO
 
+# ruamel YAML instances are reusable but not thread-safe, so each thread
+# keeps its own (FastAPI runs sync endpoints in a threadpool).
+_local = threading.local()
+
 def get_yaml() -> YAML:
     """Configures ruamel.yaml to preserve comments and layout."""
     yaml = YAML()
@@ -10,21 +17,58 @@ def get_yaml() -> YAML:
     yaml.indent(mapping=2, sequence=4, offset=2)
     return yaml
 
+def _round_trip_yaml() -> YAML:
+    yaml = getattr(_local, "round_trip", None)
+    if yaml is None:
+        yaml = get_yaml()
+        _local.round_trip = yaml
+    return yaml
+
+def _fast_yaml() -> YAML:
+    """
+    Safe (non round-trip) loader. Uses the libyaml-backed C parser from
+    ruamel.yaml.clib when it is installed, and pure Python otherwise.
+    """
+    yaml = getattr(_local, "fast", None)
+    if yaml is None:
+        yaml = YAML(typ="safe", pure=False)
+        _local.fast = yaml
+    return yaml
+
+@metrics.timed("yaml.load")
 def load_yaml(path: str) -> Any:
     """Safe loads a YAML file using ruamel."""
     if not os.path.exists(path):
         return None
     
-    yaml = get_yaml()
+    yaml = _round_trip_yaml()
     with open(path, 'r', encoding='utf-8') as f:
         return yaml.load(f)
 
-def save_yaml(path: str, data: Any) -> None:
-    """Saves data to YAML using safe write pattern."""
-    yaml = get_yaml()
+@metrics.timed("yaml.load_fast")
+def load_yaml_fast(path: str) -> Any:
+    """
+    Read-only load into plain dicts/lists, without comment preservation.
+    For listing, indexing and status scans only: anything that is edited
+    and saved back must use load_yaml to keep comments (INVARIANTS.md #2).
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return _fast_yaml().load(f)
+    except FileNotFoundError:
+        return None
+
+@metrics.timed("yaml.save")
+def save_yaml(path: str, data: Any, batch: Optional[SafeWriteBatch] = None) -> None:
+    """
+    Saves data to YAML using safe write pattern.
+    With a batch, the file is staged and lands when the batch commits.
+    """
+    yaml = _round_trip_yaml()
     stream = StringIO()
     yaml.dump(data, stream)
     content = stream.getvalue()
-    write_safe(path, content)
-
-import os
+    if batch is not None:
+        batch.write(path, content)
+    else:
+        write_safe(path, content)
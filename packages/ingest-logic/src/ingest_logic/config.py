@@ -1,7 +1,9 @@
+import hashlib
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 from pydantic import BaseModel
 from .common.fs_utils import write_safe
 
@@ -17,26 +19,45 @@ class ConfigManager:
             self.config_dir = Path.home() / ".config" / "digital-estate-mvp"
         
         self.config_file = self.config_dir / "config.json"
+        # (path, inode, mtime_ns, size) of config.json when it was parsed
+        self._cached: Optional[Tuple[tuple, AppConfig]] = None
+        self._cache_lock = threading.Lock()
         self._ensure_dir()
 
     def _ensure_dir(self):
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
     def load(self) -> AppConfig:
-        if not self.config_file.exists():
+        """
+        Returns the saved config. config.json is only parsed again when its
+        stat changes (write_safe replaces the file, so the inode changes on
+        every save), making repeated calls cost a single stat.
+        """
+        try:
+            st = os.stat(self.config_file)
+        except OSError:
             return AppConfig()
-        
+        key = (str(self.config_file), st.st_ino, st.st_mtime_ns, st.st_size)
+        with self._cache_lock:
+            if self._cached is not None and self._cached[0] == key:
+                return self._cached[1].model_copy()
+
         try:
             with open(self.config_file, 'r') as f:
                 data = json.load(f)
-                return AppConfig(**data)
+                config = AppConfig(**data)
         except (json.JSONDecodeError, OSError):
             # If corrupt or unreadable, return default (auth decision: maybe backup?)
             return AppConfig()
+        with self._cache_lock:
+            self._cached = (key, config)
+        return config.model_copy()
 
     def save(self, config: AppConfig) -> None:
         json_str = config.model_dump_json(indent=2)
         write_safe(str(self.config_file), json_str)
+        with self._cache_lock:
+            self._cached = None
 
     def get_archive_root(self) -> Optional[Path]:
         cfg = self.load()
@@ -44,6 +65,26 @@ class ConfigManager:
             return Path(cfg.archive_root)
         return None
 
+    def index_path(self, archive_root: str) -> Path:
+        """
+        Location of the disposable SQLite index for an archive.
+        Lives in the app config dir (not on the archive), one file per root.
+        """
+        resolved = os.path.abspath(str(archive_root))
+        digest = hashlib.sha1(resolved.encode("utf-8")).hexdigest()[:16]
+        return self.config_dir / "index" / f"{digest}.sqlite3"
+
+    def transcription_queue_path(self) -> Path:
+        """SQLite database holding the transcription job queue."""
+        return self.config_dir / "transcription_jobs.sqlite3"
+
+    def transcript_cache_path(self) -> Path:
+        """
+        SQLite cache of finished transcripts. Keyed by content hash, so
+        one cache serves every archive.
+        """
+        return self.config_dir / "transcript_cache.sqlite3"
+
     def set_archive_root(self, path: str) -> None:
         # Validate path existence?
         # The logic might span: validation -> save.
@@ -0,0 +1 @@
+from .archive_index import ArchiveIndex, open_archive_index
@@ -0,0 +1,321 @@
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from contracts.models import Person
+
+# Bump when the schema changes. The index is disposable (see INVARIANTS.md),
+# so a version mismatch simply drops everything and asks for a rebuild.
+SCHEMA_VERSION = 5
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS people (
+        pk INTEGER PRIMARY KEY,
+        slug TEXT NOT NULL UNIQUE,
+        id TEXT NOT NULL,
+        display_name TEXT,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS people_id ON people(id)",
+    # rowid = people.pk, so a person's row is replaced by rowid (a lookup
+    # by the unindexed slug column would scan the whole table)
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS people_fts USING fts5(
+        slug UNINDEXED,
+        names,
+        bio
+    )
+    """,
+    # Last seen (mtime_ns, size) of each bio.yaml, keyed by person slug.
+    # Used by the incremental rescan to skip unchanged files.
+    """
+    CREATE TABLE IF NOT EXISTS file_state (
+        slug TEXT PRIMARY KEY,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL
+    )
+    """,
+    # One row per recording metadata YAML (path relative to people/), with
+    # the content hash of its media file, its ingest status and the YAML's
+    # last seen stat.
+    """
+    CREATE TABLE IF NOT EXISTS recordings (
+        path TEXT PRIMARY KEY,
+        sha256 TEXT,
+        ingest_status TEXT,
+        mtime_ns INTEGER NOT NULL,
+        size INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS recordings_sha256 ON recordings(sha256)",
+    "CREATE INDEX IF NOT EXISTS recordings_status ON recordings(ingest_status)",
+]
+
+_TABLES = ["meta", "people", "people_fts", "file_state", "recordings"]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+class ArchiveIndex:
+    """
+    Disposable SQLite index of an archive.
+
+    Holds one row per person (the validated bio.yaml payload plus the
+    injected slug/display_name) and an FTS5 table over names and bio.
+    Everything in here can be regenerated from the filesystem.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        # FastAPI runs sync endpoints in a threadpool, so one connection is
+        # shared across threads and serialized with a lock.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._tx_depth = 0
+        self._migrate()
+
+    def _migrate(self) -> None:
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in _TABLES:
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator["ArchiveIndex"]:
+        """
+        Groups several writes into one SQLite transaction. Nested calls
+        (including the single-row write methods) join the outer transaction.
+        """
+        with self._lock:
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._conn.commit()
+
+    # -- meta -----------------------------------------------------------
+
+    def is_built(self) -> bool:
+        """True once a full rebuild has completed against this database."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'built'"
+            ).fetchone()
+        return row is not None
+
+    def mark_built(self) -> None:
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('built', '1')"
+            )
+
+    # -- file state -----------------------------------------------------
+
+    def get_file_states(self) -> Dict[str, Tuple[int, int]]:
+        """Returns {slug: (mtime_ns, size)} for every tracked bio.yaml."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT slug, mtime_ns, size FROM file_state"
+            ).fetchall()
+        return {slug: (mtime_ns, size) for slug, mtime_ns, size in rows}
+
+    def set_file_state(self, slug: str, mtime_ns: int, size: int) -> None:
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_state (slug, mtime_ns, size) VALUES (?, ?, ?)",
+                (slug, mtime_ns, size),
+            )
+
+    # -- recordings -----------------------------------------------------
+
+    def get_recording_states(self) -> Dict[str, Tuple[int, int]]:
+        """Returns {path: (mtime_ns, size)} for every tracked recording metadata file."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path, mtime_ns, size FROM recordings"
+            ).fetchall()
+        return {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+
+    def set_recording(
+        self, path: str, sha256: Optional[str], ingest_status: Optional[str], mtime_ns: int, size: int
+    ) -> None:
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recordings (path, sha256, ingest_status, mtime_ns, size) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (path, sha256, ingest_status, mtime_ns, size),
+            )
+
+    def remove_recording(self, path: str) -> None:
+        with self.transaction():
+            self._conn.execute("DELETE FROM recordings WHERE path = ?", (path,))
+
+    def find_recordings(self, sha256: str) -> List[str]:
+        """Returns the metadata paths of recordings with this content hash."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM recordings WHERE sha256 = ? ORDER BY path", (sha256,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def recordings_with_status(self, ingest_status: str) -> List[str]:
+        """Returns the metadata paths of recordings in the given ingest status."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT path FROM recordings WHERE ingest_status = ? ORDER BY path", (ingest_status,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # -- writes ---------------------------------------------------------
+
+    def _upsert(self, person: Person) -> None:
+        data = person.model_dump_json(exclude={"slug", "display_name"})
+        names = " ".join(
+            " ".join(part for part in (n.given, n.surname, n.suffix) if part)
+            for n in person.names
+        )
+        row = self._conn.execute("SELECT pk FROM people WHERE slug = ?", (person.slug,)).fetchone()
+        if row is None:
+            pk = self._conn.execute(
+                "INSERT INTO people (slug, id, display_name, data) VALUES (?, ?, ?, ?)",
+                (person.slug, person.id, person.display_name, data),
+            ).lastrowid
+        else:
+            pk = row[0]
+            self._conn.execute(
+                "UPDATE people SET id = ?, display_name = ?, data = ? WHERE pk = ?",
+                (person.id, person.display_name, data, pk),
+            )
+            self._conn.execute("DELETE FROM people_fts WHERE rowid = ?", (pk,))
+        self._conn.execute(
+            "INSERT INTO people_fts (rowid, slug, names, bio) VALUES (?, ?, ?, ?)",
+            (pk, person.slug, names, person.bio),
+        )
+
+    def upsert_person(self, person: Person) -> None:
+        """Adds or replaces a person. Requires the injected slug."""
+        if not person.slug:
+            raise ValueError(f"Cannot index person {person.id} without a slug")
+        with self.transaction():
+            self._upsert(person)
+
+    def remove_person(self, slug: str) -> None:
+        """Removes a person and its file state."""
+        with self.transaction():
+            row = self._conn.execute("SELECT pk FROM people WHERE slug = ?", (slug,)).fetchone()
+            if row is not None:
+                self._conn.execute("DELETE FROM people WHERE pk = ?", (row[0],))
+                self._conn.execute("DELETE FROM people_fts WHERE rowid = ?", (row[0],))
+            self._conn.execute("DELETE FROM file_state WHERE slug = ?", (slug,))
+
+    def clear(self) -> None:
+        """Empties every table, leaving the index unbuilt."""
+        with self.transaction():
+            for table in _TABLES:
+                self._conn.execute(f"DELETE FROM {table}")
+
+    # -- reads ----------------------------------------------------------
+
+    @staticmethod
+    def _to_person(slug: str, display_name: Optional[str], data: str) -> Person:
+        person = Person.model_validate_json(data)
+        person.slug = slug
+        person.display_name = display_name
+        return person
+
+    def count_people(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM people").fetchone()[0]
+
+    def person_ids(self) -> Set[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM people").fetchall()
+        return {row[0] for row in rows}
+
+    def list_people(self) -> List[Person]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT slug, display_name, data FROM people ORDER BY slug"
+            ).fetchall()
+        return [self._to_person(*row) for row in rows]
+
+    def list_people_page(self, after: Optional[str] = None, limit: int = 100) -> List[Person]:
+        """Returns up to 'limit' people ordered by slug, starting after the given slug."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT slug, display_name, data FROM people WHERE slug > ? ORDER BY slug LIMIT ?",
+                (after or "", limit),
+            ).fetchall()
+        return [self._to_person(*row) for row in rows]
+
+    def search_people(self, query: str, limit: int = 50) -> List[Person]:
+        """
+        Full-text search over names and bio. Each word in the query is
+        matched as a prefix, and all words must match.
+
+        Raises:
+            ValueError: If the query contains no searchable words.
+        """
+        tokens = _TOKEN_RE.findall(query or "")
+        if not tokens:
+            raise ValueError("Search query is empty")
+        match = " ".join(f'"{t}"*' for t in tokens)
+
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT p.slug, p.display_name, p.data
+                FROM people_fts f JOIN people p ON p.pk = f.rowid
+                WHERE people_fts MATCH ?
+                ORDER BY bm25(people_fts), p.slug
+                LIMIT ?
+                """,
+                (match, limit),
+            ).fetchall()
+        return [self._to_person(*row) for row in rows]
+
+
+_open_indexes: Dict[str, ArchiveIndex] = {}
+_open_lock = threading.Lock()
+
+
+def open_archive_index(db_path: str) -> ArchiveIndex:
+    """
+    Returns the process-wide ArchiveIndex for db_path, opening it on first use.
+    """
+    key = os.path.abspath(db_path)
+    with _open_lock:
+        index = _open_indexes.get(key)
+        if index is None:
+            index = ArchiveIndex(key)
+            _open_indexes[key] = index
+        return index
@@ -0,0 +1,172 @@
+import csv
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Iterator, List, Optional, Set, Tuple, Union, TYPE_CHECKING
+
+from pydantic import BaseModel
+from contracts.models import Person
+
+if TYPE_CHECKING:
+    from .manager import PersonManager
+
+# Column / key names, matching the PersonCreate API payload.
+REQUIRED_FIELDS = ("family_name", "given_name", "dob")
+
+Row = Tuple[int, Union[dict, Exception]]
+
+
+class ImportRowResult(BaseModel):
+    row: int
+    status: str  # "created" | "skipped" | "failed"
+    id: Optional[str] = None
+    slug: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ImportReport(BaseModel):
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    rows: List[ImportRowResult] = []
+
+
+def iter_csv_rows(stream: IO[str]) -> Iterator[Row]:
+    """Yields (row_number, dict) for each CSV data row. Row 1 is the header."""
+    reader = csv.DictReader(stream)
+    for row_number, row in enumerate(reader, start=2):
+        yield row_number, row
+
+
+def iter_jsonl_rows(stream: IO[str]) -> Iterator[Row]:
+    """Yields (line_number, dict) per JSON line, or the parse error in place of the dict."""
+    for line_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            yield line_number, ValueError(f"Invalid JSON: {e}")
+            continue
+        yield line_number, data
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[Row]:
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    if fmt == "jsonl":
+        return iter_jsonl_rows(stream)
+    raise ValueError(f"Unknown import format: {fmt}")
+
+
+def detect_format(filename: str) -> str:
+    """Maps a file name to 'csv' or 'jsonl'. Raises ValueError otherwise."""
+    lower = (filename or "").lower()
+    if lower.endswith(".csv"):
+        return "csv"
+    if lower.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError(f"Cannot tell import format from file name: {filename!r} (use .csv or .jsonl)")
+
+
+def import_people(
+    manager: "PersonManager",
+    rows: Iterator[Row],
+    batch_size: int = 500,
+    max_workers: int = 4,
+    existing_ids: Optional[Set[str]] = None,
+) -> ImportReport:
+    """
+    Creates people from a stream of rows.
+
+    IDs are computed with generate_person_id and checked against the IDs
+    already in the archive (loaded once up front), so duplicates, and
+    repeats within the import itself, are skipped without touching disk.
+    New people are saved in chunks of batch_size, each chunk through one
+    SafeWriteBatch, with up to max_workers chunks in flight.
+
+    Returns a per-row report.
+    """
+    workers = max(1, max_workers)
+    known = set(existing_ids) if existing_ids is not None else manager.known_person_ids()
+    report = ImportReport()
+    results: List[ImportRowResult] = []
+
+    def save_chunk(chunk):
+        manager.save_people(person for _, person in chunk)
+
+    def settle(chunk, future):
+        try:
+            future.result()
+        except Exception as e:
+            for result, _ in chunk:
+                result.status = "failed"
+                result.error = f"Write failed: {e}"
+                report.failed += 1
+            return
+        for result, person in chunk:
+            result.slug = person.slug
+            report.created += 1
+
+    pending = deque()
+    chunk: List[Tuple[ImportRowResult, Person]] = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import_people") as executor:
+        def flush():
+            nonlocal chunk
+            if not chunk:
+                return
+            pending.append((chunk, executor.submit(save_chunk, chunk)))
+            chunk = []
+            while len(pending) > workers:
+                settle(*pending.popleft())
+
+        for row_number, data in rows:
+            result = ImportRowResult(row=row_number, status="created")
+            results.append(result)
+            try:
+                person = _person_from_row(manager, data)
+            except Exception as e:
+                result.status = "failed"
+                result.error = str(e)
+                report.failed += 1
+                continue
+
+            result.id = person.id
+            if person.id in known:
+                result.status = "skipped"
+                result.error = "Person already exists"
+                report.skipped += 1
+                continue
+
+            known.add(person.id)
+            chunk.append((result, person))
+            if len(chunk) >= batch_size:
+                flush()
+
+        flush()
+        while pending:
+            settle(*pending.popleft())
+
+    report.rows = results
+    return report
+
+
+def _person_from_row(manager: "PersonManager", data: Union[dict, Exception]) -> Person:
+    if isinstance(data, Exception):
+        raise data
+
+    missing = [f for f in REQUIRED_FIELDS if not str(data.get(f) or "").strip()]
+    if missing:
+        raise ValueError(f"Missing required field(s): {', '.join(missing)}")
+
+    return manager.build_person(
+        family=str(data["family_name"]),
+        given=str(data["given_name"]),
+        dob=str(data["dob"]),
+        suffix=str(data.get("suffix") or ""),
+        bio=str(data.get("bio") or ""),
+    )
@@ -1,41 +1,159 @@
 import hashlib
+import re
+from typing import List
 
-def _int_to_base36(n: int) -> str:
-    """Converts an integer to a base36 string."""
-    alphabet = "0123456789abcdefghijklmnopqrstuvwxyz"
-    if n == 0:
-        return "0"
-    
-    res = []
-    while n > 0:
-        n, r = divmod(n, 36)
-        res.append(alphabet[r])
-    return "".join(reversed(res))
+BASE36_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+_BASE36_RE = re.compile(r"[0-9a-z]+")
 
-def generate_person_id(family: str, given: str, suffix: str, dob: str) -> str:
+# Digits are produced two at a time (divmod by 36**2 and a table lookup),
+# which halves the divisions of a digit-at-a-time loop.
+_PAIRS = [a + b for a in BASE36_ALPHABET for b in BASE36_ALPHABET]
+# Numbers below 36**96 (~496 bits, a long name) are converted directly;
+# larger ones are first split into blocks of that size.
+_LEAF_DIGITS = 96
+_LEAF = 36 ** _LEAF_DIGITS
+# Strings up to this long are decoded by int(s, 36) in one go; longer ones
+# are split (int() is quadratic, and refuses > 4300 digits since 3.11).
+_DECODE_LEAF_DIGITS = 1024
+
+# ID schemes:
+#   legacy   the whole canonical string as a base36 number; reversible,
+#            but the length grows with the name
+#   compact  COMPACT_ID_LENGTH base36 digits (~82 bits) of the canonical
+#            string's SHA-256; fixed length, shards evenly
+ID_SCHEME_LEGACY = "legacy"
+ID_SCHEME_COMPACT = "compact"
+ID_SCHEMES = (ID_SCHEME_LEGACY, ID_SCHEME_COMPACT)
+COMPACT_ID_LENGTH = 16
+
+def _leaf_to_base36(n: int, width: int = 0) -> str:
+    """n < 36**96 in base36, zero-padded to width (unpadded if 0)."""
+    pairs = []
+    while n >= 1296:
+        n, r = divmod(n, 1296)
+        pairs.append(_PAIRS[r])
+    pairs.append(_PAIRS[n])
+    digits = "".join(reversed(pairs))
+    return digits.rjust(width, "0") if width else (digits.lstrip("0") or "0")
+
+def int_to_base36(n: int) -> str:
     """
-    Generates a unique ID based on the canonical identity string:
-    <family>|<given>|<suffix>|<YYYY-MM-DD>
-    
-    The string is UTF-8 encoded, treated as a big-endian integer, 
-    and converted to Base36.
+    Converts a non-negative integer to base36.
+
+    Divide and conquer: n is split by 36**(96*2**k) into halves that are
+    converted independently, so the big-number divisions work on ever
+    smaller numbers instead of a digit-at-a-time loop over the whole of n
+    (quadratic in its length).
+    """
+    if n < 0:
+        raise ValueError("Cannot encode a negative integer")
+    if n < _LEAF:
+        return _leaf_to_base36(n)
+
+    # powers[i] = 36**(96 * 2**i), until powers[-1]**2 > n
+    powers = [_LEAF]
+    while powers[-1] * powers[-1] <= n:
+        powers.append(powers[-1] * powers[-1])
+
+    parts: List[str] = []
+
+    def convert(m: int, level: int) -> None:
+        # m < powers[level]**2; appends exactly 2 * 96 * 2**level digits
+        high, low = divmod(m, powers[level])
+        if level == 0:
+            parts.append(_leaf_to_base36(high, _LEAF_DIGITS))
+            parts.append(_leaf_to_base36(low, _LEAF_DIGITS))
+            return
+        convert(high, level - 1)
+        convert(low, level - 1)
+
+    convert(n, len(powers) - 1)
+    return "".join(parts).lstrip("0")
+
+# Kept for callers of the old name
+_int_to_base36 = int_to_base36
+
+def base36_to_int(s: str) -> int:
+    """
+    Inverse of int_to_base36 (lowercase digits only).
+
+    Raises:
+        ValueError: If s is empty or not base36.
+    """
+    if not _BASE36_RE.fullmatch(s or ""):
+        raise ValueError(f"Not a base36 string: {s!r}")
+    if len(s) <= _DECODE_LEAF_DIGITS:
+        return int(s, 36)
+    # Split so the low half is a power-of-two multiple of the leaf size,
+    # which keeps the powers of 36 shared across the recursion.
+    width = _DECODE_LEAF_DIGITS
+    while width * 2 < len(s):
+        width *= 2
+    return base36_to_int(s[:-width]) * 36 ** width + base36_to_int(s[-width:])
+
+def canonical_identity(family: str, given: str, suffix: str, dob: str) -> str:
+    """
+    The canonical identity string <family>|<given>|<suffix>|<YYYY-MM-DD>,
+    from stripped inputs.
     """
-    # Normalize inputs
     family = (family or "").strip()
     given = (given or "").strip()
     suffix = (suffix or "").strip()
     dob = (dob or "").strip()
-    
-    canonical = f"{family}|{given}|{suffix}|{dob}"
-    
+    return f"{family}|{given}|{suffix}|{dob}"
+
+def generate_person_id(family: str, given: str, suffix: str, dob: str, scheme: str = ID_SCHEME_LEGACY) -> str:
+    """
+    Generates a unique ID based on the canonical identity string:
+    <family>|<given>|<suffix>|<YYYY-MM-DD>
+
+    legacy (default): the string is UTF-8 encoded, treated as a big-endian
+    integer, and converted to Base36 (see decode_person_id).
+    compact: a fixed-length Base36 digest of the string (see ID_SCHEMES).
+    An archive must stick to one scheme, or the same person gets two IDs.
+    """
+    canonical = canonical_identity(family, given, suffix, dob)
+    utf8_bytes = canonical.encode('utf-8')
+
+    if scheme == ID_SCHEME_COMPACT:
+        digest = int.from_bytes(hashlib.sha256(utf8_bytes).digest(), byteorder='big')
+        # Low digits: the leading digit of a 256-bit number is skewed
+        return int_to_base36(digest % 36 ** COMPACT_ID_LENGTH).rjust(COMPACT_ID_LENGTH, "0")
+    if scheme != ID_SCHEME_LEGACY:
+        raise ValueError(f"Unknown ID scheme: {scheme}")
+
     # Mathematical analysis implementation:
     # "interpreted as utf8_bytes expressed as a big-median integer X"
-    utf8_bytes = canonical.encode('utf-8')
     integer_value = int.from_bytes(utf8_bytes, byteorder='big')
-    
-    base36_id = _int_to_base36(integer_value)
+
+    base36_id = int_to_base36(integer_value)
     return base36_id
 
+def decode_person_id(person_id: str) -> str:
+    """
+    The canonical identity string a legacy ID encodes.
+
+    Raises:
+        ValueError: If person_id is not a legacy ID (compact IDs are
+            digests and can only be checked with verify_person_id).
+    """
+    n = base36_to_int(person_id)
+    try:
+        return n.to_bytes((n.bit_length() + 7) // 8, byteorder='big').decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError(f"Not a legacy person ID: {person_id!r}")
+
+def verify_person_id(person_id: str, family: str, given: str, suffix: str, dob: str) -> bool:
+    """Whether person_id is the ID of this identity under either scheme."""
+    return person_id in (
+        generate_person_id(family, given, suffix, dob, scheme)
+        for scheme in ID_SCHEMES
+    )
+
+def is_person_id(person_id: str) -> bool:
+    """Whether person_id has the form of a person ID (lowercase base36, either scheme)."""
+    return bool(_BASE36_RE.fullmatch(person_id or ""))
+
 def get_shard_path(person_id: str) -> str:
     """
     Returns the relative shard path for a person ID.
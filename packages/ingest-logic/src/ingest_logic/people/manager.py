@@ -1,16 +1,59 @@
+import logging
 import os
 import shutil
-from typing import List, Dict, Optional
-from ..common.fs_utils import write_safe
-from ..common.yaml_utils import save_yaml, load_yaml
-from .identity import generate_person_id, get_shard_path
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Set, Tuple
+from ..common import metrics
+from ..common.fs_utils import SafeWriteBatch, write_safe
+from ..common.yaml_utils import save_yaml, load_yaml_fast
+from .identity import ID_SCHEME_LEGACY, generate_person_id, get_shard_path, is_person_id
+from .scan import iter_bio_files, rescan_index
+from ..index.archive_index import ArchiveIndex
 from contracts.models import Person, PersonName, PersonNameType, PersonVitals, PersonBirth
 import re
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 1024
+DEFAULT_IO_WORKERS = 8
+
+class PersonDataError(ValueError):
+    """A person's bio.yaml is on disk but can't be read as a Person."""
+
+def _log_load_error(slug: str, error: Exception) -> None:
+    logger.warning("Error loading person at %s: %s", slug, error)
+
 class PersonManager:
-    def __init__(self, root_path: str):
+    def __init__(
+        self,
+        root_path: str,
+        index: Optional[ArchiveIndex] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        id_scheme: str = ID_SCHEME_LEGACY,
+    ):
         self.root_path = root_path
         self.people_dir = os.path.join(root_path, "people")
+        # Optional disposable index; when set, writes go through to it and
+        # list/search reads come from it instead of walking the disk.
+        self.index = index
+        # How new IDs are generated (see identity.ID_SCHEMES); fixed per archive
+        self.id_scheme = id_scheme
+
+        # LRU of parsed people: slug -> (mtime_ns, size, Person).
+        # Entries are only trusted while bio.yaml's stat still matches.
+        self._cache: "OrderedDict[str, Tuple[int, int, Person]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
+
+        # person ID -> slug, filled by saves and shard listings (see get_person_by_id)
+        self._id_slugs: Dict[str, str] = {}
+        self._id_lock = threading.Lock()
+
         self._ensure_root()
 
     def _ensure_root(self):
@@ -24,17 +67,26 @@ class PersonManager:
         name = name.strip().replace(' ', '_')
         return name
 
+    @metrics.timed("person.create")
     def create_person(self, family: str, given: str, dob: str, suffix: str = "", bio: str = "") -> Person:
         """
         Factory method to create a new Person.
         Generates ID, constructs object, and persists it.
         """
+        person = self.build_person(family, given, dob, suffix=suffix, bio=bio)
+        self.save_person(person)
+        return person
+
+    def build_person(self, family: str, given: str, dob: str, suffix: str = "", bio: str = "") -> Person:
+        """
+        Generates the ID and constructs a validated Person without saving it.
+        """
         family = family.strip()
         given = given.strip()
         suffix = suffix.strip()
         dob = dob.strip()
         
-        person_id = generate_person_id(family, given, suffix, dob)
+        person_id = generate_person_id(family, given, suffix, dob, scheme=self.id_scheme)
         
         # Construct Pydantic object
         person = Person(
@@ -52,15 +104,25 @@ class PersonManager:
             ),
             bio=bio
         )
-
-        self.save_person(person)
         return person
 
-    def save_person(self, person: Person) -> None:
+    @metrics.timed("person.save")
+    def save_person(self, person: Person, batch: Optional[SafeWriteBatch] = None) -> None:
         """
         Persists a Person object to disk.
         Determines path from ID and Names.
+
+        With a batch, bio.yaml is staged and the cache/index are updated
+        once the batch commits.
         """
+        bio_path = self._write_person(person, batch)
+        if batch is not None:
+            batch.after_commit(lambda: self._after_save([(person, bio_path)]))
+        else:
+            self._after_save([(person, bio_path)])
+
+    def _write_person(self, person: Person, batch: Optional[SafeWriteBatch]) -> str:
+        """Writes (or stages) person's bio.yaml and sets its slug; returns the path."""
         # Determine Path
         shard = get_shard_path(person.id)
         
@@ -87,82 +149,336 @@ class PersonManager:
         # Validation is handled by Pydantic model construction in caller or here
         data = person.model_dump(mode='json', exclude={'slug', 'display_name'})
         
-        save_yaml(bio_path, data)
+        save_yaml(bio_path, data, batch=batch)
         
         # Update injected fields on the object just in case
         person.slug = os.path.join(shard, dir_name)
         person.display_name = readable_name
+        return bio_path
+
+    @metrics.timed("person.save_many")
+    def save_people(self, people: Iterable[Person]) -> int:
+        """
+        Persists many people with one group commit (see SafeWriteBatch),
+        followed by a single index transaction for all of them.
+        Returns the number saved.
+        """
+        saved: List[Tuple[Person, str]] = []
+        with SafeWriteBatch() as batch:
+            for person in people:
+                saved.append((person, self._write_person(person, batch)))
+            batch.after_commit(lambda: self._after_save(saved))
+        return len(saved)
+
+    def known_person_ids(self) -> Set[str]:
+        """
+        IDs of every person in the archive: from the index when attached
+        and built, otherwise from the person directory names (<name>--<id>).
+        """
+        if self.index is not None and self.index.is_built():
+            return self.index.person_ids()
+        return {bio.slug.rsplit("--", 1)[-1] for bio in iter_bio_files(self.people_dir)}
 
+    def _after_save(self, saved: List[Tuple[Person, str]]) -> None:
+        """Updates the cache, ID map and index for (person, bio_path) pairs now on disk."""
+        for person, _ in saved:
+            self._cache_invalidate(person.slug)
+        with self._id_lock:
+            for person, _ in saved:
+                self._id_slugs[person.id] = person.slug
+
+        if self.index is not None:
+            # Record the file state too, so the next rescan treats it as
+            # unchanged. Stat first: the index lock is only held for the
+            # one commit.
+            states = [(person, os.stat(bio_path)) for person, bio_path in saved]
+            with self.index.transaction():
+                for person, st in states:
+                    self.index.upsert_person(person)
+                    self.index.set_file_state(person.slug, st.st_mtime_ns, st.st_size)
+
+    @metrics.timed("person.list")
     def list_people(self) -> List[Person]:
         """
-        Scans arbitrarily deep to find bio.yaml files.
-        Returns List[Person].
+        Returns List[Person], from the index when one is attached,
+        otherwise by scanning the filesystem.
         """
-        people = []
-        if not os.path.exists(self.people_dir):
-            return people
-
-        for root, dirs, files in os.walk(self.people_dir):
-            if "bio.yaml" in files:
-                try:
-                    full_path = os.path.join(root, "bio.yaml")
-                    data = load_yaml(full_path)
-                    if data:
-                        # Validate and Parse via Pydantic
-                        # If schema mismatches, this will raise ValidationError
-                        person = Person(**data)
-                        
-                        # Inject runtime fields
-                        rel_path = os.path.relpath(root, self.people_dir)
-                        person.slug = rel_path
-                        
-                        primary = next((n for n in person.names if n.type == PersonNameType.PRIMARY), None)
-                        if primary:
-                             person.display_name = f"{primary.surname}, {primary.given}".strip(', ')
-                        
-                        people.append(person)
-                except Exception as e:
-                    # Per requirement: "raise a clear error (do not silently fix it)"
-                    # However, list_people usually shouldn't crash the whole app on one bad file?
-                    # But the prompt says "If the existing data on disk does not match... code should raise a clear error"
-                    # I will log and re-raise/or just let it raise if it happens during 'load'
-                    # For list_people, maybe we warn? 
-                    # Prompt says "do not silently fix it". Failing loudly is acceptable for "Strict" contract.
-                    print(f"Error loading person at {root}: {e}")
-                    pass # We skip for now to allow other people to load, or should we raise?
-                    # The prompt "code should raise a clear error" usually applies to the read-path of a specific item.
-                    # For listing, if one file is corrupt, failing the whole list might be annoying but "Strict".
-                    # I will keep 'pass' for list iteration robustness but maybe print/log error.
-                    # Actually, for 'get_person', I definitely raise.
-                    pass
-
-        return people
+        if self.index is not None:
+            return self.index.list_people()
+        return list(self.iter_people())
+
+    @metrics.timed("person.list_page")
+    def list_people_page(self, limit: int = 100, after: Optional[str] = None) -> Tuple[List[Person], Optional[str]]:
+        """
+        Returns one page of people ordered by shard/slug, starting after the
+        slug 'after', plus the slug to continue from (None on the last page).
+
+        Without an index the people tree is walked from the cursor's shard
+        (see iter_bio_files), so a page parses only its own bio.yaml files
+        and lists the directories on the way there.
+        """
+        if self.index is not None:
+            people = self.index.list_people_page(after=after, limit=limit + 1)
+        else:
+            people = []
+            for person in self.iter_people(ordered=True, after=after):
+                people.append(person)
+                if len(people) > limit:
+                    break
+
+        if len(people) > limit:
+            people = people[:limit]
+            return people, people[-1].slug
+        return people, None
+
+    def iter_listing(self, batch_size: int = 500) -> Iterator[Person]:
+        """
+        Yields every person in shard/slug order without materializing the
+        whole list: index pages of batch_size when attached, otherwise
+        streamed from disk.
+        """
+        if self.index is None:
+            yield from self.iter_people(ordered=True)
+            return
+
+        after = None
+        while True:
+            page = self.index.list_people_page(after=after, limit=batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = page[-1].slug
+
+    @metrics.timed("person.search")
+    def search_people(self, query: str, limit: int = 50) -> List[Person]:
+        """
+        Full-text search over names and bio. Requires an index.
+
+        Raises:
+            RuntimeError: If no index is attached.
+            ValueError: If the query is empty.
+        """
+        if self.index is None:
+            raise RuntimeError("Search requires an index")
+        return self.index.search_people(query, limit=limit)
 
+    @metrics.timed("person.rebuild_index")
+    def rebuild_index(self) -> Dict[str, int]:
+        """
+        Clears the index and repopulates it from the filesystem.
+        Returns counts of indexed people and files that failed to load.
+        """
+        if self.index is None:
+            raise RuntimeError("No index attached")
+        with self.index.transaction():
+            self.index.clear()
+            counts = rescan_index(self, self.index)
+            self.index.mark_built()
+        return {"people": counts["added"], "errors": counts["errors"]}
+
+    @metrics.timed("person.refresh_index")
+    def refresh_index(self) -> Dict[str, int]:
+        """
+        Incremental rescan: reparses only bio.yaml files whose mtime/size
+        changed since they were last indexed, and drops deleted people.
+        """
+        if self.index is None:
+            raise RuntimeError("No index attached")
+        return rescan_index(self, self.index)
+
+    def load_person_file(self, full_path: str, slug: str) -> Optional[Person]:
+        """
+        Loads and validates one bio.yaml, injecting slug and display_name.
+        Returns None for an empty file; raises on schema mismatch.
+        """
+        # Read-only: save_person always rewrites bio.yaml from the model,
+        # so the comment-preserving round-trip loader buys nothing here.
+        data = load_yaml_fast(full_path)
+        if not data:
+            return None
+
+        person = Person(**data)
+        person.slug = slug
+
+        primary = next((n for n in person.names if n.type == PersonNameType.PRIMARY), None)
+        if primary:
+             person.display_name = f"{primary.surname}, {primary.given}".strip(', ')
+        return person
+
+    def iter_people(
+        self,
+        ordered: bool = True,
+        max_workers: int = DEFAULT_IO_WORKERS,
+        on_error: Optional[Callable[[str, Exception], None]] = None,
+        after: Optional[str] = None,
+    ) -> Iterator[Person]:
+        """
+        Streams people from the filesystem, loading bio.yaml files in a
+        bounded thread pool (the work is dominated by disk I/O and YAML parsing).
+
+        Args:
+            ordered: Yield in shard/slug order. If False, people are yielded
+                as soon as they finish loading.
+            max_workers: Number of loader threads. At most 2x this many files
+                are in flight, so memory stays bounded for large archives.
+            on_error: Called with (slug, exception) for files that fail to load.
+                Defaults to logging a warning. Bad files are skipped.
+            after: Only people whose slug sorts after this one (a page cursor).
+        """
+        if on_error is None:
+            on_error = _log_load_error
+
+        bio_files = iter_bio_files(self.people_dir, after=after)
+        max_in_flight = max(1, max_workers) * 2
+
+        def load(bio):
+            try:
+                return self.load_person_file(bio.path, bio.slug), None
+            except Exception as e:
+                return None, e
+
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="iter_people")
+        pending = deque()
+        try:
+            for bio in bio_files:
+                pending.append((bio.slug, executor.submit(load, bio)))
+                if len(pending) >= max_in_flight:
+                    yield from self._drain(pending, ordered, on_error, until=max_in_flight - 1)
+            yield from self._drain(pending, ordered, on_error, until=0)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _drain(pending, ordered, on_error, until: int) -> Iterator[Person]:
+        """Yields finished loads until at most 'until' remain pending."""
+        while len(pending) > until:
+            if ordered:
+                slug, future = pending.popleft()
+            else:
+                done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                slug, future = next(item for item in pending if item[1] in done)
+                pending.remove((slug, future))
+
+            person, error = future.result()
+            if error is not None:
+                on_error(slug, error)
+            elif person is not None:
+                yield person
+
+    @metrics.timed("person.get")
     def get_person(self, relative_path: str) -> Optional[Person]:
         """
         Retrieves person by relative path from people root.
+        Served from the LRU cache while bio.yaml's (mtime_ns, size) is unchanged,
+        so a repeated read costs a single stat.
+
+        Raises:
+            ValueError: If relative_path escapes the people directory.
+            PersonDataError: If bio.yaml exists but can't be read.
         """
         # Sanity check path traversal
         if ".." in relative_path or relative_path.startswith("/"):
             raise ValueError("Invalid path")
             
         full_path = os.path.join(self.people_dir, relative_path, "bio.yaml")
-        if not os.path.exists(full_path):
+        try:
+            st = os.stat(full_path)
+        except (FileNotFoundError, NotADirectoryError):
+            self._cache_invalidate(relative_path)
             return None
-            
-        data = load_yaml(full_path)
-        if not data:
-             return None # Or raise Empty File error
+
+        cached = self._cache_get(relative_path, st.st_mtime_ns, st.st_size)
+        if cached is not None:
+            return cached
 
         try:
-            person = Person(**data)
-            person.slug = relative_path
-            
-            primary = next((n for n in person.names if n.type == PersonNameType.PRIMARY), None)
-            if primary:
-                 person.display_name = f"{primary.surname}, {primary.given}".strip(', ')
-            
-            return person
+            person = self.load_person_file(full_path, relative_path)
         except Exception as e:
-             raise ValueError(f"Data corruption or schema mismatch for {relative_path}: {e}")
+             raise PersonDataError(f"Data corruption or schema mismatch for {relative_path}: {e}")
+        if person is None:
+             return None # Or raise Empty File error
+
+        self._cache_put(relative_path, st.st_mtime_ns, st.st_size, person)
+        return person
+
+    @metrics.timed("person.get_by_id")
+    def get_person_by_id(self, person_id: str) -> Optional[Person]:
+        """
+        Retrieves a person by ID alone. The ID determines the shard
+        (get_shard_path), so at most that one shard directory is listed to
+        find the <name>--<id> folder; the result, and every other ID seen
+        in the listing, is remembered, so repeat lookups cost what
+        get_person does (one stat while cached).
+
+        Raises:
+            ValueError: If person_id is not a person ID (see is_person_id).
+            PersonDataError: If the person's bio.yaml can't be read.
+        """
+        if not is_person_id(person_id):
+            raise ValueError("Invalid person ID")
+
+        with self._id_lock:
+            slug = self._id_slugs.get(person_id)
+        if slug is not None:
+            person = self.get_person(slug)
+            if person is not None and person.id == person_id:
+                return person
+            # Renamed or deleted since it was seen
+            with self._id_lock:
+                self._id_slugs.pop(person_id, None)
+
+        slug = self._scan_shard_for(person_id)
+        return self.get_person(slug) if slug is not None else None
+
+    def _scan_shard_for(self, person_id: str) -> Optional[str]:
+        shard = get_shard_path(person_id)
+        found = {}
+        try:
+            with os.scandir(os.path.join(self.people_dir, shard)) as it:
+                for entry in it:
+                    name, sep, entry_id = entry.name.rpartition("--")
+                    if sep and name and entry.is_dir():
+                        found[entry_id] = os.path.join(shard, entry.name)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        with self._id_lock:
+            self._id_slugs.update(found)
+        return found.get(person_id)
+
+    # -- Person cache --
+
+    def _cache_get(self, slug: str, mtime_ns: int, size: int) -> Optional[Person]:
+        with self._cache_lock:
+            entry = self._cache.get(slug)
+            if entry is not None and entry[0] == mtime_ns and entry[1] == size:
+                self._cache.move_to_end(slug)
+                self._cache_hits += 1
+                # Hand out a copy so callers can't mutate the cached object
+                return entry[2].model_copy(deep=True)
+            self._cache_misses += 1
+            return None
+
+    def _cache_put(self, slug: str, mtime_ns: int, size: int, person: Person) -> None:
+        if self._cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[slug] = (mtime_ns, size, person.model_copy(deep=True))
+            self._cache.move_to_end(slug)
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+                self._cache_evictions += 1
+
+    def _cache_invalidate(self, slug: str) -> None:
+        with self._cache_lock:
+            self._cache.pop(slug, None)
 
+    def cache_info(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current size of the Person cache."""
+        with self._cache_lock:
+            return {
+                "hits": self._cache_hits,
+                "misses": self._cache_misses,
+                "evictions": self._cache_evictions,
+                "size": len(self._cache),
+                "maxsize": self._cache_size,
+            }
@@ -0,0 +1,116 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, NamedTuple, Optional, TYPE_CHECKING
+
+from ..index.archive_index import ArchiveIndex
+
+if TYPE_CHECKING:
+    from .manager import PersonManager
+
+logger = logging.getLogger(__name__)
+
+BIO_FILENAME = "bio.yaml"
+
+
+class BioFile(NamedTuple):
+    slug: str       # Path of the person directory relative to people/
+    path: str       # Absolute path of bio.yaml
+    mtime_ns: int
+    size: int
+
+
+def iter_bio_files(people_dir: str, after: Optional[str] = None) -> Iterator[BioFile]:
+    """
+    Walks the people tree with os.scandir and yields every bio.yaml.
+
+    A directory that holds a bio.yaml is a person directory; its contents
+    (recordings etc.) are never descended into. For every other directory
+    a single stat of <dir>/bio.yaml decides, so shard directories cost one
+    failed stat plus one scandir and person directories cost one stat.
+
+    With after (a slug), only people whose slug sorts after it are
+    yielded, and the walk seeks there: along the cursor's shard path,
+    entries that sort before it are neither stat'ed nor listed.
+    """
+    after_parts = after.split(os.sep) if after else None
+    # (rel, path, depth along the cursor's path, or None once past it)
+    stack = [("", people_dir, 0 if after_parts else None)]
+    while stack:
+        rel, path, depth = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = [e for e in it if e.is_dir(follow_symlinks=False)]
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        bound = after_parts[depth] if depth is not None and depth < len(after_parts) else None
+        if bound is not None:
+            entries = [e for e in entries if e.name >= bound]
+        # Sorted so people come out ordered by shard/slug.
+        entries.sort(key=lambda e: e.name)
+        subdirs = []
+        for entry in entries:
+            on_path = bound is not None and entry.name == bound
+            child_rel = os.path.join(rel, entry.name) if rel else entry.name
+            bio_path = os.path.join(entry.path, BIO_FILENAME)
+            try:
+                st = os.stat(bio_path)
+            except FileNotFoundError:
+                subdirs.append((child_rel, entry.path, depth + 1 if on_path else None))
+                continue
+            except NotADirectoryError:
+                continue
+            if on_path:
+                # The cursor itself (or a person dir sorting before it)
+                continue
+            yield BioFile(child_rel, bio_path, st.st_mtime_ns, st.st_size)
+        stack.extend(reversed(subdirs))
+
+
+def rescan_index(manager: "PersonManager", index: ArchiveIndex, max_workers: int = 8) -> Dict[str, int]:
+    """
+    Brings the index in line with the people tree by comparing each
+    bio.yaml's (mtime_ns, size) to the stored file state.
+
+    Only added or changed files are parsed (in a pool of max_workers
+    threads); people whose bio.yaml is gone are removed. Files that fail
+    to load are dropped from the index but their state is recorded, so
+    they are retried only once they change.
+
+    Returns counts of added, changed, deleted, unchanged and errored files.
+    """
+    known = index.get_file_states()
+    counts = {"added": 0, "changed": 0, "deleted": 0, "unchanged": 0, "errors": 0}
+
+    to_load = []
+    for bio in iter_bio_files(manager.people_dir):
+        previous = known.pop(bio.slug, None)
+        if previous == (bio.mtime_ns, bio.size):
+            counts["unchanged"] += 1
+        else:
+            to_load.append((bio, previous is None))
+
+    def load(item):
+        bio, _ = item
+        try:
+            return manager.load_person_file(bio.path, bio.slug)
+        except Exception as e:
+            logger.warning("Error loading person at %s: %s", bio.slug, e)
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor, index.transaction():
+        for (bio, is_new), person in zip(to_load, executor.map(load, to_load)):
+            if person is None:
+                index.remove_person(bio.slug)
+                counts["errors"] += 1
+            else:
+                index.upsert_person(person)
+                counts["added" if is_new else "changed"] += 1
+            index.set_file_state(bio.slug, bio.mtime_ns, bio.size)
+
+        for slug in known:
+            index.remove_person(slug)
+            counts["deleted"] += 1
+
+    return counts
@@ -0,0 +1 @@
+from .manager import RecordingManager, hash_file, iter_recording_metadata
@@ -0,0 +1,302 @@
+import hashlib
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, NamedTuple, Optional, Tuple
+
+from ..common.yaml_utils import load_yaml, load_yaml_fast, save_yaml
+from ..index.archive_index import ArchiveIndex
+from ..people.scan import iter_bio_files
+
+logger = logging.getLogger(__name__)
+
+RECORDINGS_DIRNAME = "recordings"
+PENDING_TRANSCRIPTION = "pending_transcription"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class RecordingMetaFile(NamedTuple):
+    path: str       # Metadata YAML relative to people/
+    full_path: str  # Absolute path of the metadata YAML
+    mtime_ns: int
+    size: int
+
+
+def iter_recording_metadata(people_dir: str) -> Iterator[RecordingMetaFile]:
+    """
+    Yields the metadata YAML of every recording, i.e. each
+    <person>/recordings/<kind>/*.yaml, in person/kind/name order.
+    """
+    for bio in iter_bio_files(people_dir):
+        recordings_dir = os.path.join(os.path.dirname(bio.path), RECORDINGS_DIRNAME)
+        try:
+            with os.scandir(recordings_dir) as it:
+                kinds = sorted((e for e in it if e.is_dir(follow_symlinks=False)), key=lambda e: e.name)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        for kind in kinds:
+            try:
+                with os.scandir(kind.path) as it:
+                    files = sorted(
+                        (e for e in it if e.name.endswith(".yaml") and e.is_file(follow_symlinks=False)),
+                        key=lambda e: e.name,
+                    )
+            except FileNotFoundError:
+                continue
+            for entry in files:
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    continue
+                rel = os.path.join(bio.slug, RECORDINGS_DIRNAME, kind.name, entry.name)
+                yield RecordingMetaFile(rel, entry.path, st.st_mtime_ns, st.st_size)
+
+
+def hash_file(path: str) -> Tuple[str, int]:
+    """Returns (sha256 hex digest, size in bytes) of a file."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+# One lock per metadata YAML (by absolute path), shared by every
+# RecordingManager in the process: save_yaml writes through a fixed
+# <path>.tmp, so two writers of one file must not interleave. Entries go
+# away once no thread holds or waits on the lock.
+_metadata_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+_metadata_locks_guard = threading.Lock()
+
+
+def metadata_lock(meta_path: str) -> threading.Lock:
+    """The lock serializing read-modify-writes of one recording's metadata YAML."""
+    key = os.path.abspath(meta_path)
+    with _metadata_locks_guard:
+        lock = _metadata_locks.get(key)
+        if lock is None:
+            lock = threading.Lock()
+            _metadata_locks[key] = lock
+        return lock
+
+
+def media_path(meta_path: str, meta: dict) -> Optional[str]:
+    """The recording file described by a metadata YAML (it sits next to it)."""
+    filename = meta.get("original_filename")
+    if not filename:
+        return None
+    return os.path.join(os.path.dirname(meta_path), filename)
+
+
+class RecordingManager:
+    """
+    Content-hash lookups over the recordings in an archive.
+
+    Each recording's metadata YAML carries the sha256 of its media file
+    (written at import). With an ArchiveIndex attached, hashes are looked
+    up in the index; without one, the metadata files are scanned.
+    """
+
+    def __init__(self, root_path: str, index: Optional[ArchiveIndex] = None):
+        self.root_path = root_path
+        self.people_dir = os.path.join(root_path, "people")
+        self.index = index
+
+    def _rel(self, meta_path: str) -> str:
+        return os.path.relpath(meta_path, self.people_dir)
+
+    def find_duplicate(self, sha256: str) -> Optional[str]:
+        """
+        Returns the metadata path of a recording whose content hash is
+        sha256 and whose media file is still on disk, or None.
+        """
+        if self.index is not None:
+            candidates = [os.path.join(self.people_dir, p) for p in self.index.find_recordings(sha256)]
+        else:
+            candidates = (m.full_path for m in iter_recording_metadata(self.people_dir))
+
+        for meta_path in candidates:
+            # The index may lag behind hand edits, so confirm on disk.
+            meta = load_yaml_fast(meta_path)
+            if not isinstance(meta, dict) or meta.get("sha256") != sha256:
+                continue
+            media = media_path(meta_path, meta)
+            if media and os.path.isfile(media):
+                return meta_path
+        return None
+
+    def register(self, meta_path: str, meta: dict) -> None:
+        """Records a freshly written metadata YAML in the index."""
+        if self.index is None:
+            return
+        st = os.stat(meta_path)
+        self.index.set_recording(
+            self._rel(meta_path), meta.get("sha256"), meta.get("ingest_status"), st.st_mtime_ns, st.st_size
+        )
+
+    def write_metadata(self, meta_path: str, meta: dict) -> None:
+        """Writes a new recording's metadata YAML and indexes it."""
+        with metadata_lock(meta_path):
+            save_yaml(meta_path, meta)
+            self.register(meta_path, meta)
+
+    def update_metadata(self, meta_path: str, update: Callable[[dict], bool]) -> Optional[dict]:
+        """
+        Re-reads a recording's metadata YAML, applies update(meta) and, if
+        it returns True, saves and re-indexes it. All under the file's
+        metadata_lock, so concurrent updates (a re-import noting a
+        reference while the transcription worker sets the status) can't
+        lose each other's changes.
+
+        Returns the metadata as written (or as read when unchanged), None
+        if the file is gone.
+        """
+        with metadata_lock(meta_path):
+            if not os.path.exists(meta_path):
+                return None
+            meta = load_yaml(meta_path)
+            if update(meta):
+                save_yaml(meta_path, meta)
+                self.register(meta_path, meta)
+            return meta
+
+    def pending_transcriptions(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (media path, metadata path) for every recording whose
+        metadata says pending_transcription and whose media exists.
+        """
+        if self.index is not None:
+            candidates = (
+                os.path.join(self.people_dir, p)
+                for p in self.index.recordings_with_status(PENDING_TRANSCRIPTION)
+            )
+        else:
+            candidates = (m.full_path for m in iter_recording_metadata(self.people_dir))
+
+        for meta_path in candidates:
+            meta = load_yaml_fast(meta_path)
+            if not isinstance(meta, dict) or meta.get("ingest_status") != PENDING_TRANSCRIPTION:
+                continue
+            media = media_path(meta_path, meta)
+            if media and os.path.isfile(media):
+                yield media, meta_path
+
+    def add_reference(self, meta_path: str, person_slug: str, original_filename: str) -> bool:
+        """
+        Notes in an existing recording's metadata that it was imported
+        again, for person_slug under original_filename.
+
+        Returns False (and writes nothing) if the import is the recording
+        itself or an already listed reference.
+        """
+        owner = self._rel(meta_path).split(os.sep + RECORDINGS_DIRNAME + os.sep)[0]
+        added = False
+
+        def note(meta: dict) -> bool:
+            nonlocal added
+            if owner == person_slug and meta.get("original_filename") == original_filename:
+                return False
+
+            references = meta.get("references")
+            for ref in references or []:
+                if ref.get("person_slug") == person_slug and ref.get("original_filename") == original_filename:
+                    return False
+
+            entry = {"person_slug": person_slug, "original_filename": original_filename}
+            if references is None:
+                meta["references"] = [entry]
+            else:
+                references.append(entry)
+            added = True
+            return True
+
+        self.update_metadata(meta_path, note)
+        return added
+
+    def refresh_index(self, max_workers: int = 8) -> Dict[str, int]:
+        """
+        Brings the recordings table in line with the metadata on disk,
+        reparsing only files whose (mtime_ns, size) changed.
+        """
+        if self.index is None:
+            raise RuntimeError("No index attached")
+
+        known = self.index.get_recording_states()
+        counts = {"added": 0, "changed": 0, "deleted": 0, "unchanged": 0, "errors": 0}
+
+        to_load = []
+        for meta_file in iter_recording_metadata(self.people_dir):
+            previous = known.pop(meta_file.path, None)
+            if previous == (meta_file.mtime_ns, meta_file.size):
+                counts["unchanged"] += 1
+            else:
+                to_load.append((meta_file, previous is None))
+
+        def load(item):
+            meta_file, _ = item
+            try:
+                meta = load_yaml_fast(meta_file.full_path)
+            except Exception as e:
+                logger.warning("Error loading recording metadata at %s: %s", meta_file.path, e)
+                return None
+            return meta if isinstance(meta, dict) else None
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor, self.index.transaction():
+            for (meta_file, is_new), meta in zip(to_load, executor.map(load, to_load)):
+                if meta is None:
+                    counts["errors"] += 1
+                    meta = {}
+                else:
+                    counts["added" if is_new else "changed"] += 1
+                self.index.set_recording(
+                    meta_file.path, meta.get("sha256"), meta.get("ingest_status"),
+                    meta_file.mtime_ns, meta_file.size,
+                )
+
+            for path in known:
+                self.index.remove_recording(path)
+                counts["deleted"] += 1
+
+        return counts
+
+    def backfill_hashes(self, max_workers: int = 4) -> int:
+        """
+        Hashes recordings imported before content hashes were recorded and
+        writes sha256/size_bytes into their metadata. Reads every such media
+        file once, so this is only run on an explicit reindex.
+
+        Returns the number of recordings hashed.
+        """
+        missing = []
+        for meta_file in iter_recording_metadata(self.people_dir):
+            meta = load_yaml_fast(meta_file.full_path)
+            if not isinstance(meta, dict) or meta.get("sha256"):
+                continue
+            media = media_path(meta_file.full_path, meta)
+            if media and os.path.isfile(media):
+                missing.append((meta_file.full_path, media))
+
+        def backfill(item):
+            meta_path, media = item
+            try:
+                sha256, size = hash_file(media)
+                meta = load_yaml(meta_path)
+                meta["sha256"] = sha256
+                meta["size_bytes"] = size
+                save_yaml(meta_path, meta)
+                self.register(meta_path, meta)
+            except Exception as e:
+                logger.warning("Failed to hash recording %s: %s", media, e)
+                return False
+            return True
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            return sum(executor.map(backfill, missing))
@@ -0,0 +1,377 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from ..common.fs_utils import StreamWriteResult, fsync_dir, write_safe
+
+UPLOADS_DIRNAME = ".uploads"
+SESSION_FILENAME = "session.json"
+PART_FILENAME = "data.part"
+
+# Sessions with no chunk received for this long are deleted by expire().
+DEFAULT_SESSION_TTL = 7 * 24 * 3600
+
+_SESSION_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadSession(BaseModel):
+    id: str
+    person_slug: str
+    filename: str = Field(min_length=1)
+    content_type: str = ""
+    size: int = Field(ge=0, description="Total bytes the client will send")
+    offset: int = 0  # Bytes durably written so far
+    created_at: float
+    updated_at: float
+
+
+class UploadNotFound(KeyError):
+    pass
+
+
+class UploadOffsetMismatch(Exception):
+    """A chunk was sent for an offset other than the session's current one."""
+
+    def __init__(self, expected: int, got: int):
+        super().__init__(f"Expected offset {expected}, got {got}")
+        self.expected = expected
+        self.got = got
+
+
+class UploadBusy(Exception):
+    """Another request is already writing to this session."""
+
+
+class UploadCorrupt(ValueError):
+    """
+    The part file no longer holds the committed bytes (truncated or gone
+    behind the store's back). The session can't be resumed; the client
+    has to start a new upload.
+    """
+
+
+class ChunkWriter:
+    """
+    Appends one chunk to a session's part file. Returned by
+    UploadSessionStore.open_chunk; call write() for each piece of the
+    request body, then commit() to make the new offset durable. A writer
+    closed without commit leaves the session at its old offset.
+    """
+
+    def __init__(self, store: "UploadSessionStore", session: UploadSession, lock: threading.Lock):
+        self._store = store
+        self._lock = lock
+        self.session = session
+        self._written = 0
+        # Hash into a copy so an abandoned chunk leaves the session's
+        # running hash untouched.
+        self._hasher = store._hasher_at(session).copy()
+        self._file = open(store._part_path(session.id), "r+b")
+        # Drop anything past the last committed offset (a chunk that was
+        # interrupted before its commit).
+        self._file.truncate(session.offset)
+        self._file.seek(session.offset)
+
+    def write(self, data: bytes) -> None:
+        if self.session.offset + self._written + len(data) > self.session.size:
+            raise ValueError(f"Chunk runs past the declared upload size of {self.session.size} bytes")
+        self._file.write(data)
+        self._hasher.update(data)
+        self._written += len(data)
+
+    def commit(self) -> UploadSession:
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+            self.session.offset += self._written
+            self.session.updated_at = time.time()
+            self._store._save(self.session)
+            self._store._set_hasher(self.session, self._hasher)
+        finally:
+            self.close()
+        return self.session
+
+    def close(self) -> None:
+        if self._lock is None:
+            return
+        if not self._file.closed:
+            self._file.close()
+        self._lock.release()
+        self._lock = None
+
+
+class CompletedUpload:
+    """
+    A fully received upload, returned by UploadSessionStore.complete.
+    Holds the session's lock until discard() or close(), so a second
+    complete (or a stray chunk) gets UploadBusy while the caller moves
+    the part file into place, and UploadNotFound once it is discarded.
+    Closes on leaving a with block.
+    """
+
+    def __init__(
+        self,
+        store: "UploadSessionStore",
+        session: UploadSession,
+        part_path: str,
+        written: StreamWriteResult,
+        lock: threading.Lock,
+    ):
+        self._store = store
+        self._lock = lock
+        self.session = session
+        self.part_path = part_path
+        self.written = written
+
+    def discard(self) -> None:
+        """Deletes the session (after its part file was moved) and unlocks it."""
+        try:
+            self._store.discard(self.session.id)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Unlocks the session, leaving it in place (e.g. to retry complete)."""
+        if self._lock is None:
+            return
+        self._lock.release()
+        self._lock = None
+
+    def __enter__(self) -> "CompletedUpload":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class UploadSessionStore:
+    """
+    Resumable uploads, kept on the archive under .uploads/<id>/ so a part
+    file can be renamed into place without a copy.
+
+    Each session directory holds session.json (written with write_safe
+    after every committed chunk) and data.part. The committed offset in
+    session.json is authoritative: any bytes past it in data.part belong
+    to a chunk that never finished and are truncated on the next write.
+    Sessions therefore survive restarts and crashes.
+
+    The running SHA-256 of each session is updated as chunks arrive, so
+    completing an upload does not reread it; after a restart it is
+    rebuilt once from the part file.
+    """
+
+    def __init__(self, root_path: str):
+        self.root_path = root_path
+        self.uploads_dir = os.path.join(root_path, UPLOADS_DIRNAME)
+        self._locks: Dict[str, threading.Lock] = {}
+        # session id -> (offset the hash covers, hash object)
+        self._hashers: Dict[str, Tuple[int, "hashlib._Hash"]] = {}
+        self._meta_lock = threading.Lock()
+
+    # -- paths ----------------------------------------------------------
+
+    def _session_dir(self, session_id: str) -> str:
+        if not _SESSION_ID_RE.match(session_id or ""):
+            raise UploadNotFound(session_id)
+        return os.path.join(self.uploads_dir, session_id)
+
+    def _session_path(self, session_id: str) -> str:
+        return os.path.join(self._session_dir(session_id), SESSION_FILENAME)
+
+    def _part_path(self, session_id: str) -> str:
+        return os.path.join(self._session_dir(session_id), PART_FILENAME)
+
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        with self._meta_lock:
+            return self._locks.setdefault(session_id, threading.Lock())
+
+    def _save(self, session: UploadSession) -> None:
+        write_safe(self._session_path(session.id), session.model_dump_json(indent=2))
+
+    # -- sessions -------------------------------------------------------
+
+    def create(self, person_slug: str, filename: str, content_type: str, size: int) -> UploadSession:
+        now = time.time()
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            person_slug=person_slug,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+            created_at=now,
+            updated_at=now,
+        )
+        session_dir = self._session_dir(session.id)
+        os.makedirs(session_dir)
+        open(self._part_path(session.id), "wb").close()
+        self._save(session)
+        fsync_dir(self.uploads_dir)
+        with self._meta_lock:
+            self._hashers[session.id] = (0, hashlib.sha256())
+        return session
+
+    def get(self, session_id: str) -> UploadSession:
+        try:
+            with open(self._session_path(session_id), "r", encoding="utf-8") as f:
+                return UploadSession.model_validate_json(f.read())
+        except FileNotFoundError:
+            raise UploadNotFound(session_id)
+
+    def list_sessions(self) -> List[UploadSession]:
+        sessions = []
+        try:
+            names = sorted(os.listdir(self.uploads_dir))
+        except FileNotFoundError:
+            return sessions
+        for name in names:
+            try:
+                sessions.append(self.get(name))
+            except (UploadNotFound, ValueError):
+                continue
+        return sessions
+
+    def open_chunk(self, session_id: str, offset: int) -> ChunkWriter:
+        """
+        Starts writing a chunk at offset, which must equal the session's
+        committed offset.
+
+        Raises:
+            UploadNotFound: Unknown session.
+            UploadBusy: A chunk for this session is already being written.
+            UploadOffsetMismatch: offset is not the current offset.
+            UploadCorrupt: The committed data is gone; restart the upload.
+        """
+        lock = self._lock_for(session_id)
+        if not lock.acquire(blocking=False):
+            raise UploadBusy(session_id)
+        try:
+            session = self.get(session_id)
+            if offset != session.offset:
+                raise UploadOffsetMismatch(session.offset, offset)
+            return ChunkWriter(self, session, lock)
+        except BaseException:
+            lock.release()
+            raise
+
+    def complete(self, session_id: str) -> CompletedUpload:
+        """
+        Checks that every byte arrived and returns the session, part file
+        path, hash and size, with the session still locked. The caller
+        moves the part file into place and then calls discard() on the
+        result (or close() to leave the session for a retry).
+
+        Raises:
+            UploadNotFound: Unknown session.
+            UploadBusy: A chunk or another complete is in progress.
+            UploadOffsetMismatch: The upload is not finished yet.
+            UploadCorrupt: The committed data is gone; restart the upload.
+        """
+        lock = self._lock_for(session_id)
+        if not lock.acquire(blocking=False):
+            raise UploadBusy(session_id)
+        try:
+            session = self.get(session_id)
+            if session.offset != session.size:
+                raise UploadOffsetMismatch(session.size, session.offset)
+            part_path = self._part_path(session_id)
+            try:
+                f = open(part_path, "r+b")
+            except FileNotFoundError:
+                raise UploadCorrupt(f"Upload {session_id} has lost its data")
+            with f:
+                # truncate() would zero-fill a short file
+                if os.fstat(f.fileno()).st_size < session.offset:
+                    raise UploadCorrupt(f"Upload {session_id} is shorter than its committed offset")
+                f.truncate(session.offset)
+            hasher = self._hasher_at(session)
+            written = StreamWriteResult(sha256=hasher.hexdigest(), size=session.offset)
+            return CompletedUpload(self, session, part_path, written, lock)
+        except BaseException:
+            lock.release()
+            raise
+
+    def discard(self, session_id: str) -> None:
+        """Deletes a session and whatever is left of its data."""
+        shutil.rmtree(self._session_dir(session_id), ignore_errors=True)
+        with self._meta_lock:
+            self._hashers.pop(session_id, None)
+            self._locks.pop(session_id, None)
+
+    def expire(self, max_age: float = DEFAULT_SESSION_TTL) -> int:
+        """
+        Deletes sessions that have not received a chunk within max_age
+        seconds, and directories without a readable session.json.
+        Returns the number removed.
+        """
+        try:
+            names = os.listdir(self.uploads_dir)
+        except FileNotFoundError:
+            return 0
+
+        cutoff = time.time() - max_age
+        removed = 0
+        for name in names:
+            try:
+                updated_at = self.get(name).updated_at
+            except (UploadNotFound, ValueError):
+                # Not a session dir, an unreadable session.json, or a
+                # create() that died before saving: go by the dir's mtime
+                path = os.path.join(self.uploads_dir, name)
+                if not os.path.isdir(path):
+                    continue
+                updated_at = os.path.getmtime(path)
+            if updated_at >= cutoff:
+                continue
+            lock = self._lock_for(name) if _SESSION_ID_RE.match(name) else None
+            if lock is not None and not lock.acquire(blocking=False):
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.uploads_dir, name), ignore_errors=True)
+                removed += 1
+            finally:
+                if lock is not None:
+                    lock.release()
+            with self._meta_lock:
+                self._hashers.pop(name, None)
+        return removed
+
+    # -- hashing --------------------------------------------------------
+
+    def _hasher_at(self, session: UploadSession) -> "hashlib._Hash":
+        """The running hash covering exactly the committed bytes."""
+        with self._meta_lock:
+            cached = self._hashers.get(session.id)
+        if cached is not None and cached[0] == session.offset:
+            return cached[1]
+
+        # Restarted (or the cache is off): hash what is on disk once.
+        hasher = hashlib.sha256()
+        remaining = session.offset
+        try:
+            f = open(self._part_path(session.id), "rb")
+        except FileNotFoundError:
+            raise UploadCorrupt(f"Upload {session.id} has lost its data")
+        with f:
+            while remaining > 0:
+                data = f.read(min(_HASH_CHUNK_SIZE, remaining))
+                if not data:
+                    raise UploadCorrupt(f"Upload {session.id} is shorter than its committed offset")
+                hasher.update(data)
+                remaining -= len(data)
+        with self._meta_lock:
+            self._hashers[session.id] = (session.offset, hasher)
+        return hasher
+
+    def _set_hasher(self, session: UploadSession, hasher) -> None:
+        with self._meta_lock:
+            self._hashers[session.id] = (session.offset, hasher)
@@ -1,2 +1,3 @@
 from .manager import TranscriptionManager
 from .base import TranscriptionProvider
+from .registry import available_providers, create_provider, register_provider
@@ -0,0 +1,136 @@
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+from ..common import metrics
+from ..common.fs_utils import fsync_dir
+
+SAMPLE_RATE = 16000  # What Whisper expects
+
+# Derived audio cached next to a recording, so retries and other
+# providers don't decode the media again:
+#   <stem>.audio.pcm  16 kHz mono signed 16-bit little-endian samples,
+#                     memory-mapped for local inference
+#   <stem>.audio.mp3  small audio-only copy sent to remote providers
+PCM_SUFFIX = ".audio.pcm"
+COMPRESSED_SUFFIX = ".audio.mp3"
+COMPRESSED_BITRATE = "48k"
+
+
+class PcmSlice(NamedTuple):
+    """Samples [start, end) of a cached PCM file; cheap to send to a worker."""
+    path: str
+    start: int
+    end: int
+
+
+def derived_path(media_path: str, suffix: str) -> str:
+    return str(Path(media_path).with_suffix(suffix))
+
+
+def _is_fresh(derived: str, media_path: str) -> bool:
+    try:
+        return os.stat(derived).st_mtime_ns >= os.stat(media_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def _extract(media_path: str, target: str, **output_args) -> str:
+    """Runs ffmpeg into target.tmp, then fsyncs and renames it into place."""
+    if _is_fresh(target, media_path):
+        return target
+    if not os.path.exists(media_path):
+        raise FileNotFoundError(f"File not found: {media_path}")
+    import ffmpeg
+
+    tmp_path = target + ".tmp"
+    try:
+        with metrics.timer("audio.extract"):
+            (
+                ffmpeg.input(media_path, threads=0)
+                # -vn: audio track only, the video is never decoded
+                .output(tmp_path, vn=None, ac=1, ar=SAMPLE_RATE, **output_args)
+                .overwrite_output()
+                .run(cmd=["ffmpeg", "-nostdin"], capture_stdout=True, capture_stderr=True)
+            )
+        with open(tmp_path, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+    except ffmpeg.Error as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='replace')}") from e
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    fsync_dir(os.path.dirname(os.path.abspath(target)))
+    return target
+
+
+def ensure_pcm(media_path: str) -> str:
+    """
+    Decodes the recording's audio track once into <stem>.audio.pcm and
+    returns its path; later calls reuse it while it is newer than the
+    recording.
+    """
+    return _extract(media_path, derived_path(media_path, PCM_SUFFIX), format="s16le", acodec="pcm_s16le")
+
+
+def ensure_compressed(media_path: str) -> str:
+    """
+    Extracts the recording's audio once into a small mono MP3
+    (<stem>.audio.mp3) for upload to remote providers.
+    """
+    return _extract(
+        media_path, derived_path(media_path, COMPRESSED_SUFFIX),
+        format="mp3", acodec="libmp3lame", audio_bitrate=COMPRESSED_BITRATE,
+    )
+
+
+def open_pcm(pcm_path: str):
+    """The cached samples as a read-only int16 numpy memmap."""
+    import numpy as np
+
+    if os.path.getsize(pcm_path) == 0:
+        return np.zeros(0, dtype=np.int16)
+    return np.memmap(pcm_path, dtype=np.int16, mode="r")
+
+
+def to_float(samples):
+    """int16 samples -> float32 in [-1, 1], as Whisper expects."""
+    import numpy as np
+
+    return samples.astype(np.float32) / 32768.0
+
+
+def read_pcm(pcm: PcmSlice):
+    return to_float(open_pcm(pcm.path)[pcm.start:pcm.end])
+
+
+def load_audio(file_path: str):
+    """
+    The recording's audio as a mono float32 numpy array at SAMPLE_RATE,
+    the same input Whisper's own loader produces, decoded via the PCM
+    cache.
+    """
+    return to_float(open_pcm(ensure_pcm(file_path)))
+
+
+def discard_pcm(media_path: str) -> None:
+    """Removes the PCM cache (the largest derived file) once it's no longer needed."""
+    _discard(derived_path(media_path, PCM_SUFFIX))
+
+
+def discard_derived(media_path: str) -> None:
+    """
+    Removes every derived audio file of a recording (PCM cache and
+    compressed copy). Both only exist to spare retries a decode, so they
+    go once the recording is transcribed.
+    """
+    for suffix in (PCM_SUFFIX, COMPRESSED_SUFFIX):
+        _discard(derived_path(media_path, suffix))
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -1,6 +1,16 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Optional
+
+from .segments import ProgressCallback, Transcript
 
 class TranscriptionProvider(ABC):
+    # Together with the provider type, these identify a provider's output
+    # in the transcript cache. Bump prompt_version whenever a prompt or
+    # setting change would alter transcripts.
+    model_name: str = ""
+    prompt_version: str = ""
+
     @abstractmethod
     def transcribe(self, file_path: str) -> str:
         """
@@ -8,3 +18,29 @@ class TranscriptionProvider(ABC):
         Returns the transcription text.
         """
         pass
+
+    async def atranscribe(self, file_path: str) -> str:
+        """
+        Async transcribe(). Providers with native async I/O override
+        this; the default runs transcribe() in a worker thread.
+        """
+        return await asyncio.to_thread(self.transcribe, file_path)
+
+    def transcribe_timed(self, file_path: str, on_progress: Optional[ProgressCallback] = None) -> Transcript:
+        """
+        Like transcribe(), but with per-segment timestamps where the
+        provider has them (otherwise segments is empty). Providers that
+        produce segments pass them to on_progress as they go.
+        """
+        return Transcript(self.transcribe(file_path), [])
+
+    def start(self) -> None:
+        """
+        Optional warm-up (e.g. starting worker processes) so the first
+        transcription doesn't pay for it. Called once at app startup.
+        """
+        pass
+
+    def close(self) -> None:
+        """Releases anything start() acquired."""
+        pass
@@ -0,0 +1,177 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+from .segments import Segment, Transcript
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        sha256 TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        model TEXT NOT NULL,
+        prompt_version TEXT NOT NULL,
+        data BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (sha256, provider, model, prompt_version)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts(last_used)",
+]
+
+
+def _encode(transcript: Transcript) -> bytes:
+    payload = {
+        "text": transcript.text,
+        "segments": [list(s) for s in transcript.segments],
+    }
+    return zlib.compress(json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _decode(data: bytes) -> Transcript:
+    payload = json.loads(zlib.decompress(data))
+    return Transcript(payload["text"], [Segment(*s) for s in payload["segments"]])
+
+
+class TranscriptCache:
+    """
+    Finished transcripts keyed by (audio sha256, provider, model, prompt
+    version), zlib-compressed in a SQLite file in the app config dir.
+
+    Keyed by content rather than path, so re-running a failed batch,
+    re-importing a file or switching back to a provider reuses earlier
+    work. When the stored size passes max_bytes, the least recently used
+    entries are evicted. Like the index, the cache is disposable:
+    deleting the file only costs re-transcription.
+    """
+
+    def __init__(self, db_path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(self, sha256: str, provider: str, model: str, prompt_version: str = "") -> Optional[Transcript]:
+        key = (sha256, provider, model, prompt_version)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM transcripts "
+                "WHERE sha256 = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE transcripts SET last_used = ? "
+                "WHERE sha256 = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                (time.time(),) + key,
+            )
+            self._conn.commit()
+            self._hits += 1
+
+        try:
+            return _decode(row[0])
+        except (zlib.error, ValueError, KeyError, TypeError) as e:
+            logger.warning("Dropping unreadable cached transcript for %s: %s", sha256, e)
+            self.delete(sha256, provider, model, prompt_version)
+            return None
+
+    def put(
+        self, sha256: str, provider: str, model: str, transcript: Transcript, prompt_version: str = ""
+    ) -> None:
+        data = _encode(transcript)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts "
+                "(sha256, provider, model, prompt_version, data, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (sha256, provider, model, prompt_version, data, len(data), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, sha256: str, provider: str, model: str, prompt_version: str = "") -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM transcripts "
+                "WHERE sha256 = ? AND provider = ? AND model = ? AND prompt_version = ?",
+                (sha256, provider, model, prompt_version),
+            )
+            self._conn.commit()
+
+    def clear(self) -> int:
+        """Removes every entry. Returns the number removed."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM transcripts")
+            self._conn.commit()
+        return cur.rowcount
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM transcripts").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until under max_bytes. Caller holds the lock."""
+        excess = self._total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        rows = self._conn.execute(
+            "SELECT rowid, size FROM transcripts ORDER BY last_used, rowid"
+        )
+        doomed = []
+        for rowid, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((rowid,))
+            excess -= size
+        self._conn.executemany("DELETE FROM transcripts WHERE rowid = ?", doomed)
+        self._evictions += len(doomed)
+
+    def stats(self) -> Dict[str, object]:
+        """Entry count and size, plus hit/miss counts since startup."""
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()
+            by_provider = dict(self._conn.execute(
+                "SELECT provider, COUNT(*) FROM transcripts GROUP BY provider"
+            ).fetchall())
+            hits, misses, evictions = self._hits, self._misses, self._evictions
+        lookups = hits + misses
+        return {
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "by_provider": by_provider,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else None,
+            "evictions": evictions,
+        }
@@ -1,51 +1,226 @@
-import google.generativeai as genai
-from .base import TranscriptionProvider
+import asyncio
+import functools
+import logging
 import os
+import random
+import threading
 import time
+import weakref
+from typing import List, Optional, Sequence, Union
+
+from ..common import metrics
+from .audio import ensure_compressed
+from .base import TranscriptionProvider
+
+logger = logging.getLogger(__name__)
+
+# PROMPT: Derived from user requirement "one step transcription and translation"
+PROMPT = (
+    "Please transcribe this audio file. "
+    "If the audio is not in English, provide the original transcription first, "
+    "followed by an English translation. Format clearly."
+)
+
+DEFAULT_CONCURRENCY = 4
+
 
 class GeminiProvider(TranscriptionProvider):
-    def __init__(self, api_key: str = None, model_name: str = "gemini-1.5-flash"):
+    """
+    Transcribes through the Gemini Files API: upload, wait for the file to
+    finish processing, prompt the model with it, delete it.
+
+    The work is async. atranscribe() runs on the caller's event loop and
+    holds one of max_concurrency slots from upload to delete, so a batch
+    of N files takes roughly as long as its slowest files rather than
+    their sum. The sync transcribe() used by the job queue hands the
+    coroutine to a loop owned by the provider, so concurrent queue
+    workers share the same slots. Blocking SDK calls run in threads.
+
+    With audio_only (the default), the upload is the small audio-only
+    copy from ensure_compressed, made once per recording, rather than
+    the full video; if extraction fails the original file is sent.
+
+    Processing state is polled with exponential backoff and jitter. The
+    remote file is deleted on success, error and cancellation alike,
+    including an upload that finishes after its task was cancelled.
+
+    'client' is the object exposing the genai surface used here
+    (upload_file, get_file, delete_file, GenerativeModel); it defaults
+    to the google.generativeai module, and tests pass a local fake.
+    """
+
+    # Bump when PROMPT changes
+    prompt_version = "1"
+
+    def __init__(
+        self,
+        api_key: str = None,
+        model_name: str = "gemini-1.5-flash",
+        client=None,
+        max_concurrency: Optional[int] = None,
+        poll_initial: float = 1.0,
+        poll_max: float = 30.0,
+        processing_timeout: float = 30 * 60,
+        audio_only: bool = True,
+    ):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if not self.api_key:
-            raise ValueError("GEMINI_API_KEY is not set.")
-        
-        genai.configure(api_key=self.api_key)
+        if client is None:
+            if not self.api_key:
+                raise ValueError("GEMINI_API_KEY is not set.")
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            client = genai
+        self.client = client
         self.model_name = model_name
+        self.max_concurrency = max_concurrency or int(os.getenv("GEMINI_CONCURRENCY", DEFAULT_CONCURRENCY))
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.processing_timeout = processing_timeout
+        self.audio_only = audio_only
+
+        # One semaphore per event loop (asyncio primitives are loop-bound)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+
+    # -- sync API (job queue) -------------------------------------------
 
     def transcribe(self, file_path: str) -> str:
+        future = asyncio.run_coroutine_threadsafe(self.atranscribe(file_path), self._ensure_loop())
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+    def start(self) -> None:
+        self._ensure_loop()
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Cancels in-flight transcriptions (deleting their remote files) and stops the loop."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        if loop is None:
+            return
+
+        async def cancel_all():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Let the deletes scheduled by those cancellations finish
+            await loop.shutdown_default_executor()
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+            if not thread.is_alive():
+                loop.close()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="gemini-provider", daemon=True)
+                thread.start()
+                self._loop, self._loop_thread = loop, thread
+            return self._loop
+
+    # -- async API ------------------------------------------------------
+
+    @staticmethod
+    def _in_thread(fn, *args, **kwargs) -> "asyncio.Future":
+        # A plain executor future rather than a task, so cancelling tasks
+        # (e.g. in close()) never abandons an upload or delete midway.
+        return asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def atranscribe(self, file_path: str) -> str:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        print(f"Uploading {file_path} to Gemini...")
-        video_file = genai.upload_file(path=file_path)
-        
-        # Wait for processing
-        while video_file.state.name == "PROCESSING":
-            print('.', end='', flush=True)
-            time.sleep(2)
-            video_file = genai.get_file(video_file.name)
-
-        if video_file.state.name == "FAILED":
-            raise ValueError(f"Gemini processing failed: {video_file.state.name}")
-
-        print("\nRequesting transcription...")
-        model = genai.GenerativeModel(model_name=self.model_name)
-        
-        # PROMPT: Derived from user requirement "one step transcription and translation"
-        prompt = (
-            "Please transcribe this audio file. "
-            "If the audio is not in English, provide the original transcription first, "
-            "followed by an English translation. Format clearly."
-        )
-        
-        response = model.generate_content([video_file, prompt])
-        
-        # Cleanup? 
-        # genai.delete_file(video_file.name) # Optional: auto-cleanup, but maybe we want to keep it briefly?
-        # For now, let's delete to be clean.
+        async with self._semaphore():
+            with metrics.timer("gemini.upload"):
+                remote = await self._upload(file_path)
+            try:
+                with metrics.timer("gemini.processing"):
+                    remote = await self._wait_until_processed(remote)
+                print(f"Requesting transcription of {file_path}...")
+                model = self.client.GenerativeModel(model_name=self.model_name)
+                with metrics.timer("gemini.generate"):
+                    response = await self._in_thread(model.generate_content, [remote, PROMPT])
+                return response.text
+            finally:
+                # Shielded so a cancellation arriving now can't skip it
+                await asyncio.shield(self._in_thread(self._delete, remote.name))
+
+    async def atranscribe_many(self, file_paths: Sequence[str]) -> List[Union[str, BaseException]]:
+        """
+        Transcribes a batch concurrently (up to max_concurrency at once).
+        Results are in input order; a failed file yields its exception.
+        """
+        return await asyncio.gather(*(self.atranscribe(p) for p in file_paths), return_exceptions=True)
+
+    def _upload_source(self, file_path: str) -> str:
+        if not self.audio_only:
+            return file_path
+        try:
+            return ensure_compressed(file_path)
+        except Exception as e:
+            logger.warning("Could not extract audio from %s, uploading it whole: %s", file_path, e)
+            return file_path
+
+    async def _upload(self, file_path: str):
+        source = await self._in_thread(self._upload_source, file_path)
+        print(f"Uploading {source} to Gemini...")
+        upload = self._in_thread(self.client.upload_file, path=source)
         try:
-             genai.delete_file(video_file.name)
-        except:
-             pass
+            return await asyncio.shield(upload)
+        except asyncio.CancelledError:
+            # The upload thread can't be interrupted; remove the file once
+            # it lands so it doesn't linger in the project's storage.
+            upload.add_done_callback(self._delete_orphan)
+            raise
+
+    def _delete_orphan(self, upload: "asyncio.Future") -> None:
+        if upload.cancelled() or upload.exception() is not None:
+            return
+        self._in_thread(self._delete, upload.result().name)
+
+    async def _wait_until_processed(self, remote):
+        delay = self.poll_initial
+        deadline = time.monotonic() + self.processing_timeout
+        while remote.state.name == "PROCESSING":
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Gemini still processing {remote.name} after {self.processing_timeout:.0f}s")
+            # Equal jitter: at least half the delay, so polls never bunch up
+            await asyncio.sleep(delay / 2 + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.poll_max)
+            remote = await self._in_thread(self.client.get_file, remote.name)
+
+        if remote.state.name == "FAILED":
+            raise ValueError(f"Gemini processing failed: {remote.state.name}")
+        return remote
 
-        return response.text
+    def _delete(self, name: str, attempts: int = 3) -> None:
+        for attempt in range(attempts):
+            try:
+                self.client.delete_file(name)
+                return
+            except Exception as e:
+                if attempt == attempts - 1:
+                    logger.warning("Failed to delete Gemini file %s: %s", name, e)
+                    return
+                time.sleep(0.5 * 2 ** attempt)
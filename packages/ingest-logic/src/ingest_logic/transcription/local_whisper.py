@@ -1,23 +1,38 @@
-import whisper
+from .audio import SAMPLE_RATE, load_audio
 from .base import TranscriptionProvider
+from .segments import ProgressCallback, Segment, Transcript
+from typing import Optional
 import os
 
 class LocalWhisperProvider(TranscriptionProvider):
     def __init__(self, model_size: str = "base"):
         self.model_size = model_size
+        self.model_name = model_size
         self._model = None
 
     @property
     def model(self):
         if self._model is None:
+            # Imported here so that merely selecting this provider (or
+            # using the worker-process mode) doesn't load torch.
+            import whisper
             print(f"Loading Local Whisper model: {self.model_size}...")
             self._model = whisper.load_model(self.model_size)
         return self._model
 
     def transcribe(self, file_path: str) -> str:
+        return self.transcribe_timed(file_path).text
+
+    def transcribe_timed(self, file_path: str, on_progress: Optional[ProgressCallback] = None) -> Transcript:
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
             
+        # Decoded via the PCM cache, so a retry skips ffmpeg
+        audio = load_audio(file_path)
         print(f"Transcribing {file_path} locally...")
-        result = self.model.transcribe(file_path)
-        return result["text"]
+        result = self.model.transcribe(audio)
+        segments = [Segment(s["start"], s["end"], s["text"]) for s in result.get("segments", [])]
+        if on_progress is not None and segments:
+            duration = len(audio) / SAMPLE_RATE
+            on_progress(segments, duration, duration)
+        return Transcript(result["text"], segments)
@@ -1,21 +1,89 @@
 import os
+import threading
+from typing import Optional
+from ..common import metrics
 from .base import TranscriptionProvider
-from .local_whisper import LocalWhisperProvider
-from .gemini import GeminiProvider
+from .cache import TranscriptCache
+from .registry import create_provider
+from .segments import ProgressCallback, Transcript
+
+CACHE_LOOKUPS = metrics.REGISTRY.counter(
+    "transcript_cache_lookups_total", "Transcript cache lookups by result (hit or miss).", ["result"]
+)
 
 class TranscriptionManager:
-    def __init__(self, provider_type: str = None):
+    """
+    Runs transcriptions through the provider named by provider_type (or
+    TRANSCRIPTION_PROVIDER), with an optional transcript cache.
+
+    Construction is cheap: the provider, and with it the provider's
+    module, is only created on first use (start() or a transcription).
+    """
+
+    def __init__(self, provider_type: str = None, cache: Optional[TranscriptCache] = None):
         # Default to local if not specified
         self.provider_type = provider_type or os.getenv("TRANSCRIPTION_PROVIDER", "local")
-        self.provider = self._get_provider()
+        self.cache = cache
+        self._provider: Optional[TranscriptionProvider] = None
+        self._provider_lock = threading.Lock()
+
+    @property
+    def provider(self) -> TranscriptionProvider:
+        if self._provider is None:
+            with self._provider_lock:
+                if self._provider is None:
+                    self._provider = self._get_provider()
+        return self._provider
 
     def _get_provider(self) -> TranscriptionProvider:
-        if self.provider_type == "gemini":
-            return GeminiProvider()
-        elif self.provider_type == "local":
-            return LocalWhisperProvider()
-        else:
-            raise ValueError(f"Unknown transcription provider: {self.provider_type}")
-
-    def transcribe(self, file_path: str) -> str:
-        return self.provider.transcribe(file_path)
+        # See registry.py for the built-in providers and plugins
+        return create_provider(self.provider_type)
+
+    def start(self) -> None:
+        self.provider.start()
+
+    def close(self) -> None:
+        # Nothing to release if the provider was never created
+        if self._provider is not None:
+            self._provider.close()
+
+    def transcribe(self, file_path: str, sha256: Optional[str] = None) -> str:
+        return self.transcribe_timed(file_path, sha256).text
+
+    def transcribe_timed(
+        self,
+        file_path: str,
+        sha256: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Transcript:
+        """
+        Transcribes file_path, reusing a cached transcript of the same
+        audio from the same provider, model and prompt version. Pass the
+        recording's sha256 if known; otherwise the file is hashed.
+        """
+        if self.cache is None:
+            return self._run_provider(file_path, on_progress)
+
+        if sha256 is None:
+            # Imported here: recordings pulls in the pydantic models, which
+            # Whisper worker processes (importing this package) never need
+            from ..recordings.manager import hash_file
+            with metrics.timer("transcription.hash"):
+                sha256, _ = hash_file(file_path)
+        model, prompt_version = self.provider.model_name, self.provider.prompt_version
+
+        cached = self.cache.get(sha256, self.provider_type, model, prompt_version)
+        CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        if cached is not None:
+            print(f"Using cached transcript for {file_path}")
+            if on_progress is not None and cached.segments:
+                on_progress(cached.segments, cached.segments[-1].end, None)
+            return cached
+
+        transcript = self._run_provider(file_path, on_progress)
+        self.cache.put(sha256, self.provider_type, model, transcript, prompt_version)
+        return transcript
+
+    def _run_provider(self, file_path: str, on_progress: Optional[ProgressCallback]) -> Transcript:
+        with metrics.timer(f"transcription.{self.provider_type}"):
+            return self.provider.transcribe_timed(file_path, on_progress=on_progress)
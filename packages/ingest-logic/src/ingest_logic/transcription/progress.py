@@ -0,0 +1,148 @@
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ..common.fs_utils import fsync_dir
+from .segments import VTT_HEADER, Segment, vtt_cues
+
+# Finished jobs whose last state is kept for late subscribers
+_MAX_TRACKED = 500
+# Segment texts kept per job for the UI's "latest lines"
+_RECENT_SEGMENTS = 5
+
+
+class PartialTranscript:
+    """
+    A WebVTT file next to the recording (<stem>.partial.vtt) that grows as
+    segments arrive, so long jobs have readable output early. Each append
+    is flushed and fsynced; a crash loses at most the segments in flight.
+    The final .txt/.vtt replace it when the job finishes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._started = False
+
+    def append(self, segments: List[Segment]) -> None:
+        if not segments:
+            return
+        with open(self.path, "a" if self._started else "w", encoding="utf-8") as f:
+            if not self._started:
+                f.write(VTT_HEADER)
+            f.write(vtt_cues(segments))
+            f.flush()
+            os.fsync(f.fileno())
+        if not self._started:
+            fsync_dir(os.path.dirname(os.path.abspath(self.path)))
+            self._started = True
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ProgressTracker:
+    """
+    Live progress of transcription jobs, for server-sent events.
+
+    Job workers call update() from their threads; subscribers are asyncio
+    queues on the web server's loop, fed with call_soon_threadsafe, so a
+    waiting client holds no thread. State is in memory only: after a
+    restart the job table is the fallback.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: "OrderedDict[int, Dict[str, object]]" = OrderedDict()
+        self._subscribers: Dict[int, List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+
+    def start(self, job_id: int, media_path: str) -> None:
+        self._publish(job_id, {
+            "job_id": job_id,
+            "media_path": media_path,
+            "status": "running",
+            "percent": None,
+            "processed_seconds": 0.0,
+            "duration": None,
+            "segments": 0,
+            "recent": [],
+            "error": None,
+            "updated_at": time.time(),
+        }, replace=True)
+
+    def add_segments(
+        self, job_id: int, segments: List[Segment], processed_seconds: float, duration: Optional[float]
+    ) -> None:
+        with self._lock:
+            state = self._states.get(job_id)
+            if state is None:
+                return
+            recent = (state["recent"] + [s.text.strip() for s in segments])[-_RECENT_SEGMENTS:]
+            count = state["segments"] + len(segments)
+        percent = None
+        if duration:
+            percent = round(min(100.0, 100.0 * processed_seconds / duration), 1)
+        self._publish(job_id, {
+            "processed_seconds": processed_seconds,
+            "duration": duration,
+            "percent": percent,
+            "segments": count,
+            "recent": recent,
+        })
+
+    def finish(self, job_id: int, error: Optional[str] = None) -> None:
+        fields: Dict[str, object] = {"status": "failed" if error else "done", "error": error}
+        if not error:
+            fields["percent"] = 100.0
+        self._publish(job_id, fields)
+
+    def get(self, job_id: int) -> Optional[Dict[str, object]]:
+        with self._lock:
+            state = self._states.get(job_id)
+            return dict(state) if state is not None else None
+
+    def subscribe(self, job_id: int) -> Tuple[Optional[Dict[str, object]], asyncio.Queue]:
+        """
+        Returns (current state, queue of later states). Must be called on
+        the event loop that will read the queue.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append((loop, queue))
+            state = self._states.get(job_id)
+            return (dict(state) if state is not None else None), queue
+
+    def unsubscribe(self, job_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = [s for s in self._subscribers.get(job_id, []) if s[1] is not queue]
+            if subscribers:
+                self._subscribers[job_id] = subscribers
+            else:
+                self._subscribers.pop(job_id, None)
+
+    def _publish(self, job_id: int, fields: Dict[str, object], replace: bool = False) -> None:
+        with self._lock:
+            if replace or job_id not in self._states:
+                state = dict(fields)
+            else:
+                state = self._states[job_id]
+                state.update(fields)
+            state["updated_at"] = time.time()
+            self._states[job_id] = state
+            self._states.move_to_end(job_id)
+            while len(self._states) > _MAX_TRACKED:
+                self._states.popitem(last=False)
+            snapshot = dict(state)
+            subscribers = list(self._subscribers.get(job_id, []))
+
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            except RuntimeError:
+                pass  # Loop closed; the subscriber is gone
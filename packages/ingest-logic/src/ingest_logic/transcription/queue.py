@@ -0,0 +1,290 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_WORKERS = 2
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        media_path TEXT NOT NULL,
+        meta_path TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        status TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, id)",
+    "CREATE INDEX IF NOT EXISTS jobs_media ON jobs(media_path)",
+]
+
+_FIELDS = ["id", "media_path", "meta_path", "provider", "status", "attempts", "error", "created_at", "updated_at"]
+_COLUMNS = ", ".join(_FIELDS)
+
+
+class TranscriptionJob(BaseModel):
+    id: int
+    media_path: str
+    meta_path: str
+    provider: str
+    status: str
+    attempts: int = 0
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+JobHandler = Callable[[TranscriptionJob], None]
+
+
+def _to_job(row) -> TranscriptionJob:
+    return TranscriptionJob(**dict(zip(_FIELDS, row)))
+
+
+def parse_provider_limits(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parses "local=1,gemini=4" into {"local": 1, "gemini": 4}.
+
+    Raises:
+        ValueError: On a malformed entry or a limit below 1.
+    """
+    limits: Dict[str, int] = {}
+    for entry in (spec or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, value = entry.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid provider limit {entry!r}, expected name=count")
+        count = int(value)
+        if count < 1:
+            raise ValueError(f"Provider limit for {name.strip()} must be at least 1")
+        limits[name.strip()] = count
+    return limits
+
+
+class TranscriptionQueue:
+    """
+    Durable transcription job queue backed by SQLite, drained by a fixed
+    pool of worker threads.
+
+    Jobs are rows in the jobs table and move queued -> running -> done or
+    failed. A job found 'running' when the queue starts belongs to a
+    process that died mid-job and is queued again, so nothing is lost
+    across restarts. Each provider can be capped below the pool size
+    (e.g. one local Whisper job at a time, several Gemini uploads); a
+    worker skips jobs for a provider at its cap.
+
+    The handler does the actual work and raises to mark a job failed.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        handler: JobHandler,
+        workers: int = DEFAULT_WORKERS,
+        provider_limits: Optional[Dict[str, int]] = None,
+    ):
+        self.db_path = db_path
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.provider_limits = dict(provider_limits or {})
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._running: Dict[str, int] = {}  # provider -> jobs in progress
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                self._conn.execute(stmt)
+            self._conn.commit()
+
+    # -- lifecycle ------------------------------------------------------
+
+    def start(self) -> int:
+        """
+        Requeues jobs interrupted by a previous shutdown and starts the
+        workers. Returns the number of jobs requeued.
+        """
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ?",
+                (QUEUED, time.time(), RUNNING),
+            )
+            self._conn.commit()
+            requeued = cur.rowcount
+            self._stopping = False
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"transcription-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return requeued
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops handing out jobs and waits up to timeout for running ones.
+        Jobs still running afterwards are requeued on the next start().
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = [t for t in self._threads if t.is_alive()]
+
+    def close(self) -> None:
+        self.stop(timeout=0)
+        with self._lock:
+            self._conn.close()
+
+    # -- jobs -----------------------------------------------------------
+
+    def enqueue(self, media_path: str, meta_path: str, provider: str) -> TranscriptionJob:
+        """
+        Queues a transcription. If the recording already has a queued or
+        running job, that job is returned instead of adding another.
+        """
+        with self._wakeup:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE media_path = ? AND status IN (?, ?) ORDER BY id LIMIT 1",
+                (media_path, QUEUED, RUNNING),
+            ).fetchone()
+            if row is not None:
+                return _to_job(row)
+
+            now = time.time()
+            cur = self._conn.execute(
+                "INSERT INTO jobs (media_path, meta_path, provider, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (media_path, meta_path, provider, QUEUED, now, now),
+            )
+            self._conn.commit()
+            self._wakeup.notify()
+            return self.get(cur.lastrowid)
+
+    def get(self, job_id: int) -> Optional[TranscriptionJob]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return _to_job(row)
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 100) -> List[TranscriptionJob]:
+        """Most recent jobs first, optionally filtered by status."""
+        with self._lock:
+            if status is None:
+                rows = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM jobs ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM jobs WHERE status = ? ORDER BY id DESC LIMIT ?",
+                    (status, limit),
+                ).fetchall()
+        return [_to_job(row) for row in rows]
+
+    def stats(self) -> Dict[str, object]:
+        """Job counts by status, queue depth per provider, and pool settings."""
+        with self._lock:
+            by_status = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+            ).fetchall())
+            queued_by_provider = dict(self._conn.execute(
+                "SELECT provider, COUNT(*) FROM jobs WHERE status = ? GROUP BY provider", (QUEUED,)
+            ).fetchall())
+            running = dict(self._running)
+        return {
+            "depth": by_status.get(QUEUED, 0),
+            "jobs": {s: by_status.get(s, 0) for s in (QUEUED, RUNNING, DONE, FAILED)},
+            "queued_by_provider": queued_by_provider,
+            "running_by_provider": {p: n for p, n in running.items() if n},
+            "workers": self.workers,
+            "provider_limits": self.provider_limits,
+        }
+
+    # -- workers --------------------------------------------------------
+
+    def _saturated(self) -> List[str]:
+        return [
+            provider for provider, limit in self.provider_limits.items()
+            if self._running.get(provider, 0) >= limit
+        ]
+
+    def _claim(self) -> Optional[TranscriptionJob]:
+        """Marks the oldest runnable job as running. Caller holds the lock."""
+        saturated = self._saturated()
+        sql = f"SELECT {_COLUMNS} FROM jobs WHERE status = ?"
+        params: list = [QUEUED]
+        if saturated:
+            sql += f" AND provider NOT IN ({', '.join('?' * len(saturated))})"
+            params.extend(saturated)
+        row = self._conn.execute(sql + " ORDER BY id LIMIT 1", params).fetchone()
+        if row is None:
+            return None
+
+        job = _to_job(row)
+        job.status = RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, attempts = ?, updated_at = ? WHERE id = ?",
+            (job.status, job.attempts, job.updated_at, job.id),
+        )
+        self._conn.commit()
+        self._running[job.provider] = self._running.get(job.provider, 0) + 1
+        return job
+
+    def _finish(self, job: TranscriptionJob, error: Optional[str]) -> None:
+        with self._wakeup:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (FAILED if error else DONE, error, time.time(), job.id),
+            )
+            self._conn.commit()
+            self._running[job.provider] -= 1
+            # A provider slot opened up; let waiting workers look again
+            self._wakeup.notify_all()
+
+    def _work(self) -> None:
+        while True:
+            with self._wakeup:
+                job = None
+                while not self._stopping:
+                    job = self._claim()
+                    if job is not None:
+                        break
+                    self._wakeup.wait()
+                if job is None:
+                    return
+
+            try:
+                self.handler(job)
+            except Exception as e:
+                logger.warning("Transcription job %s failed: %s", job.id, e)
+                self._finish(job, str(e) or e.__class__.__name__)
+            else:
+                self._finish(job, None)
@@ -0,0 +1,106 @@
+"""
+Transcription providers by name, resolved lazily.
+
+Nothing here imports a provider module until that provider is created,
+so selecting "gemini" never loads Whisper's code and vice versa. Other
+packages add providers through the "ingest_logic.transcription_providers"
+entry point group, e.g. in their pyproject.toml:
+
+    [project.entry-points."ingest_logic.transcription_providers"]
+    deepgram = "acme_transcribe.deepgram:DeepgramProvider"
+
+The target is any callable taking no arguments and returning a
+TranscriptionProvider (usually the class itself, configured from the
+environment). Entry points are only loaded for the name being created.
+"""
+import os
+import sys
+import threading
+from typing import Callable, Dict, List
+
+from .base import TranscriptionProvider
+
+ENTRY_POINT_GROUP = "ingest_logic.transcription_providers"
+
+ProviderFactory = Callable[[], TranscriptionProvider]
+
+
+def _local() -> TranscriptionProvider:
+    # Whisper runs in WHISPER_PROCESSES worker processes that keep
+    # the model loaded; 0 runs it inside this process instead.
+    # With several processes, recordings longer than
+    # WHISPER_SEGMENT_SECONDS are split at pauses and the pieces
+    # transcribed in parallel (0 disables splitting).
+    model_size = os.getenv("WHISPER_MODEL", "base")
+    processes = int(os.getenv("WHISPER_PROCESSES", "1"))
+    if processes > 0:
+        from .whisper_pool import WhisperProcessProvider
+        return WhisperProcessProvider(
+            model_size,
+            processes=processes,
+            segment_seconds=float(os.getenv("WHISPER_SEGMENT_SECONDS", "120")),
+        )
+    from .local_whisper import LocalWhisperProvider
+    return LocalWhisperProvider(model_size)
+
+
+def _gemini() -> TranscriptionProvider:
+    from .gemini import GeminiProvider
+    return GeminiProvider()
+
+
+_BUILTIN: Dict[str, ProviderFactory] = {"local": _local, "gemini": _gemini}
+_registered: Dict[str, ProviderFactory] = {}
+_lock = threading.Lock()
+
+
+def register_provider(name: str, factory: ProviderFactory) -> None:
+    """Registers (or replaces) a provider in this process; takes precedence over built-ins and plugins."""
+    with _lock:
+        _registered[name] = factory
+
+
+def unregister_provider(name: str) -> None:
+    with _lock:
+        _registered.pop(name, None)
+
+
+def _entry_points():
+    from importlib.metadata import entry_points
+
+    if sys.version_info >= (3, 10):
+        return list(entry_points(group=ENTRY_POINT_GROUP))
+    return list(entry_points().get(ENTRY_POINT_GROUP, []))
+
+
+def available_providers() -> List[str]:
+    """Names of every known provider, without importing any of them."""
+    with _lock:
+        names = set(_BUILTIN) | set(_registered)
+    names.update(ep.name for ep in _entry_points())
+    return sorted(names)
+
+
+def _resolve(name: str) -> ProviderFactory:
+    with _lock:
+        factory = _registered.get(name) or _BUILTIN.get(name)
+    if factory is not None:
+        return factory
+    for ep in _entry_points():
+        if ep.name == name:
+            factory = ep.load()
+            with _lock:
+                # Cached so the entry point is only loaded once
+                _registered.setdefault(name, factory)
+            return factory
+    raise ValueError(f"Unknown transcription provider: {name}")
+
+
+def create_provider(name: str) -> TranscriptionProvider:
+    """
+    Builds the provider registered as name, importing only its module.
+
+    Raises:
+        ValueError: If no provider has that name.
+    """
+    return _resolve(name)()
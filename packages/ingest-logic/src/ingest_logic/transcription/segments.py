@@ -0,0 +1,114 @@
+import math
+from typing import Callable, Iterable, List, NamedTuple, Optional, Tuple
+
+from .audio import SAMPLE_RATE
+
+# Energy is measured over frames of this length...
+_FRAME_SECONDS = 0.02
+# ...and smoothed over this window, so a cut lands in a pause rather
+# than in the gap between two syllables.
+_SMOOTH_SECONDS = 0.5
+# Frames converted to float at a time (bounds memory on long recordings)
+_ENERGY_BLOCK_FRAMES = 64 * 1024
+
+
+class Segment(NamedTuple):
+    start: float  # Seconds from the start of the recording
+    end: float
+    text: str
+
+
+class Transcript(NamedTuple):
+    text: str
+    segments: List[Segment]  # Empty if the provider has no timestamps
+
+
+# Called as a transcription advances with (new segments, seconds of audio
+# processed so far, total duration in seconds if known).
+ProgressCallback = Callable[[List[Segment], float, Optional[float]], None]
+
+
+def plan_segments(
+    audio,
+    sample_rate: int = SAMPLE_RATE,
+    max_seconds: float = 120.0,
+    search_seconds: float = 15.0,
+) -> List[Tuple[int, int]]:
+    """
+    Splits audio (a 1-D numpy array or memmap, float or int16) into
+    contiguous (start, end) sample ranges no longer than max_seconds,
+    cutting at the quietest point in the last search_seconds before each
+    limit.
+    """
+    import numpy as np
+
+    total = len(audio)
+    max_len = int(max_seconds * sample_rate)
+    if max_len <= 0 or total <= max_len:
+        return [(0, total)]
+
+    frame = max(1, int(_FRAME_SECONDS * sample_rate))
+    n_frames = total // frame
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    energy = np.empty(n_frames, dtype=np.float64)
+    for i in range(0, n_frames, _ENERGY_BLOCK_FRAMES):
+        block = frames[i:i + _ENERGY_BLOCK_FRAMES].astype(np.float32)
+        energy[i:i + len(block)] = np.einsum("ij,ij->i", block, block)
+    k = max(1, int(_SMOOTH_SECONDS / _FRAME_SECONDS))
+    energy = np.convolve(energy, np.ones(k) / k, mode="same")
+
+    search = int(min(search_seconds, max_seconds / 2) * sample_rate)
+    spans = []
+    start = 0
+    while total - start > max_len:
+        limit = start + max_len
+        first, last = math.ceil((limit - search) / frame), min(limit // frame, n_frames)
+        if last > first:
+            quietest = first + int(np.argmin(energy[first:last]))
+            cut = min(quietest * frame + frame // 2, limit)
+        else:
+            cut = limit
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, total))
+    return spans
+
+
+def stitch(parts: Iterable[Tuple[float, Transcript]]) -> Transcript:
+    """
+    Joins transcripts of consecutive pieces of one recording, given as
+    (offset in seconds, transcript) in order, shifting segment times by
+    each piece's offset.
+    """
+    texts = []
+    segments = []
+    for offset, part in parts:
+        text = part.text.strip()
+        if text:
+            texts.append(text)
+        segments.extend(Segment(s.start + offset, s.end + offset, s.text) for s in part.segments)
+    return Transcript(" ".join(texts), segments)
+
+
+def _vtt_time(seconds: float) -> str:
+    ms = int(round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
+
+
+VTT_HEADER = "WEBVTT\n"
+
+
+def vtt_cues(segments: List[Segment]) -> str:
+    """WebVTT cue blocks for segments, each followed by a blank line."""
+    return "".join(
+        f"\n{_vtt_time(s.start)} --> {_vtt_time(s.end)}\n{s.text.strip()}\n" for s in segments
+    )
+
+
+def to_vtt(segments: List[Segment]) -> str:
+    """Renders segments as a WebVTT file."""
+    return VTT_HEADER + vtt_cues(segments)
+
@@ -0,0 +1,364 @@
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing.connection import Connection, wait
+from typing import Any, Deque, Dict, NamedTuple, Optional, Tuple
+
+from .audio import SAMPLE_RATE, PcmSlice, ensure_pcm, open_pcm, read_pcm
+from .base import TranscriptionProvider
+from .segments import ProgressCallback, Segment, Transcript, plan_segments, stitch
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long the collector sleeps between checks.
+_POLL_INTERVAL = 1.0
+
+
+def _worker_main(model_size: str, torch_threads: int, conn) -> None:
+    """
+    Entry point of a worker process. Loads the model once, then serves
+    (job_id, audio) items from its pipe until the pipe closes or it reads
+    None. audio is a file path, a numpy array of 16 kHz samples, or a
+    PcmSlice, read here from the memory-mapped PCM cache.
+
+    Everything whisper/torch related is imported here, so only worker
+    processes ever load it.
+    """
+    try:
+        import whisper
+        try:
+            import torch
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+        model = whisper.load_model(model_size)
+    except Exception as e:
+        conn.send(("failed", f"Failed to load Whisper model {model_size!r}: {e}"))
+        return
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            return
+        if item is None:
+            return
+        job_id, audio = item
+        try:
+            if isinstance(audio, PcmSlice):
+                audio = read_pcm(audio)
+            result = model.transcribe(audio)
+            segments = [(s["start"], s["end"], s["text"]) for s in result.get("segments", [])]
+        except Exception as e:
+            conn.send(("error", (job_id, f"{e.__class__.__name__}: {e}")))
+        else:
+            conn.send(("done", (job_id, (result["text"], segments))))
+
+
+class _Worker(NamedTuple):
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+
+
+class WhisperProcessPool:
+    """
+    N long-lived worker processes, each holding a loaded Whisper model.
+
+    Processes are started with the 'spawn' method (no fork of the API
+    process and its threads) and preload the model in start(), so the
+    first job pays no load time. Each worker has its own pipe: the pool
+    hands a job to an idle worker and a collector thread waits on all
+    pipes and process sentinels at once, resolving the caller's future
+    when a result arrives. Each process gets cpu_count / N torch threads
+    so together they use every core.
+
+    Nothing is shared between workers, so a worker that dies mid-job
+    (crash, OOM kill) fails just that job and is replaced.
+    """
+
+    def __init__(self, model_size: str = "base", processes: int = 1, torch_threads: Optional[int] = None):
+        self.model_size = model_size
+        self.processes = max(1, processes)
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // self.processes)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._workers: Dict[int, _Worker] = {}  # pid -> worker
+        self._idle: Deque[int] = deque()
+        self._assigned: Dict[int, int] = {}  # pid -> job id in progress
+        self._backlog: Deque[Tuple[int, Any]] = deque()
+        self._pending: Dict[int, Future] = {}
+        self._job_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._load_error: Optional[str] = None
+        self._collector: Optional[threading.Thread] = None
+        self._stopping = False
+
+    # -- lifecycle ------------------------------------------------------
+
+    def start(self, wait: bool = False, timeout: Optional[float] = None) -> None:
+        """
+        Spawns the workers, which begin loading the model right away.
+        With wait=True, blocks until one is ready (or loading failed).
+        """
+        with self._lock:
+            if self._collector is None:
+                self._stopping = False
+                for _ in range(self.processes):
+                    self._spawn()
+                self._collector = threading.Thread(target=self._collect, name="whisper-pool", daemon=True)
+                self._collector.start()
+        if wait:
+            self._ready.wait(timeout)
+
+    def _spawn(self) -> None:
+        parent_conn, child_conn = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(self.model_size, self.torch_threads, child_conn),
+            name="whisper-worker",
+            daemon=True,
+        )
+        proc.start()
+        child_conn.close()
+        self._workers[proc.pid] = _Worker(proc, parent_conn)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Asks workers to exit, then terminates stragglers."""
+        with self._lock:
+            if self._collector is None:
+                return
+            self._stopping = True
+            workers = list(self._workers.values())
+            for worker in workers:
+                try:
+                    worker.conn.send(None)
+                except OSError:
+                    pass
+        for worker in workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout)
+        self._collector.join(timeout)
+
+        with self._lock:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Whisper worker pool stopped"))
+            for worker in self._workers.values():
+                worker.conn.close()
+            self._pending.clear()
+            self._backlog.clear()
+            self._workers.clear()
+            self._idle.clear()
+            self._assigned.clear()
+            self._collector = None
+            self._ready.clear()
+
+    # -- jobs -----------------------------------------------------------
+
+    def submit(self, audio) -> Future:
+        """
+        Queues a file path, an array of 16 kHz samples or a PcmSlice; the
+        future resolves to a Transcript.
+        """
+        if self._load_error is not None:
+            raise RuntimeError(self._load_error)
+        self.start()
+        future: Future = Future()
+        with self._lock:
+            job_id = next(self._job_ids)
+            self._pending[job_id] = future
+            self._backlog.append((job_id, audio))
+            self._dispatch()
+        return future
+
+    def transcribe(self, audio, timeout: Optional[float] = None) -> str:
+        return self.transcribe_timed(audio, timeout).text
+
+    def transcribe_timed(self, audio, timeout: Optional[float] = None) -> Transcript:
+        return self.submit(audio).result(timeout)
+
+    def info(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "model": self.model_size,
+                "processes": self.processes,
+                "alive": sum(1 for w in self._workers.values() if w.process.is_alive()),
+                "ready": self._ready.is_set(),
+                "busy": len(self._assigned),
+                "backlog": len(self._backlog),
+                "load_error": self._load_error,
+            }
+
+    def _dispatch(self) -> None:
+        """Hands backlog jobs to idle workers. Caller holds the lock."""
+        while self._idle and self._backlog:
+            future = self._pending.get(self._backlog[0][0])
+            if future is None or future.cancelled():
+                self._pending.pop(self._backlog.popleft()[0], None)
+                continue
+            pid = self._idle.popleft()
+            worker = self._workers.get(pid)
+            if worker is None:
+                continue
+            job = self._backlog[0]
+            try:
+                worker.conn.send(job)
+            except OSError:
+                continue  # Dead; the collector reaps it
+            self._backlog.popleft()
+            self._assigned[pid] = job[0]
+
+    # -- collector ------------------------------------------------------
+
+    def _resolve(self, job_id: int, result=None, error: Optional[str] = None) -> None:
+        future = self._pending.pop(job_id, None)
+        if future is None or future.done():
+            return
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(RuntimeError(error))
+
+    def _collect(self) -> None:
+        while True:
+            with self._lock:
+                if self._stopping and not any(w.process.is_alive() for w in self._workers.values()):
+                    return
+                by_conn = {w.conn: pid for pid, w in self._workers.items()}
+                sentinels = [w.process.sentinel for w in self._workers.values()]
+
+            ready = wait(list(by_conn) + sentinels, timeout=_POLL_INTERVAL)
+
+            with self._lock:
+                for conn in ready:
+                    pid = by_conn.get(conn)
+                    if pid is None or pid not in self._workers:
+                        continue
+                    try:
+                        kind, payload = conn.recv()
+                    except (EOFError, OSError):
+                        continue  # Exited; handled by _reap below
+                    self._handle(pid, kind, payload)
+                self._reap()
+                self._dispatch()
+
+    def _handle(self, pid: int, kind: str, payload) -> None:
+        if kind == "ready":
+            self._ready.set()
+            self._idle.append(pid)
+        elif kind == "failed":
+            logger.error(payload)
+            self._load_error = payload
+            # No worker can ever serve these
+            self._backlog.clear()
+            for job_id in list(self._pending):
+                self._resolve(job_id, error=payload)
+            self._ready.set()
+        elif kind in ("done", "error"):
+            job_id, value = payload
+            self._assigned.pop(pid, None)
+            if kind == "done":
+                text, segments = value
+                self._resolve(job_id, result=Transcript(text, [Segment(*s) for s in segments]))
+            else:
+                self._resolve(job_id, error=value)
+            self._idle.append(pid)
+
+    def _reap(self) -> None:
+        """Fails the job of any worker that died and starts a replacement."""
+        for pid, worker in list(self._workers.items()):
+            if worker.process.is_alive():
+                continue
+            del self._workers[pid]
+            worker.conn.close()
+            if pid in self._idle:
+                self._idle.remove(pid)
+            job_id = self._assigned.pop(pid, None)
+            if job_id is not None:
+                self._resolve(job_id, error=f"Whisper worker exited with code {worker.process.exitcode}")
+            if not self._stopping and self._load_error is None:
+                logger.warning("Whisper worker %s exited (%s), restarting", pid, worker.process.exitcode)
+                self._spawn()
+
+
+class WhisperProcessProvider(TranscriptionProvider):
+    """
+    Local Whisper, run in a WhisperProcessPool instead of in-process.
+
+    The recording's audio is decoded once into the PCM cache next to it
+    (see ensure_pcm), and workers read their samples straight from that
+    file, so a retry doesn't decode again and no audio goes through the
+    pipes.
+
+    With more than one process and segment_seconds set, the audio is
+    split at pauses into pieces of at most
+    segment_seconds (see plan_segments), and the pieces are transcribed
+    in parallel across the pool and stitched back together in order
+    (reported to on_progress piece by piece, in order, as they finish). A
+    long recording then finishes roughly `processes` times sooner. Each
+    piece is transcribed without the text before it as context, which
+    can slightly change wording right after a cut.
+    """
+
+    def __init__(self, model_size: str = "base", processes: int = 1, segment_seconds: float = 0):
+        self.model_size = model_size
+        self.model_name = model_size
+        self.segment_seconds = segment_seconds
+        self.pool = WhisperProcessPool(model_size, processes=processes)
+
+    @property
+    def segmented(self) -> bool:
+        return self.segment_seconds > 0 and self.pool.processes >= 2
+
+    @property
+    def prompt_version(self) -> str:
+        # Cuts change the wording, so segmented transcripts are cached
+        # per segment length; whole-file ones share the in-process key.
+        return f"segments-{self.segment_seconds:g}s" if self.segmented else ""
+
+    def start(self) -> None:
+        self.pool.start()
+
+    def close(self) -> None:
+        self.pool.stop()
+
+    def transcribe(self, file_path: str) -> str:
+        return self.transcribe_timed(file_path).text
+
+    def transcribe_timed(self, file_path: str, on_progress: Optional[ProgressCallback] = None) -> Transcript:
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        pcm_path = ensure_pcm(file_path)
+        audio = open_pcm(pcm_path)
+        duration = len(audio) / SAMPLE_RATE
+
+        if not self.segmented:
+            print(f"Transcribing {file_path} in a Whisper worker process...")
+            transcript = self.pool.transcribe_timed(PcmSlice(pcm_path, 0, len(audio)))
+            if on_progress is not None and transcript.segments:
+                on_progress(transcript.segments, duration, duration)
+            return transcript
+
+        spans = plan_segments(audio, SAMPLE_RATE, max_seconds=self.segment_seconds)
+        print(f"Transcribing {file_path} in {len(spans)} segment(s) across {self.pool.processes} processes...")
+        futures = [self.pool.submit(PcmSlice(pcm_path, start, end)) for start, end in spans]
+        try:
+            parts = []
+            for (start, end), future in zip(spans, futures):
+                parts.append((start / SAMPLE_RATE, future.result()))
+                if on_progress is not None:
+                    on_progress(stitch(parts[-1:]).segments, end / SAMPLE_RATE, duration)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        return stitch(parts)
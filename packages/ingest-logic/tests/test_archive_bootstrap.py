@@ -76,3 +76,25 @@ def test_bootstrap_conflict(tmp_path):
     
     with pytest.raises(ValueError, match="Cannot create 'people' directory"):
         bootstrap_archive(tmp_path)
+
+def test_bootstrap_id_scheme(tmp_path):
+    """
+    Test that a new archive records its ID scheme, and that an archive with
+    people cannot change it.
+    """
+    from ingest_logic.archive.bootstrap import read_id_scheme
+
+    bootstrap_archive(tmp_path)
+    assert read_id_scheme(tmp_path) == "legacy"
+    assert not (tmp_path / "archive.yaml").exists()
+
+    with pytest.raises(ValueError, match="Unknown ID scheme"):
+        bootstrap_archive(tmp_path, id_scheme="uuid")
+
+    bootstrap_archive(tmp_path, id_scheme="compact")
+    assert read_id_scheme(tmp_path) == "compact"
+
+    (tmp_path / "people" / "ab").mkdir()
+    bootstrap_archive(tmp_path, id_scheme="compact")
+    with pytest.raises(ValueError, match="already has people"):
+        bootstrap_archive(tmp_path, id_scheme="legacy")
@@ -0,0 +1,116 @@
+import pytest
+import os
+import shutil
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.index import ArchiveIndex
+from ingest_logic.people.manager import PersonManager
+from contracts.models import Person
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ArchiveIndex(str(tmp_path / "config" / "index.sqlite3"))
+    yield idx
+    idx.close()
+
+@pytest.fixture
+def person_manager(tmp_path, index):
+    return PersonManager(str(tmp_path / "archive"), index=index)
+
+def test_save_person_writes_through(person_manager, index):
+    """save_person updates the index so listing needs no disk walk."""
+    p = person_manager.create_person("Index", "Me", "1950-05-05")
+
+    assert index.count_people() == 1
+    listed = person_manager.list_people()
+    assert len(listed) == 1
+    assert isinstance(listed[0], Person)
+    assert listed[0].slug == p.slug
+    assert listed[0].display_name == p.display_name
+
+def test_search_matches_name_prefix(person_manager):
+    person_manager.create_person("Lovelace", "Ada", "1815-12-10", bio="Mathematician")
+    person_manager.create_person("Babbage", "Charles", "1791-12-26")
+
+    results = person_manager.search_people("lovel")
+    assert [r.names[0].surname for r in results] == ["Lovelace"]
+
+    results = person_manager.search_people("mathematician")
+    assert len(results) == 1
+
+    with pytest.raises(ValueError):
+        person_manager.search_people("  ")
+
+def test_rebuild_from_filesystem(tmp_path, person_manager, index):
+    """Index can be deleted and rebuilt from disk without data loss."""
+    person_manager.create_person("Rebuild", "One", "2001-01-01")
+    person_manager.create_person("Rebuild", "Two", "2002-02-02")
+
+    # Simulate a lost/stale index
+    index.clear()
+    assert not index.is_built()
+    assert person_manager.list_people() == []
+    assert not person_manager.search_people("rebuild")
+
+    counts = person_manager.rebuild_index()
+    assert counts == {"people": 2, "errors": 0}
+    assert index.is_built()
+    assert len(person_manager.search_people("rebuild")) == 2
+
+def test_rebuild_counts_corrupt_files(tmp_path, person_manager):
+    bad_dir = tmp_path / "archive" / "people" / "ba" / "d0" / "bad--1234"
+    bad_dir.mkdir(parents=True)
+    (bad_dir / "bio.yaml").write_text('id: "1234"\n')
+
+    counts = person_manager.rebuild_index()
+    assert counts == {"people": 0, "errors": 1}
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_list_people_page_walks_all_in_slug_order(tmp_path, index, indexed):
+    pm = PersonManager(str(tmp_path / "archive"), index=index if indexed else None)
+    created = sorted(pm.create_person("Page", f"N{i}", "1990-01-01").slug for i in range(7))
+
+    seen, after = [], None
+    while True:
+        page, after = pm.list_people_page(limit=3, after=after)
+        assert len(page) <= 3
+        seen.extend(p.slug for p in page)
+        if after is None:
+            break
+
+    assert seen == created
+    assert [p.slug for p in pm.iter_listing(batch_size=2)] == created
+
+def test_unindexed_pages_seek_to_the_cursor(tmp_path, index, monkeypatch):
+    pm = PersonManager(str(tmp_path / "archive"))
+    # Names of different lengths land in different shards
+    for i in range(30):
+        pm.create_person("F" * (1 + i % 5), f"Given{i}", "1990-01-01")
+    indexed = PersonManager(str(tmp_path / "archive"), index=index)
+    indexed.rebuild_index()
+
+    loads = []
+    real_load = pm.load_person_file
+    monkeypatch.setattr(pm, "load_person_file", lambda path, slug: loads.append(slug) or real_load(path, slug))
+
+    seen, after = [], None
+    while True:
+        loads.clear()
+        page, after = pm.list_people_page(limit=4, after=after)
+        # Only the page (plus the look-ahead and in-flight loads), never what came before
+        assert all(slug > (seen[-1] if seen else "") for slug in loads)
+        seen.extend(p.slug for p in page)
+        if after is None:
+            break
+    assert seen == [p.slug for p in indexed.list_people()]
+
+    # A cursor whose person has since been deleted still resumes after it
+    gone = seen[10]
+    shutil.rmtree(os.path.join(pm.people_dir, gone))
+    page, _ = pm.list_people_page(limit=3, after=gone)
+    assert [p.slug for p in page] == seen[11:14]
@@ -0,0 +1,187 @@
+import json
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.archive.session import ArchiveSession, ArchiveSessionRegistry
+from ingest_logic.config import ConfigManager
+
+@pytest.fixture
+def config(tmp_path):
+    return ConfigManager(str(tmp_path / "config"))
+
+@pytest.fixture
+def roots(tmp_path):
+    paths = []
+    for name in ("default", "other"):
+        path = tmp_path / name
+        path.mkdir()
+        paths.append(str(path))
+    return paths
+
+def wait_for_root(registry, root, timeout=5):
+    deadline = time.monotonic() + timeout
+    while registry.current().root != root and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return registry.current()
+
+def test_serves_default_root_until_configured(config, roots):
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=0)
+
+    session = registry.current()
+    assert session.root == default
+    assert session.index.is_built()
+    assert (Path(default) / "people").is_dir()
+
+    config.set_archive_root(other)
+    # Indexed in the background, then swapped in
+    assert wait_for_root(registry, other).index.is_built()
+
+def test_current_is_cached_between_checks(config, roots, monkeypatch):
+    registry = ArchiveSessionRegistry(config, roots[0], check_interval=3600)
+    first = registry.current()
+
+    def fail():
+        raise AssertionError("config reloaded")
+
+    monkeypatch.setattr(config, "load", fail)
+    assert registry.current() is first
+    assert registry.current().people is first.people
+
+def test_switch_notifies_and_keeps_sessions_warm(config, roots):
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=3600)
+    switches = []
+    registry.on_switch(lambda session, counts: switches.append((session.root, counts)))
+
+    first = registry.current()
+    first.people.create_person("Doe", "Jane", "1950-01-01")
+    registry.switch(other)
+    assert registry.current().people.list_people() == []
+
+    # Back to the first archive: same session, nothing to prepare again
+    assert registry.switch(default) is first
+    assert [p.display_name for p in registry.current().people.list_people()] == ["Doe, Jane"]
+    assert [(root, counts.get("built")) for root, counts in switches] == [
+        (default, 1), (other, 1), (default, None),
+    ]
+
+    # Switching to the current archive is not a change
+    registry.switch(default)
+    assert len(switches) == 3
+
+def test_external_switch_prepares_in_background(config, roots, monkeypatch):
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=0)
+    first = registry.current()
+    switches = []
+    registry.on_switch(lambda session, counts: switches.append((session.root, counts.get("built"))))
+
+    release = threading.Event()
+    real_prepare = ArchiveSession.prepare
+
+    def slow_prepare(session):
+        if session.root == other:
+            assert release.wait(5)
+        return real_prepare(session)
+
+    monkeypatch.setattr(ArchiveSession, "prepare", slow_prepare)
+    config.set_archive_root(other)
+
+    # The old archive keeps being served, without waiting for the index
+    started = time.monotonic()
+    for _ in range(3):
+        assert registry.current() is first
+    assert time.monotonic() - started < 1
+
+    release.set()
+    session = wait_for_root(registry, other)
+    assert session.root == other
+    assert session.ready
+    assert switches == [(other, 1)]
+
+def test_switch_soon_prepares_in_background(config, roots, monkeypatch):
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=3600)
+    first = registry.current()
+
+    release = threading.Event()
+    real_prepare = ArchiveSession.prepare
+
+    def slow_prepare(session):
+        if session.root == other:
+            assert release.wait(5)
+        return real_prepare(session)
+
+    monkeypatch.setattr(ArchiveSession, "prepare", slow_prepare)
+    config.set_archive_root(other)
+    assert registry.switch_soon(other) is first
+    assert registry.current() is first
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while registry.current() is first and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert registry.current().root == other
+
+    # Back to a ready archive: immediate
+    config.set_archive_root(default)
+    assert registry.switch_soon(default) is first
+
+def test_refresh_settings_rebuilds_session_with_new_scheme(config, roots):
+    from ingest_logic.archive.bootstrap import bootstrap_archive
+
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=3600)
+    registry.switch(other)
+    stale = registry.session_for(default)
+    assert stale.id_scheme == "legacy"
+
+    bootstrap_archive(Path(default), id_scheme="compact")
+    registry.refresh_settings(default)
+    session = registry.switch(default)
+    assert session is not stale
+    assert session.id_scheme == "compact"
+    assert len(session.people.create_person("Doe", "Jane", "1950-01-01").id) == 16
+
+    # Nothing changed: the session is kept
+    registry.refresh_settings(default)
+    assert registry.session_for(default) is session
+
+def test_missing_configured_root_falls_back_to_default(config, roots, tmp_path):
+    config.set_archive_root(str(tmp_path / "unplugged"))
+    registry = ArchiveSessionRegistry(config, roots[0])
+    assert registry.current().root == roots[0]
+
+def test_session_for_path(config, roots):
+    default, other = roots
+    registry = ArchiveSessionRegistry(config, default, check_interval=3600)
+    registry.switch(other)
+    registry.switch(default)
+
+    recording = str(Path(other) / "people" / "7z" / "s7" / "x" / "recordings" / "a.yaml")
+    assert registry.session_for_path(recording).root == other
+    assert registry.session_for_path("/elsewhere/a.yaml").root == default
+
+def test_config_load_rereads_only_on_change(config, roots, monkeypatch):
+    config.set_archive_root(roots[0])
+    assert config.load().archive_root == roots[0]
+
+    reads = []
+    real_load = json.load
+    monkeypatch.setattr(json, "load", lambda f: reads.append(1) or real_load(f))
+    for _ in range(3):
+        assert config.load().archive_root == roots[0]
+    assert reads == []
+
+    config.set_archive_root(roots[1])
+    assert config.load().archive_root == roots[1]
+    assert config.load().archive_root == roots[1]
+    assert reads == [1]
@@ -0,0 +1,72 @@
+import os
+import pytest
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription.audio import (
+    COMPRESSED_SUFFIX, PCM_SUFFIX, PcmSlice, derived_path, discard_derived, discard_pcm, ensure_pcm, load_audio, open_pcm, read_pcm,
+)
+
+np = pytest.importorskip("numpy")
+
+@pytest.fixture
+def cached(tmp_path):
+    """A recording with an up-to-date PCM cache next to it."""
+    media = tmp_path / "interview.mov"
+    media.write_bytes(b"video")
+    pcm = Path(derived_path(str(media), PCM_SUFFIX))
+    np.array([0, 16384, -32768, 32767], dtype=np.int16).tofile(pcm)
+    os.utime(pcm, ns=(os.stat(media).st_mtime_ns + 1,) * 2)
+    return media, pcm
+
+def test_fresh_cache_is_reused_without_decoding(cached):
+    media, pcm = cached
+    assert pcm.name == "interview.audio.pcm"
+    # No ffmpeg needed: the cache is newer than the recording
+    assert ensure_pcm(str(media)) == str(pcm)
+
+    samples = open_pcm(str(pcm))
+    assert isinstance(samples, np.memmap) and samples.dtype == np.int16
+    assert load_audio(str(media)).tolist() == [0.0, 0.5, -1.0, 32767 / 32768]
+    assert read_pcm(PcmSlice(str(pcm), 1, 3)).tolist() == [0.5, -1.0]
+
+def test_stale_cache_is_not_reused(cached, monkeypatch):
+    media, pcm = cached
+    os.utime(media, ns=(os.stat(pcm).st_mtime_ns + 1,) * 2)
+    # ffmpeg-python is swapped out so the test needs no ffmpeg binary
+    calls = []
+    class FakeFfmpeg:
+        class Error(Exception):
+            pass
+        @staticmethod
+        def input(path, **kw):
+            calls.append(path)
+            raise RuntimeError("decoding")
+    monkeypatch.setitem(sys.modules, "ffmpeg", FakeFfmpeg)
+    with pytest.raises(RuntimeError, match="decoding"):
+        ensure_pcm(str(media))
+    assert calls == [str(media)]
+
+def test_discard_pcm(cached):
+    media, pcm = cached
+    discard_pcm(str(media))
+    assert not pcm.exists()
+    discard_pcm(str(media))  # Idempotent
+
+def test_discard_derived(cached):
+    media, pcm = cached
+    mp3 = Path(derived_path(str(media), COMPRESSED_SUFFIX))
+    mp3.write_bytes(b"mp3")
+    discard_derived(str(media))
+    assert not pcm.exists() and not mp3.exists()
+    assert media.exists()
+    discard_derived(str(media))  # Idempotent
+
+def test_empty_cache(tmp_path):
+    pcm = tmp_path / "silent.audio.pcm"
+    pcm.write_bytes(b"")
+    assert len(open_pcm(str(pcm))) == 0
@@ -0,0 +1,57 @@
+import pytest
+import io
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.people.manager import PersonManager
+from ingest_logic.people.bulk_import import import_people, iter_csv_rows, iter_jsonl_rows, detect_format
+
+@pytest.fixture
+def person_manager(tmp_path):
+    return PersonManager(str(tmp_path))
+
+def test_csv_import_creates_and_reports(person_manager, tmp_path):
+    csv_text = (
+        "family_name,given_name,dob,suffix,bio\n"
+        "Doe,Jane,1990-01-01,,First\n"
+        "Doe,John,1992-02-02,Jr,\n"
+        ",NoFamily,1990-01-01,,\n"
+    )
+    report = import_people(person_manager, iter_csv_rows(io.StringIO(csv_text)), batch_size=1, max_workers=2)
+
+    assert (report.created, report.skipped, report.failed) == (2, 0, 1)
+    assert [r.status for r in report.rows] == ["created", "created", "failed"]
+    assert [r.row for r in report.rows] == [2, 3, 4]
+    assert "family_name" in report.rows[2].error
+    assert len(person_manager.list_people()) == 2
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+def test_import_skips_existing_and_repeated_ids(person_manager, monkeypatch):
+    existing = person_manager.create_person("Doe", "Jane", "1990-01-01")
+    jsonl = (
+        '{"family_name": "Doe", "given_name": "Jane", "dob": "1990-01-01"}\n'
+        '{"family_name": "Roe", "given_name": "Rick", "dob": "1980-01-01"}\n'
+        '{"family_name": "Roe", "given_name": "Rick", "dob": "1980-01-01"}\n'
+        'not json\n'
+    )
+
+    # Duplicates must be resolved from the ID set, never by reading person files
+    def fail(*args, **kwargs):
+        raise AssertionError("bio.yaml was read during import")
+    monkeypatch.setattr(person_manager, "load_person_file", fail)
+
+    report = import_people(person_manager, iter_jsonl_rows(io.StringIO(jsonl)))
+
+    assert [r.status for r in report.rows] == ["skipped", "created", "skipped", "failed"]
+    assert report.rows[0].id == existing.id
+    assert "Invalid JSON" in report.rows[3].error
+
+def test_detect_format():
+    assert detect_format("People.CSV") == "csv"
+    assert detect_format("people.jsonl") == "jsonl"
+    with pytest.raises(ValueError):
+        detect_format("people.xlsx")
@@ -1,6 +1,8 @@
+import os
 import pytest
+import time
 from pathlib import Path
-from ingest_logic.archive.cleanup import cleanup_temp_files
+from ingest_logic.archive.cleanup import TempSweeper, cleanup_temp_files, sweep_temp_files
 
 def test_cleanup_removes_tmp_files(tmp_path):
     """
@@ -43,3 +45,100 @@ def test_cleanup_invalid_path(tmp_path):
     """
     count = cleanup_temp_files(tmp_path / "ghost")
     assert count == 0
+
+def test_cleanup_skips_upload_sessions(tmp_path):
+    """
+    Resumable upload sessions are left to their own expiry.
+    """
+    session = tmp_path / ".uploads" / "abc"
+    session.mkdir(parents=True)
+    (session / "session.json.tmp").touch()
+    (tmp_path / "waste.tmp").touch()
+
+    assert cleanup_temp_files(tmp_path) == 1
+    assert (session / "session.json.tmp").exists()
+
+def make_old(path: Path, age: float = 7200) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    then = time.time() - age
+    os.utime(path, (then, then))
+    return path
+
+@pytest.fixture
+def archive(tmp_path):
+    """An archive with stale temps where safe writes happen and elsewhere."""
+    person = tmp_path / "people" / "13" / "x9" / "Doe_Jane--13x9q2z"
+    person.mkdir(parents=True)
+    (person / "bio.yaml").write_text("id: 13x9q2z\n")
+    return tmp_path, person
+
+def test_sweep_removes_stale_temps_in_safe_write_dirs(archive):
+    root, person = archive
+    stale = [
+        make_old(root / "notes.tmp"),
+        make_old(person / "bio.yaml.tmp"),
+        make_old(person / "recordings" / "audio" / "a.mp3.tmp"),
+        make_old(person / "recordings" / "video" / "b.meta.yaml.tmp"),
+    ]
+    kept = make_old(person / "recordings" / "video" / "b.mov")
+
+    counts = sweep_temp_files(root, min_age_seconds=60, max_workers=2)
+
+    assert counts["deleted"] == 4
+    assert counts["shards"] == counts["shards_done"] == 1
+    assert not any(p.exists() for p in stale)
+    assert kept.exists()
+
+def test_sweep_keeps_recent_temps(archive):
+    root, person = archive
+    fresh = person / "bio.yaml.tmp"
+    fresh.touch()  # Possibly still being written by a request
+    old = make_old(person / "recordings" / "audio" / "a.mp3.tmp")
+
+    assert sweep_temp_files(root, min_age_seconds=60)["deleted"] == 1
+    assert fresh.exists()
+    assert not old.exists()
+
+def test_sweep_prunes_unrelated_dirs(archive):
+    root, person = archive
+    outside = [
+        make_old(root / ".uploads" / "abc" / "data.tmp"),
+        make_old(root / "exports" / "big.tmp"),
+        make_old(person / "photos" / "scan.tmp"),
+        make_old(person / "recordings" / "audio" / "nested" / "deep.tmp"),
+    ]
+
+    assert sweep_temp_files(root, min_age_seconds=60)["deleted"] == 0
+    assert all(p.exists() for p in outside)
+
+def test_sweep_reports_progress_and_stops(archive):
+    root, _ = archive
+    for shard in ("aa", "bb", "cc"):
+        make_old(root / "people" / shard / "00" / "X--aa00" / "bio.yaml.tmp")
+    seen = []
+
+    counts = sweep_temp_files(root, min_age_seconds=60, max_workers=1, on_progress=seen.append)
+    assert counts["deleted"] == 3
+    assert seen and seen[-1]["dirs"] == counts["dirs"]
+
+    stopped = sweep_temp_files(root, min_age_seconds=60, should_stop=lambda: True)
+    assert stopped["dirs"] == 2  # Root and people/ only
+
+def test_sweep_missing_root(tmp_path):
+    assert sweep_temp_files(tmp_path / "ghost")["deleted"] == 0
+
+def test_sweeper_runs_in_background(archive):
+    root, person = archive
+    stale = make_old(person / "bio.yaml.tmp")
+    sweeper = TempSweeper(min_age_seconds=60)
+    assert sweeper.status()["state"] == "idle"
+
+    sweeper.start(root)
+    status = sweeper.wait(timeout=10)
+
+    assert status["state"] == "done"
+    assert status["root"] == str(root)
+    assert status["deleted"] == 1
+    assert status["finished_at"] is not None
+    assert not stale.exists()
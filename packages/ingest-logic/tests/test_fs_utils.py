@@ -1,6 +1,9 @@
 import pytest
 from pathlib import Path
-from ingest_logic.common.fs_utils import write_safe
+from ingest_logic.common.fs_utils import write_safe, write_safe_stream, SafeWriteBatch
+import asyncio
+import hashlib
+import io
 import os
 
 def test_safe_write_basics(tmp_path):
@@ -32,3 +35,87 @@ def test_safe_write_binary(tmp_path):
     
     write_safe(str(target), content)
     assert target.read_bytes() == content
+
+def test_safe_write_batch_commits_all(tmp_path):
+    """SafeWriteBatch lands every staged file on commit and leaves no temps."""
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    targets = [tmp_path / f"f{i}.yaml" for i in range(5)] + [sub / "g.bin"]
+    targets[0].write_text("old")
+
+    committed = []
+    with SafeWriteBatch(max_workers=2) as batch:
+        for i, t in enumerate(targets[:-1]):
+            batch.write(str(t), f"content {i}")
+        batch.write(str(targets[-1]), b"\x00\x01")
+        batch.after_commit(lambda: committed.append(True))
+
+        # Nothing is visible before commit
+        assert targets[0].read_text() == "old"
+        assert not targets[1].exists()
+
+    assert [t.read_text() for t in targets[:-1]] == [f"content {i}" for i in range(5)]
+    assert targets[-1].read_bytes() == b"\x00\x01"
+    assert committed == [True]
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+def test_safe_write_batch_aborts_on_error(tmp_path):
+    """An exception inside the block discards staged temps and keeps old content."""
+    target = tmp_path / "data.json"
+    target.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with SafeWriteBatch() as batch:
+            batch.write(str(target), "new")
+            batch.write(str(tmp_path / "other.json"), "new")
+            raise RuntimeError("boom")
+
+    assert target.read_text() == "old"
+    assert not (tmp_path / "other.json").exists()
+    assert list(tmp_path.glob("*.tmp")) == []
+
+class _AsyncReader:
+    """Minimal stand-in for UploadFile.read()."""
+    def __init__(self, data: bytes):
+        self._buf = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._buf.read(size)
+
+def test_write_safe_stream_hashes_while_writing(tmp_path):
+    target = tmp_path / "clip.mp4"
+    data = os.urandom(3 * 1024 + 17)
+
+    result = asyncio.run(write_safe_stream(str(target), _AsyncReader(data), chunk_size=1024))
+
+    assert target.read_bytes() == data
+    assert result.sha256 == hashlib.sha256(data).hexdigest()
+    assert result.size == len(data)
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_write_safe_stream_cleans_up_on_error(tmp_path):
+    class Broken:
+        async def read(self, size=-1):
+            raise IOError("client went away")
+
+    target = tmp_path / "clip.mp4"
+    with pytest.raises(IOError):
+        asyncio.run(write_safe_stream(str(target), Broken()))
+    assert not target.exists()
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_write_safe_stream_accept_can_discard(tmp_path):
+    target = tmp_path / "clip.mp4"
+    target.write_bytes(b"original")
+    seen = []
+
+    def reject(result):
+        seen.append(result)
+        return False
+
+    result = asyncio.run(write_safe_stream(str(target), _AsyncReader(b"new content"), accept=reject))
+
+    assert seen == [result]
+    assert result.sha256 == hashlib.sha256(b"new content").hexdigest()
+    assert target.read_bytes() == b"original"
+    assert not list(tmp_path.glob("*.tmp"))
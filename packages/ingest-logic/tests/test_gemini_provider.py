@@ -0,0 +1,209 @@
+import asyncio
+import itertools
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription import gemini
+from ingest_logic.transcription.gemini import GeminiProvider
+
+class FakeGenai:
+    """
+    The slice of google.generativeai the provider uses, with latency.
+    With overlap=N, each upload waits (up to 5s) until N uploads are in
+    flight at once, so a provider that doesn't run them concurrently
+    fails the upload instead of just being slow.
+    """
+
+    def __init__(self, latency=0.2, polls=2, fail=(), overlap=None):
+        self.latency = latency
+        self._barrier = threading.Barrier(overlap, timeout=5) if overlap else None
+        self.polls = polls
+        self.fail = set(fail)
+        self.files = {}  # name -> (path, polls left)
+        self.deleted = []
+        self.in_flight = 0
+        self.peak = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _file(self, name):
+        path, left = self.files[name]
+        if Path(path).name in self.fail:
+            state = "FAILED" if left <= 0 else "PROCESSING"
+        else:
+            state = "ACTIVE" if left <= 0 else "PROCESSING"
+        return SimpleNamespace(name=name, path=path, state=SimpleNamespace(name=state))
+
+    def upload_file(self, path):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        if self._barrier is not None:
+            self._barrier.wait()
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+            name = f"files/{next(self._ids)}"
+            self.files[name] = (path, self.polls)
+            return self._file(name)
+
+    def get_file(self, name):
+        with self._lock:
+            path, left = self.files[name]
+            self.files[name] = (path, left - 1)
+            return self._file(name)
+
+    def delete_file(self, name):
+        with self._lock:
+            del self.files[name]
+            self.deleted.append(name)
+
+    def GenerativeModel(self, model_name):
+        def generate_content(contents):
+            time.sleep(self.latency)
+            return SimpleNamespace(text=f"transcript of {Path(contents[0].path).name}")
+        return SimpleNamespace(generate_content=generate_content)
+
+@pytest.fixture
+def media(tmp_path):
+    paths = []
+    for i in range(6):
+        p = tmp_path / f"rec{i}.mp3"
+        p.write_bytes(b"x")
+        paths.append(str(p))
+    return paths
+
+def _provider(client, **kw):
+    kw.setdefault("poll_initial", 0.01)
+    kw.setdefault("audio_only", False)
+    return GeminiProvider(client=client, **kw)
+
+def test_batch_runs_concurrently_and_cleans_up(media):
+    # Four uploads must be in flight together for any of them to finish
+    client = FakeGenai(latency=0.01, overlap=4)
+    provider = _provider(client, max_concurrency=4)
+
+    results = asyncio.run(provider.atranscribe_many(media[:4]))
+
+    assert results == [f"transcript of rec{i}.mp3" for i in range(4)]
+    assert client.peak == 4
+    assert client.files == {}
+    assert len(client.deleted) == 4
+
+def test_concurrency_is_capped(media):
+    # Uploads pair up, so the cap is reached but never passed
+    client = FakeGenai(latency=0.01, overlap=2)
+    provider = _provider(client, max_concurrency=2)
+    results = asyncio.run(provider.atranscribe_many(media))
+    assert results == [f"transcript of rec{i}.mp3" for i in range(6)]
+    assert client.peak == 2
+
+def test_failures_are_per_file_and_still_deleted(media):
+    client = FakeGenai(latency=0.01, fail={"rec1.mp3"})
+    provider = _provider(client, max_concurrency=3)
+    results = asyncio.run(provider.atranscribe_many(media[:3]))
+
+    assert results[0] == "transcript of rec0.mp3"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "transcript of rec2.mp3"
+    assert client.files == {}
+
+def test_processing_timeout_deletes_file(media):
+    client = FakeGenai(latency=0.01, polls=10**6)
+    provider = _provider(client, processing_timeout=0.1)
+    with pytest.raises(TimeoutError):
+        asyncio.run(provider.atranscribe(media[0]))
+    assert client.files == {}
+
+def test_cancelled_upload_is_deleted_when_it_lands(media):
+    client = FakeGenai(latency=0.3)
+    provider = _provider(client)
+
+    async def run():
+        task = asyncio.ensure_future(provider.atranscribe(media[0]))
+        await asyncio.sleep(0.05)  # Upload in progress
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # Upload finishes, then the orphan is deleted
+        await _until_async(lambda: client.deleted)
+
+    asyncio.run(run())
+    assert client.files == {}
+    assert client.deleted == ["files/1"]
+
+def test_sync_transcribe_shares_one_loop(media):
+    # Calls from four threads overlap on the provider's one loop
+    client = FakeGenai(latency=0.01, overlap=4)
+    provider = _provider(client, max_concurrency=4)
+    provider.start()
+    try:
+        results = [None] * 4
+        def work(i):
+            results[i] = provider.transcribe(media[i])
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [f"transcript of rec{i}.mp3" for i in range(4)]
+    finally:
+        provider.close()
+    assert client.files == {}
+
+def test_close_cancels_in_flight_and_deletes(media):
+    client = FakeGenai(latency=0.05, polls=10**6)
+    provider = _provider(client)
+    errors = []
+    thread = threading.Thread(target=lambda: errors.append(_capture(provider.transcribe, media[0])))
+    thread.start()
+    _until(lambda: client.files)  # Uploaded, now polling
+    provider.close()
+    thread.join(5)
+
+    assert errors and isinstance(errors[0], BaseException)
+    assert client.files == {}
+
+def _until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert condition()
+
+async def _until_async(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+    assert condition()
+
+def _capture(fn, *args):
+    try:
+        return fn(*args)
+    except BaseException as e:
+        return e
+
+def test_uploads_audio_only_copy(media, tmp_path, monkeypatch):
+    compressed = tmp_path / "rec0.audio.mp3"
+    compressed.write_bytes(b"small")
+    monkeypatch.setattr(gemini, "ensure_compressed", lambda path: str(compressed))
+    client = FakeGenai(latency=0.01)
+    provider = _provider(client, audio_only=True)
+
+    assert asyncio.run(provider.atranscribe(media[0])) == "transcript of rec0.audio.mp3"
+
+def test_falls_back_to_original_if_extraction_fails(media, monkeypatch):
+    def fail(path):
+        raise RuntimeError("no audio stream")
+    monkeypatch.setattr(gemini, "ensure_compressed", fail)
+    client = FakeGenai(latency=0.01)
+    provider = _provider(client, audio_only=True)
+
+    assert asyncio.run(provider.atranscribe(media[0])) == "transcript of rec0.mp3"
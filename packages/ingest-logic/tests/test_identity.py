@@ -0,0 +1,85 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.people.identity import (
+    COMPACT_ID_LENGTH,
+    base36_to_int,
+    decode_person_id,
+    generate_person_id,
+    get_shard_path,
+    int_to_base36,
+    verify_person_id,
+)
+from ingest_logic.people.manager import PersonManager
+
+def naive_base36(n: int) -> str:
+    chars = "0123456789abcdefghijklmnopqrstuvwxyz"
+    out = []
+    while True:
+        n, r = divmod(n, 36)
+        out.append(chars[r])
+        if n == 0:
+            return "".join(reversed(out))
+
+@pytest.mark.parametrize("bits", [0, 1, 5, 64, 159, 495, 496, 497, 1000, 2048, 5000, 20000])
+def test_int_to_base36_matches_naive(bits):
+    rng = random.Random(bits)
+    for n in (2 ** bits - 1, 2 ** bits, rng.getrandbits(bits) if bits else 0, 36 ** (bits // 5)):
+        assert int_to_base36(n) == naive_base36(n)
+
+def test_base36_round_trip_beyond_int_digit_limit():
+    # int(s, 36) refuses strings over 4300 digits on Python >= 3.11
+    n = random.Random(1).getrandbits(40000)
+    s = int_to_base36(n)
+    assert len(s) > 4300
+    assert base36_to_int(s) == n
+    assert base36_to_int("0") == 0
+
+@pytest.mark.parametrize("bad", ["", "ABC", "a-b", " 12"])
+def test_base36_to_int_rejects_non_base36(bad):
+    with pytest.raises(ValueError):
+        base36_to_int(bad)
+
+def test_int_to_base36_rejects_negative():
+    with pytest.raises(ValueError):
+        int_to_base36(-1)
+
+def test_legacy_ids_are_unchanged():
+    person_id = generate_person_id("Doe", "Jane", "", "1950-01-01")
+    assert person_id == "7zs7i5xpzlnj3tqzq6k9s6xxcr0dw6p"
+    assert decode_person_id(person_id) == "Doe|Jane||1950-01-01"
+    assert generate_person_id(" Doe ", "Jane", None, "1950-01-01") == person_id
+
+def test_legacy_id_of_long_name_decodes():
+    given = " ".join(["Ødegård"] * 300)
+    person_id = generate_person_id("Family", given, "Jr", "1901-02-03")
+    assert decode_person_id(person_id) == f"Family|{given}|Jr|1901-02-03"
+
+def test_compact_ids_are_fixed_length_and_stable():
+    ids = set()
+    for given in ("Jane", "John", "J" * 5000):
+        person_id = generate_person_id("Doe", given, "", "1950-01-01", scheme="compact")
+        assert len(person_id) == COMPACT_ID_LENGTH
+        assert person_id == generate_person_id("Doe", given, "", "1950-01-01", scheme="compact")
+        assert verify_person_id(person_id, "Doe", given, "", "1950-01-01")
+        assert not verify_person_id(person_id, "Roe", given, "", "1950-01-01")
+        ids.add(person_id)
+    assert len(ids) == 3
+
+def test_unknown_scheme_is_rejected():
+    with pytest.raises(ValueError, match="Unknown ID scheme"):
+        generate_person_id("Doe", "Jane", "", "1950-01-01", scheme="uuid")
+
+def test_compact_scheme_manager(tmp_path):
+    manager = PersonManager(str(tmp_path), id_scheme="compact")
+    person = manager.create_person("Doe", "Jane", "1950-01-01")
+    assert len(person.id) == COMPACT_ID_LENGTH
+    assert person.slug == f"{get_shard_path(person.id)}/Doe,_Jane--{person.id}"
+    assert manager.get_person_by_id(person.id).id == person.id
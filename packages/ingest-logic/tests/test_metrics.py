@@ -0,0 +1,115 @@
+import asyncio
+import pytest
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.common import metrics
+from ingest_logic.common.fs_utils import write_safe
+from ingest_logic.common.yaml_utils import load_yaml_fast, save_yaml
+
+@pytest.fixture
+def enabled():
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+def stage_count(stage):
+    return metrics.STAGE_SECONDS.count(stage=stage)
+
+def test_disabled_records_nothing():
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+    @metrics.timed("test.disabled")
+    def work():
+        return 42
+
+    assert work() == 42
+    with metrics.timer("test.disabled"):
+        pass
+    metrics.STAGE_ERRORS.inc(stage="test.disabled")
+
+    assert stage_count("test.disabled") == 0
+    assert metrics.STAGE_ERRORS.value(stage="test.disabled") == 0
+    assert "test.disabled" not in metrics.REGISTRY.render()
+
+def test_timer_and_decorator(enabled):
+    @metrics.timed("test.decorated")
+    def work(x):
+        return x * 2
+
+    assert work(2) == 4
+    assert work.__name__ == "work"
+    with metrics.timer("test.block"):
+        pass
+
+    assert stage_count("test.decorated") == 1
+    assert stage_count("test.block") == 1
+
+def test_async_decorator(enabled):
+    @metrics.timed("test.async")
+    async def work():
+        await asyncio.sleep(0)
+        return "ok"
+
+    assert asyncio.run(work()) == "ok"
+    assert stage_count("test.async") == 1
+
+def test_errors_are_counted_and_reraised(enabled):
+    @metrics.timed("test.fails")
+    def fails():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        fails()
+    assert stage_count("test.fails") == 1
+    assert metrics.STAGE_ERRORS.value(stage="test.fails") == 1
+
+def test_instrumented_io_stages(enabled, tmp_path):
+    path = str(tmp_path / "bio.yaml")
+    save_yaml(path, {"name": "Ada"})
+    write_safe(str(tmp_path / "notes.txt"), "hi")
+    assert load_yaml_fast(path) == {"name": "Ada"}
+
+    assert stage_count("yaml.save") == 1
+    assert stage_count("yaml.load_fast") == 1
+    assert stage_count("fs.write_safe") == 2
+    assert stage_count("fs.fsync") == 2
+    assert stage_count("fs.fsync_dir") == 2
+
+def test_render_prometheus_text():
+    registry = metrics.Registry()
+    hist = registry.histogram("op_seconds", "Op latency.", ["op"], buckets=(0.1, 1.0))
+    counter = registry.counter("ops_total", "Ops.", ["op"])
+    metrics.enable()
+    try:
+        hist.observe(0.05, op="a")
+        hist.observe(0.5, op="a")
+        hist.observe(5.0, op="a")
+        counter.inc(op='say "hi"\n')
+    finally:
+        metrics.disable()
+
+    lines = registry.render().splitlines()
+    assert "# TYPE op_seconds histogram" in lines
+    # Buckets are cumulative and end with +Inf == count
+    assert 'op_seconds_bucket{op="a",le="0.1"} 1' in lines
+    assert 'op_seconds_bucket{op="a",le="1.0"} 2' in lines
+    assert 'op_seconds_bucket{op="a",le="+Inf"} 3' in lines
+    assert 'op_seconds_count{op="a"} 3' in lines
+    assert 'op_seconds_sum{op="a"} 5.55' in lines
+    assert "# TYPE ops_total counter" in lines
+    assert 'ops_total{op="say \\"hi\\"\\n"} 1' in lines
+
+def test_registry_returns_existing_metric():
+    registry = metrics.Registry()
+    first = registry.counter("things_total", "Things.")
+    assert registry.counter("things_total", "Things.") is first
+    with pytest.raises(ValueError):
+        registry.histogram("things_total", "Things.")
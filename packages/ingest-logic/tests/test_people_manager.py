@@ -1,5 +1,6 @@
 import pytest
 import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -82,3 +83,124 @@ def test_corrupt_data_handling(person_manager, tmp_path):
     # Our implementation had a broad try/except pass for list.
     people = person_manager.list_people()
     assert len(people) == 0
+
+def test_get_person_cache_hits_until_file_changes(person_manager, monkeypatch):
+    """Repeated get_person calls are served from cache while stat matches."""
+    p = person_manager.create_person("Cache", "Me", "1999-09-09")
+
+    first = person_manager.get_person(p.slug)
+    assert person_manager.cache_info()["misses"] == 1
+
+    import ingest_logic.people.manager as manager_module
+    def fail(path):
+        raise AssertionError("cached person was reparsed")
+    monkeypatch.setattr(manager_module, "load_yaml_fast", fail)
+
+    second = person_manager.get_person(p.slug)
+    assert person_manager.cache_info()["hits"] == 1
+    assert second == first
+    assert second is not first  # callers get their own copy
+
+    monkeypatch.undo()
+
+    # save_person invalidates, so the next read reparses the new content
+    second.bio = "Updated"
+    person_manager.save_person(second)
+    assert person_manager.get_person(p.slug).bio == "Updated"
+    assert person_manager.cache_info()["misses"] == 2
+
+def test_get_person_cache_evicts_lru(tmp_path):
+    pm = PersonManager(str(tmp_path), cache_size=2)
+    slugs = [pm.create_person("Evict", name, "2001-01-01").slug for name in ("A", "B", "C")]
+
+    for slug in slugs:
+        pm.get_person(slug)
+
+    info = pm.cache_info()
+    assert info["size"] == 2
+    assert info["evictions"] == 1
+
+def test_iter_people_ordered_and_unordered(person_manager):
+    created = [person_manager.create_person("Iter", f"N{i}", "2010-01-01") for i in range(12)]
+    expected = sorted(p.slug for p in created)
+
+    ordered = [p.slug for p in person_manager.iter_people(ordered=True, max_workers=3)]
+    assert ordered == expected
+
+    unordered = [p.slug for p in person_manager.iter_people(ordered=False, max_workers=3)]
+    assert sorted(unordered) == expected
+
+def test_iter_people_reports_bad_files(person_manager, tmp_path):
+    good = person_manager.create_person("Good", "One", "2010-01-01")
+    bad_dir = tmp_path / "people" / "zz" / "zz" / "bad--zzzz"
+    bad_dir.mkdir(parents=True)
+    (bad_dir / "bio.yaml").write_text('id: "zzzz"\n')
+
+    errors = []
+    people = list(person_manager.iter_people(on_error=lambda slug, e: errors.append(slug)))
+
+    assert [p.slug for p in people] == [good.slug]
+    assert errors == [os.path.join("zz", "zz", "bad--zzzz")]
+
+def test_save_people_group_commit(person_manager, tmp_path):
+    """save_people writes every bio.yaml through one SafeWriteBatch."""
+    people = [
+        Person(
+            id=f"bulk{i}",
+            names=[{"type": "primary", "given": f"N{i}", "surname": "Bulk"}],
+            vitals={"birth": {"date": "2000-01-01"}},
+        )
+        for i in range(5)
+    ]
+
+    assert person_manager.save_people(people) == 5
+    assert sorted(p.slug for p in person_manager.list_people()) == sorted(p.slug for p in people)
+    assert list(tmp_path.rglob("*.tmp")) == []
+
+def test_get_person_by_id_after_save(person_manager, monkeypatch):
+    p = person_manager.create_person("Ident", "Ity", "1970-07-07")
+
+    # The save recorded the folder: no directory listing needed
+    monkeypatch.setattr(os, "scandir", lambda path: pytest.fail(f"listed {path}"))
+    found = person_manager.get_person_by_id(p.id)
+    assert found.slug == p.slug
+    assert found.display_name == "Ident, Ity"
+
+def test_get_person_by_id_lists_only_its_shard(tmp_path, monkeypatch):
+    writer = PersonManager(str(tmp_path))
+    a = writer.create_person("Shard", "Alpha", "1980-01-01")
+    b = writer.create_person("Shard", "Bravo", "1980-01-01")
+    # Same length and leading bytes, same shard
+    assert os.path.dirname(a.slug) == os.path.dirname(b.slug)
+
+    # A fresh manager (e.g. after a restart) knows no IDs yet
+    reader = PersonManager(str(tmp_path))
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(path) or real_scandir(path))
+
+    assert reader.get_person_by_id(a.id).slug == a.slug
+    assert listed == [os.path.join(reader.people_dir, os.path.dirname(a.slug))]
+    # Siblings seen in that listing need no second read
+    assert reader.get_person_by_id(b.id).slug == b.slug
+    assert len(listed) == 1
+
+def test_get_person_by_id_missing_and_invalid(person_manager):
+    p = person_manager.create_person("Gone", "Soon", "1999-09-09")
+    assert person_manager.get_person_by_id("zzzzzzzz") is None
+
+    shutil.rmtree(os.path.join(person_manager.people_dir, p.slug))
+    assert person_manager.get_person_by_id(p.id) is None
+
+    for bad in ("", "../etc", "ab/cd", "a--b", "ABC"):
+        with pytest.raises(ValueError):
+            person_manager.get_person_by_id(bad)
+
+def test_get_person_by_id_reports_corrupt_data(person_manager):
+    from ingest_logic.people.manager import PersonDataError
+
+    p = person_manager.create_person("Bad", "Data", "1999-09-09")
+    with open(os.path.join(person_manager.people_dir, p.slug, "bio.yaml"), "w") as f:
+        f.write("names: [unclosed\n")
+    with pytest.raises(PersonDataError, match="Data corruption"):
+        person_manager.get_person_by_id(p.id)
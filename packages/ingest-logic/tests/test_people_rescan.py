@@ -0,0 +1,97 @@
+import pytest
+import os
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.index import ArchiveIndex
+from ingest_logic.people.manager import PersonManager
+from ingest_logic.people.scan import iter_bio_files
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ArchiveIndex(str(tmp_path / "config" / "index.sqlite3"))
+    yield idx
+    idx.close()
+
+@pytest.fixture
+def person_manager(tmp_path, index):
+    return PersonManager(str(tmp_path / "archive"), index=index)
+
+def test_iter_bio_files_skips_person_subdirs(person_manager):
+    p = person_manager.create_person("Walk", "Er", "1980-01-01")
+    # Files inside a person directory must not be walked
+    rec_dir = Path(person_manager.people_dir) / p.slug / "recordings" / "video"
+    rec_dir.mkdir(parents=True)
+    (rec_dir / "bio.yaml").write_text("not a person")
+
+    found = list(iter_bio_files(person_manager.people_dir))
+    assert [b.slug for b in found] == [p.slug]
+
+def test_rescan_unchanged_does_not_parse(person_manager, monkeypatch):
+    person_manager.create_person("Still", "Here", "1970-07-07")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("unchanged file was reparsed")
+    monkeypatch.setattr(person_manager, "load_person_file", fail)
+
+    counts = person_manager.refresh_index()
+    assert counts["unchanged"] == 1
+    assert counts["added"] == counts["changed"] == counts["deleted"] == 0
+
+def test_rescan_picks_up_external_edits(person_manager):
+    p = person_manager.create_person("Edit", "Me", "1960-06-06")
+    bio = Path(person_manager.people_dir) / p.slug / "bio.yaml"
+
+    # Hand-edit the YAML outside the app
+    bio.write_text(bio.read_text().replace("bio: ''", "bio: Handwritten note"))
+    st = bio.stat()
+    os.utime(bio, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    counts = person_manager.refresh_index()
+    assert counts["changed"] == 1
+    assert [r.slug for r in person_manager.search_people("handwritten")] == [p.slug]
+
+def test_rescan_adds_and_deletes(tmp_path, person_manager, index):
+    keep = person_manager.create_person("Keep", "Me", "1950-01-01")
+    gone = person_manager.create_person("Gone", "Soon", "1950-02-02")
+
+    # Person copied in by another tool, unknown to the index
+    other = PersonManager(str(tmp_path / "archive"))
+    added = other.create_person("New", "Comer", "1950-03-03")
+
+    # Person removed from disk behind the app's back
+    (Path(person_manager.people_dir) / gone.slug / "bio.yaml").unlink()
+
+    counts = person_manager.refresh_index()
+    assert counts["added"] == 1
+    assert counts["deleted"] == 1
+    assert counts["unchanged"] == 1
+    assert sorted(p.slug for p in person_manager.list_people()) == sorted([keep.slug, added.slug])
+    assert set(index.get_file_states()) == {keep.slug, added.slug}
+
+def test_save_people_commits_the_index_once(person_manager, index, monkeypatch):
+    from contextlib import contextmanager
+
+    commits = []
+    real_transaction = index.transaction
+
+    @contextmanager
+    def counting_transaction():
+        outer = index._tx_depth == 0
+        with real_transaction() as tx:
+            yield tx
+        if outer:
+            commits.append(1)
+
+    people = [person_manager.build_person("Batch", f"N{i}", "2000-01-01") for i in range(20)]
+    monkeypatch.setattr(index, "transaction", counting_transaction)
+    assert person_manager.save_people(people) == 20
+    assert len(commits) == 1
+
+    assert len(index.list_people()) == 20
+    # File states were recorded too: a rescan finds nothing to reparse
+    assert person_manager.refresh_index()["unchanged"] == 20
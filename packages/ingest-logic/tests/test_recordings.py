@@ -0,0 +1,125 @@
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.common.yaml_utils import load_yaml, save_yaml
+from ingest_logic.index import ArchiveIndex
+from ingest_logic.people.manager import PersonManager
+from ingest_logic.recordings import RecordingManager, hash_file
+
+@pytest.fixture
+def index(tmp_path):
+    idx = ArchiveIndex(str(tmp_path / "config" / "index.sqlite3"))
+    yield idx
+    idx.close()
+
+@pytest.fixture
+def person(tmp_path):
+    return PersonManager(str(tmp_path / "archive")).create_person("Rec", "Order", "1940-04-04")
+
+def add_recording(tmp_path, slug, filename, data, with_hash=True):
+    rec_dir = tmp_path / "archive" / "people" / slug / "recordings" / "video"
+    rec_dir.mkdir(parents=True, exist_ok=True)
+    media = rec_dir / filename
+    media.write_bytes(data)
+    meta = {"original_filename": filename, "content_type": "video/mp4", "ingest_status": "transcribed"}
+    if with_hash:
+        meta["sha256"], meta["size_bytes"] = hash_file(str(media))
+    meta_path = rec_dir / f"{media.stem}.yaml"
+    save_yaml(str(meta_path), meta)
+    return str(meta_path), meta.get("sha256")
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_find_duplicate(tmp_path, index, person, indexed):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index if indexed else None)
+    meta_path, sha = add_recording(tmp_path, person.slug, "a.mp4", b"frames")
+    if indexed:
+        rm.refresh_index()
+
+    assert rm.find_duplicate(sha) == meta_path
+    assert rm.find_duplicate("0" * 64) is None
+
+    # A recording whose media is gone is not a duplicate target
+    (Path(meta_path).parent / "a.mp4").unlink()
+    assert rm.find_duplicate(sha) is None
+
+def test_add_reference_is_idempotent(tmp_path, index, person):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index)
+    meta_path, _ = add_recording(tmp_path, person.slug, "a.mp4", b"frames")
+
+    # Re-importing the recording itself is a no-op
+    assert not rm.add_reference(meta_path, person.slug, "a.mp4")
+    assert rm.add_reference(meta_path, "someone--else", "copy.mp4")
+    assert not rm.add_reference(meta_path, "someone--else", "copy.mp4")
+
+    refs = load_yaml(meta_path)["references"]
+    assert [dict(r) for r in refs] == [{"person_slug": "someone--else", "original_filename": "copy.mp4"}]
+
+def test_concurrent_metadata_updates_are_not_lost(tmp_path, index, person):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index)
+    meta_path, _ = add_recording(tmp_path, person.slug, "a.mp4", b"frames")
+
+    def set_status(meta):
+        meta["ingest_status"] = "transcribed"
+        return True
+
+    def reimport(n):
+        for i in range(10):
+            rm.add_reference(meta_path, f"person-{n}", f"copy-{i}.mp4")
+            rm.update_metadata(meta_path, set_status)
+
+    threads = [threading.Thread(target=reimport, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    meta = load_yaml(meta_path)
+    assert meta["ingest_status"] == "transcribed"
+    assert len(meta["references"]) == 40
+    assert not Path(meta_path + ".tmp").exists()
+
+def test_update_metadata_of_missing_file(tmp_path, index):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index)
+    assert rm.update_metadata(str(tmp_path / "gone.yaml"), lambda meta: True) is None
+
+def test_refresh_index_tracks_changes(tmp_path, index, person):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index)
+    meta_a, sha_a = add_recording(tmp_path, person.slug, "a.mp4", b"aaa")
+    assert rm.refresh_index()["added"] == 1
+
+    meta_b, sha_b = add_recording(tmp_path, person.slug, "b.mp4", b"bbb")
+    Path(meta_a).unlink()
+    counts = rm.refresh_index()
+    assert (counts["added"], counts["deleted"]) == (1, 1)
+    assert index.find_recordings(sha_a) == []
+    assert len(index.find_recordings(sha_b)) == 1
+
+def test_backfill_hashes(tmp_path, index, person):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index)
+    meta_path, _ = add_recording(tmp_path, person.slug, "old.mp4", b"legacy", with_hash=False)
+
+    assert rm.backfill_hashes() == 1
+    meta = load_yaml(meta_path)
+    assert meta["size_bytes"] == 6
+    assert rm.find_duplicate(meta["sha256"]) == meta_path
+    assert rm.backfill_hashes() == 0
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_pending_transcriptions(tmp_path, index, person, indexed):
+    rm = RecordingManager(str(tmp_path / "archive"), index=index if indexed else None)
+    done_meta, _ = add_recording(tmp_path, person.slug, "done.mp4", b"1")
+    pending_meta, _ = add_recording(tmp_path, person.slug, "todo.mp4", b"2")
+    meta = load_yaml(pending_meta)
+    meta["ingest_status"] = "pending_transcription"
+    save_yaml(pending_meta, meta)
+    if indexed:
+        rm.refresh_index()
+
+    media = str(Path(pending_meta).parent / "todo.mp4")
+    assert list(rm.pending_transcriptions()) == [(media, pending_meta)]
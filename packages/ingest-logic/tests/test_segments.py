@@ -0,0 +1,62 @@
+import pytest
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription.segments import Segment, Transcript, plan_segments, stitch, to_vtt
+
+np = pytest.importorskip("numpy")
+
+SR = 16000
+
+def _speech(seconds):
+    t = np.arange(int(seconds * SR), dtype=np.float32) / SR
+    return (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SR), dtype=np.float32)
+
+def test_short_audio_is_one_segment():
+    audio = _speech(30)
+    assert plan_segments(audio, SR, max_seconds=60) == [(0, len(audio))]
+
+def test_cuts_land_in_pauses_and_respect_max_length():
+    audio = np.concatenate([_speech(55), _silence(1), _speech(40), _silence(1), _speech(50)])
+    spans = plan_segments(audio, SR, max_seconds=60, search_seconds=25)
+
+    # Contiguous, complete, bounded
+    assert spans[0][0] == 0 and spans[-1][1] == len(audio)
+    assert all(a[1] == b[0] for a, b in zip(spans, spans[1:]))
+    assert all(end - start <= 60 * SR for start, end in spans)
+
+    cuts = [start / SR for start, _ in spans[1:]]
+    assert len(cuts) == 2
+    assert 55 <= cuts[0] <= 56
+    assert 96 <= cuts[1] <= 97
+
+def test_no_pause_cuts_at_the_limit_region():
+    audio = _speech(150)
+    spans = plan_segments(audio, SR, max_seconds=60)
+    assert len(spans) == 3
+    assert all(end - start <= 60 * SR for start, end in spans)
+
+def test_stitch_shifts_segments_and_joins_text():
+    parts = [
+        (0.0, Transcript(" Hello there.", [Segment(0.0, 2.0, " Hello there.")])),
+        (60.0, Transcript("", [])),
+        (90.5, Transcript(" Goodbye.", [Segment(1.0, 2.5, " Goodbye.")])),
+    ]
+    result = stitch(parts)
+    assert result.text == "Hello there. Goodbye."
+    assert result.segments == [Segment(0.0, 2.0, " Hello there."), Segment(91.5, 93.0, " Goodbye.")]
+
+def test_to_vtt():
+    vtt = to_vtt([Segment(0.0, 2.5, " Hi."), Segment(3661.25, 3662.0, "Bye")])
+    assert vtt == (
+        "WEBVTT\n\n"
+        "00:00:00.000 --> 00:00:02.500\nHi.\n\n"
+        "01:01:01.250 --> 01:01:02.000\nBye\n"
+    )
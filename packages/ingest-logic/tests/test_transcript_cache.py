@@ -0,0 +1,97 @@
+import os
+import pytest
+import sys
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription.base import TranscriptionProvider
+from ingest_logic.transcription.cache import TranscriptCache
+from ingest_logic.transcription.manager import TranscriptionManager
+from ingest_logic.transcription.segments import Segment, Transcript
+
+SHA = "a" * 64
+
+@pytest.fixture
+def cache(tmp_path):
+    c = TranscriptCache(str(tmp_path / "cache.sqlite3"))
+    yield c
+    c.close()
+
+def test_roundtrip_and_key_parts(cache):
+    transcript = Transcript("Hallo Welt", [Segment(0.0, 1.5, " Hallo"), Segment(1.5, 2.0, " Welt")])
+    cache.put(SHA, "local", "base", transcript)
+
+    assert cache.get(SHA, "local", "base") == transcript
+    # Every key part matters
+    assert cache.get("b" * 64, "local", "base") is None
+    assert cache.get(SHA, "gemini", "base") is None
+    assert cache.get(SHA, "local", "small") is None
+    assert cache.get(SHA, "local", "base", prompt_version="2") is None
+
+    stats = cache.stats()
+    assert stats["entries"] == 1
+    assert stats["hits"] == 1 and stats["misses"] == 4
+    assert stats["by_provider"] == {"local": 1}
+
+def test_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    first = TranscriptCache(path)
+    first.put(SHA, "local", "base", Transcript("text", []))
+    first.close()
+
+    second = TranscriptCache(path)
+    assert second.get(SHA, "local", "base") == Transcript("text", [])
+    second.close()
+
+def test_evicts_least_recently_used_over_cap(tmp_path):
+    cache = TranscriptCache(str(tmp_path / "cache.sqlite3"))
+    # Random text so entries don't compress away
+    texts = {i: os.urandom(600).hex() for i in range(3)}
+    for i in range(3):
+        cache.put(str(i) * 64, "local", "base", Transcript(texts[i], []))
+    entry_size = cache.stats()["bytes"] // 3
+
+    # Touch 0 so 1 is the least recently used, then shrink the cap
+    assert cache.get("0" * 64, "local", "base") is not None
+    cache.max_bytes = entry_size * 2 + entry_size // 2
+    cache.put("3" * 64, "local", "base", Transcript(os.urandom(600).hex(), []))
+
+    assert cache.get("1" * 64, "local", "base") is None
+    assert cache.get("2" * 64, "local", "base") is None
+    assert cache.get("0" * 64, "local", "base") is not None
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["evictions"] == 2
+    assert stats["bytes"] <= cache.max_bytes
+    cache.close()
+
+class CountingProvider(TranscriptionProvider):
+    model_name = "fake-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, file_path):
+        self.calls += 1
+        return f"transcript {self.calls}"
+
+def test_manager_checks_cache_before_provider(tmp_path, cache, monkeypatch):
+    provider = CountingProvider()
+    monkeypatch.setattr(TranscriptionManager, "_get_provider", lambda self: provider)
+    manager = TranscriptionManager("fake", cache=cache)
+
+    media = tmp_path / "a.wav"
+    media.write_bytes(b"audio bytes")
+    assert manager.transcribe(str(media)) == "transcript 1"
+    # Same content under another name: hashed and found
+    copy = tmp_path / "copy.wav"
+    copy.write_bytes(b"audio bytes")
+    assert manager.transcribe(str(copy)) == "transcript 1"
+    assert provider.calls == 1
+
+    # A new prompt version is a different result
+    provider.prompt_version = "2"
+    assert manager.transcribe(str(media)) == "transcript 2"
+    assert provider.calls == 2
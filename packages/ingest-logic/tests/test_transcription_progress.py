@@ -0,0 +1,80 @@
+import asyncio
+import pytest
+import sys
+import threading
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription.progress import PartialTranscript, ProgressTracker
+from ingest_logic.transcription.segments import Segment, to_vtt
+
+def test_partial_transcript_grows_as_valid_vtt(tmp_path):
+    path = tmp_path / "talk.partial.vtt"
+    partial = PartialTranscript(str(path))
+    partial.append([])
+    assert not path.exists()
+
+    first = [Segment(0.0, 2.0, " One.")]
+    second = [Segment(2.0, 4.0, " Two."), Segment(4.0, 5.0, " Three.")]
+    partial.append(first)
+    assert path.read_text() == to_vtt(first)
+    partial.append(second)
+    assert path.read_text() == to_vtt(first + second)
+
+    partial.discard()
+    assert not path.exists()
+    partial.discard()  # Idempotent
+
+def test_partial_transcript_replaces_stale_file(tmp_path):
+    path = tmp_path / "talk.partial.vtt"
+    path.write_text("left over from a crashed run")
+    partial = PartialTranscript(str(path))
+    partial.append([Segment(0.0, 1.0, "Fresh")])
+    assert path.read_text() == to_vtt([Segment(0.0, 1.0, "Fresh")])
+
+def test_tracker_state():
+    tracker = ProgressTracker()
+    tracker.add_segments(1, [Segment(0, 1, "ignored")], 1.0, 10.0)  # Not started
+    assert tracker.get(1) is None
+
+    tracker.start(1, "/a.mp3")
+    tracker.add_segments(1, [Segment(0, 1, " a")], 30.0, 120.0)
+    tracker.add_segments(1, [Segment(1, 2, f" {i}") for i in range(6)], 60.0, 120.0)
+    state = tracker.get(1)
+    assert state["status"] == "running"
+    assert state["percent"] == 50.0
+    assert state["segments"] == 7
+    assert state["recent"] == ["1", "2", "3", "4", "5"]
+
+    tracker.finish(1)
+    assert tracker.get(1)["status"] == "done" and tracker.get(1)["percent"] == 100.0
+    tracker.start(2, "/b.mp3")
+    tracker.finish(2, error="boom")
+    assert tracker.get(2)["status"] == "failed" and tracker.get(2)["error"] == "boom"
+
+def test_subscribers_receive_updates_from_worker_threads():
+    tracker = ProgressTracker()
+
+    async def run():
+        state, updates = tracker.subscribe(7)
+        assert state is None
+
+        def work():
+            tracker.start(7, "/a.mp3")
+            tracker.add_segments(7, [Segment(0, 5, "hi")], 5.0, 10.0)
+            tracker.finish(7)
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        received = [await asyncio.wait_for(updates.get(), 5) for _ in range(3)]
+        thread.join()
+        tracker.unsubscribe(7, updates)
+        return received
+
+    received = asyncio.run(run())
+    assert [s["status"] for s in received] == ["running", "running", "done"]
+    assert received[1]["percent"] == 50.0
+    assert tracker._subscribers == {}
@@ -0,0 +1,100 @@
+import pytest
+import sys
+import threading
+import time
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription.queue import TranscriptionQueue, parse_provider_limits
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("timed out")
+        time.sleep(0.01)
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "jobs.sqlite3")
+
+def test_jobs_run_and_record_outcome(db_path):
+    def handler(job):
+        if job.media_path.endswith("bad.mp4"):
+            raise RuntimeError("decoder exploded")
+
+    queue = TranscriptionQueue(db_path, handler, workers=2)
+    queue.start()
+    good = queue.enqueue("/a/good.mp4", "/a/good.yaml", "local")
+    bad = queue.enqueue("/a/bad.mp4", "/a/bad.yaml", "local")
+    wait_until(lambda: queue.stats()["jobs"]["queued"] + queue.stats()["jobs"]["running"] == 0)
+    queue.close()
+
+    reopened = TranscriptionQueue(db_path, handler)
+    assert reopened.get(good.id).status == "done"
+    failed = reopened.get(bad.id)
+    assert failed.status == "failed"
+    assert failed.error == "decoder exploded"
+    reopened.close()
+
+def test_enqueue_deduplicates_pending_jobs(db_path):
+    queue = TranscriptionQueue(db_path, lambda job: None)
+    first = queue.enqueue("/a/x.mp4", "/a/x.yaml", "local")
+    again = queue.enqueue("/a/x.mp4", "/a/x.yaml", "local")
+    assert again.id == first.id
+    assert queue.stats()["depth"] == 1
+    queue.close()
+
+def test_interrupted_jobs_are_requeued(db_path):
+    queue = TranscriptionQueue(db_path, lambda job: None)
+    job = queue.enqueue("/a/x.mp4", "/a/x.yaml", "local")
+    # Simulate a crash while the job was running
+    with queue._lock:
+        queue._conn.execute("UPDATE jobs SET status = 'running' WHERE id = ?", (job.id,))
+        queue._conn.commit()
+    queue.close()
+
+    ran = []
+    restarted = TranscriptionQueue(db_path, lambda job: ran.append(job.id))
+    assert restarted.start() == 1
+    wait_until(lambda: restarted.get(job.id).status == "done")
+    assert ran == [job.id]
+    restarted.close()
+
+def test_provider_limit_caps_concurrency(db_path):
+    lock = threading.Lock()
+    active = {"local": 0, "gemini": 0}
+    peak = {"local": 0, "gemini": 0}
+    release = threading.Event()
+
+    def handler(job):
+        with lock:
+            active[job.provider] += 1
+            peak[job.provider] = max(peak[job.provider], active[job.provider])
+        release.wait(5)
+        with lock:
+            active[job.provider] -= 1
+
+    queue = TranscriptionQueue(db_path, handler, workers=4, provider_limits={"local": 1})
+    for i in range(3):
+        queue.enqueue(f"/a/local{i}.mp4", f"/a/local{i}.yaml", "local")
+        queue.enqueue(f"/a/gemini{i}.mp4", f"/a/gemini{i}.yaml", "gemini")
+    queue.start()
+
+    # One local job plus three gemini jobs fill the four workers
+    wait_until(lambda: queue.stats()["running_by_provider"] == {"local": 1, "gemini": 3})
+    release.set()
+    wait_until(lambda: queue.stats()["jobs"]["done"] == 6)
+    assert peak == {"local": 1, "gemini": 3}
+    queue.close()
+
+def test_parse_provider_limits():
+    assert parse_provider_limits("local=1, gemini=4") == {"local": 1, "gemini": 4}
+    assert parse_provider_limits("") == {}
+    with pytest.raises(ValueError):
+        parse_provider_limits("local")
+    with pytest.raises(ValueError):
+        parse_provider_limits("local=0")
@@ -0,0 +1,99 @@
+import os
+import pytest
+import subprocess
+import sys
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription import registry
+from ingest_logic.transcription.base import TranscriptionProvider
+from ingest_logic.transcription.manager import TranscriptionManager
+
+class FakeProvider(TranscriptionProvider):
+    model_name = "fake-1"
+
+    def __init__(self):
+        self.closed = False
+
+    def transcribe(self, file_path: str) -> str:
+        return f"text of {os.path.basename(file_path)}"
+
+    def close(self) -> None:
+        self.closed = True
+
+@pytest.fixture
+def fake_registered():
+    created = []
+
+    def factory():
+        created.append(FakeProvider())
+        return created[-1]
+
+    registry.register_provider("fake", factory)
+    yield created
+    registry.unregister_provider("fake")
+
+def test_manager_creates_provider_on_first_use(fake_registered):
+    manager = TranscriptionManager("fake")
+    assert fake_registered == []
+
+    assert manager.transcribe_timed("/x/a.wav").text == "text of a.wav"
+    assert manager.transcribe_timed("/x/b.wav").text == "text of b.wav"
+    assert len(fake_registered) == 1
+
+    manager.close()
+    assert fake_registered[0].closed
+
+def test_close_without_use_creates_nothing(fake_registered):
+    TranscriptionManager("fake").close()
+    assert fake_registered == []
+
+def test_unknown_provider(monkeypatch):
+    monkeypatch.setattr(registry, "_entry_points", lambda: [])
+    with pytest.raises(ValueError, match="Unknown transcription provider"):
+        registry.create_provider("nope")
+    with pytest.raises(ValueError):
+        TranscriptionManager("nope").start()
+
+def test_entry_point_plugin_loaded_only_when_selected(tmp_path, monkeypatch):
+    (tmp_path / "acme_plugin.py").write_text(
+        "from ingest_logic.transcription.base import TranscriptionProvider\n"
+        "class AcmeProvider(TranscriptionProvider):\n"
+        "    def transcribe(self, file_path):\n"
+        "        return 'acme'\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    ep = EntryPoint(name="acme", value="acme_plugin:AcmeProvider", group=registry.ENTRY_POINT_GROUP)
+    monkeypatch.setattr(registry, "_entry_points", lambda: [ep])
+
+    assert "acme" in registry.available_providers()
+    assert {"local", "gemini"} <= set(registry.available_providers())
+    assert "acme_plugin" not in sys.modules
+
+    try:
+        assert registry.create_provider("acme").transcribe("x") == "acme"
+    finally:
+        registry.unregister_provider("acme")
+        sys.modules.pop("acme_plugin", None)
+
+def test_import_does_not_load_providers():
+    """Importing the package and building a manager stays free of provider dependencies."""
+    code = (
+        "import sys\n"
+        "from ingest_logic.transcription import TranscriptionManager\n"
+        "TranscriptionManager('gemini'); TranscriptionManager('local')\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    loaded = set(result.stdout.split())
+
+    for heavy in ("torch", "whisper", "numpy", "google.generativeai", "pydantic"):
+        assert heavy not in loaded
+    for provider in ("gemini", "local_whisper", "whisper_pool"):
+        assert f"ingest_logic.transcription.{provider}" not in loaded
@@ -0,0 +1,139 @@
+import pytest
+import hashlib
+import os
+import sys
+import time
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.recordings.uploads import (
+    UploadBusy,
+    UploadCorrupt,
+    UploadNotFound,
+    UploadOffsetMismatch,
+    UploadSessionStore,
+)
+
+DATA = os.urandom(10_000)
+
+@pytest.fixture
+def store(tmp_path):
+    return UploadSessionStore(str(tmp_path))
+
+def send(store, session_id, offset, data):
+    writer = store.open_chunk(session_id, offset)
+    writer.write(data)
+    return writer.commit()
+
+def test_chunks_resume_after_restart(tmp_path, store):
+    session = store.create("some--person", "clip.mp4", "video/mp4", len(DATA))
+    assert send(store, session.id, 0, DATA[:4000]).offset == 4000
+
+    # A new store (process restart) picks the session up from disk
+    restarted = UploadSessionStore(str(tmp_path))
+    assert restarted.get(session.id).offset == 4000
+    send(restarted, session.id, 4000, DATA[4000:])
+
+    with restarted.complete(session.id) as done:
+        assert done.session.offset == len(DATA)
+        assert Path(done.part_path).read_bytes() == DATA
+        assert done.written.sha256 == hashlib.sha256(DATA).hexdigest()
+        assert done.written.size == len(DATA)
+
+def test_offset_must_match(store):
+    session = store.create("p", "clip.mp4", "", len(DATA))
+    send(store, session.id, 0, DATA[:10])
+
+    with pytest.raises(UploadOffsetMismatch) as exc:
+        store.open_chunk(session.id, 0)
+    assert exc.value.expected == 10
+
+    with pytest.raises(UploadOffsetMismatch):
+        store.complete(session.id)
+
+def test_abandoned_chunk_is_dropped(store):
+    session = store.create("p", "clip.mp4", "", len(DATA))
+    writer = store.open_chunk(session.id, 0)
+    with pytest.raises(UploadBusy):
+        store.open_chunk(session.id, 0)
+    writer.write(b"garbage")
+    writer.close()
+
+    send(store, session.id, 0, DATA)
+    with store.complete(session.id) as done:
+        assert Path(done.part_path).read_bytes() == DATA
+        assert done.written.sha256 == hashlib.sha256(DATA).hexdigest()
+
+def test_chunk_past_declared_size(store):
+    session = store.create("p", "clip.mp4", "", 5)
+    writer = store.open_chunk(session.id, 0)
+    with pytest.raises(ValueError):
+        writer.write(b"too long")
+    writer.close()
+    assert store.get(session.id).offset == 0
+
+def test_expire_only_stale_sessions(store):
+    active = store.create("p", "a.mp4", "", 1)
+    stale = store.create("p", "b.mp4", "", 1)
+
+    session = store.get(stale.id)
+    session.updated_at = time.time() - 3600
+    store._save(session)
+
+    assert store.expire(max_age=60) == 1
+    assert store.get(active.id)
+    with pytest.raises(UploadNotFound):
+        store.get(stale.id)
+
+def test_rejects_bad_ids(store):
+    with pytest.raises(UploadNotFound):
+        store.get("../../people")
+
+def test_truncated_part_file_cannot_resume(tmp_path, store):
+    session = store.create("some--person", "clip.mp4", "video/mp4", len(DATA))
+    send(store, session.id, 0, DATA)
+    part_path = store._part_path(session.id)
+    with open(part_path, "r+b") as f:
+        f.truncate(4000)
+
+    # A restarted store has to rehash the part file and notices
+    restarted = UploadSessionStore(str(tmp_path))
+    with pytest.raises(UploadCorrupt, match="shorter than its committed offset"):
+        restarted.complete(session.id)
+    # Not zero-filled back to the committed size
+    assert os.path.getsize(part_path) == 4000
+
+    os.remove(part_path)
+    with pytest.raises(UploadCorrupt, match="lost its data"):
+        restarted.open_chunk(session.id, len(DATA))
+    # The failed open released the session's lock
+    with pytest.raises(UploadCorrupt):
+        restarted.open_chunk(session.id, len(DATA))
+
+def test_complete_holds_the_session_until_discarded(store):
+    session = store.create("p", "clip.mp4", "", len(DATA))
+    send(store, session.id, 0, DATA)
+
+    done = store.complete(session.id)
+    # A retried or concurrent complete can't also finalize it
+    with pytest.raises(UploadBusy):
+        store.complete(session.id)
+    with pytest.raises(UploadBusy):
+        store.open_chunk(session.id, len(DATA))
+
+    os.replace(done.part_path, str(Path(store.root_path) / "clip.mp4"))
+    done.discard()
+    with pytest.raises(UploadNotFound):
+        store.complete(session.id)
+
+def test_closed_completion_can_be_retried(store):
+    session = store.create("p", "clip.mp4", "", len(DATA))
+    send(store, session.id, 0, DATA)
+    with store.complete(session.id):
+        pass
+    # e.g. finalizing failed: the session is still there and unlocked
+    with store.complete(session.id) as done:
+        assert done.written.size == len(DATA)
@@ -0,0 +1,126 @@
+import pytest
+import sys
+import textwrap
+from pathlib import Path
+
+packages_dir = Path(__file__).resolve().parent.parent.parent.parent
+sys.path.append(str(packages_dir / "ingest-logic" / "src"))
+sys.path.append(str(packages_dir / "contracts" / "src"))
+
+from ingest_logic.transcription import whisper_pool
+from ingest_logic.transcription.whisper_pool import WhisperProcessPool, WhisperProcessProvider
+
+FAKE_WHISPER = '''
+import os
+
+class _Model:
+    def transcribe(self, path):
+        if not isinstance(path, str):
+            # An array of samples: report its length in seconds
+            seconds = len(path) / 16000
+            return {
+                "text": f" {seconds:g}s",
+                "segments": [{"start": 0.0, "end": seconds, "text": f" {seconds:g}s"}],
+            }
+        if path.endswith("crash.wav"):
+            os._exit(3)
+        if path.endswith("bad.wav"):
+            raise ValueError("cannot decode")
+        return {"text": f"{os.getpid()}:{os.path.basename(path)}"}
+
+def load_model(size):
+    if size == "broken":
+        raise RuntimeError("no such model")
+    return _Model()
+'''
+
+@pytest.fixture
+def fake_whisper(tmp_path, monkeypatch):
+    """A stand-in whisper module that only the spawned workers import."""
+    mod_dir = tmp_path / "fake_modules"
+    mod_dir.mkdir()
+    (mod_dir / "whisper.py").write_text(textwrap.dedent(FAKE_WHISPER))
+    monkeypatch.syspath_prepend(str(mod_dir))
+    monkeypatch.delitem(sys.modules, "whisper", raising=False)
+    return mod_dir
+
+def test_pool_transcribes_in_worker_processes(fake_whisper):
+    pool = WhisperProcessPool("base", processes=2)
+    pool.start(wait=True, timeout=30)
+    try:
+        texts = [pool.transcribe(f"/x/{i}.wav", timeout=30) for i in range(4)]
+        assert [t.split(":")[1] for t in texts] == ["0.wav", "1.wav", "2.wav", "3.wav"]
+        assert all(int(t.split(":")[0]) in pool._workers for t in texts)
+
+        with pytest.raises(RuntimeError, match="cannot decode"):
+            pool.transcribe("/x/bad.wav", timeout=30)
+    finally:
+        pool.stop()
+
+    # The model is only ever imported by the workers
+    assert "whisper" not in sys.modules
+
+def test_crashed_worker_fails_job_and_is_replaced(fake_whisper):
+    pool = WhisperProcessPool("base", processes=1)
+    pool.start(wait=True, timeout=30)
+    try:
+        with pytest.raises(RuntimeError, match="exited with code 3"):
+            pool.transcribe("/x/crash.wav", timeout=30)
+        assert pool.transcribe("/x/ok.wav", timeout=30).endswith(":ok.wav")
+    finally:
+        pool.stop()
+
+def test_model_load_failure_is_reported(fake_whisper):
+    pool = WhisperProcessPool("broken", processes=1)
+    pool.start(wait=True, timeout=30)
+    try:
+        with pytest.raises(RuntimeError, match="no such model"):
+            pool.transcribe("/x/a.wav", timeout=30)
+        assert pool.info()["load_error"]
+    finally:
+        pool.stop()
+
+def test_cache_key_follows_segmentation():
+    whole = WhisperProcessProvider("base", processes=1, segment_seconds=60)
+    unsplit = WhisperProcessProvider("base", processes=2, segment_seconds=0)
+    by_60 = WhisperProcessProvider("base", processes=2, segment_seconds=60)
+    by_120 = WhisperProcessProvider("base", processes=4, segment_seconds=120)
+
+    # Whole-file transcripts match what in-process Whisper would produce
+    assert whole.prompt_version == unsplit.prompt_version == ""
+    assert len({"", by_60.prompt_version, by_120.prompt_version}) == 3
+
+def test_provider_transcribes_segments_in_parallel(fake_whisper, tmp_path, monkeypatch):
+    np = pytest.importorskip("numpy")
+    media = tmp_path / "long.wav"
+    media.write_bytes(b"")
+    # 50s of tone, 2s pause, 50s of tone, 2s pause, 20s of tone
+    tone = lambda s: np.full(int(s * 16000), 0.5, dtype=np.float32)
+    pause = np.zeros(2 * 16000, dtype=np.float32)
+    audio = np.concatenate([tone(50), pause, tone(50), pause, tone(20)])
+    # Stands in for the PCM cache ensure_pcm would decode next to media
+    pcm = tmp_path / "long.audio.pcm"
+    (audio * 32767).astype(np.int16).tofile(pcm)
+    monkeypatch.setattr(whisper_pool, "ensure_pcm", lambda path: str(pcm))
+
+    progress = []
+    provider = WhisperProcessProvider("base", processes=2, segment_seconds=60)
+    provider.start()
+    try:
+        transcript = provider.transcribe_timed(
+            str(media), on_progress=lambda segs, done, total: progress.append((segs, done, total))
+        )
+    finally:
+        provider.close()
+
+    # Cut inside each pause, pieces stitched in order with shifted times
+    assert len(transcript.segments) == 3
+    starts = [s.start for s in transcript.segments]
+    assert 50 <= starts[1] <= 52 and 102 <= starts[2] <= 104
+    assert transcript.segments[-1].end == pytest.approx(124)
+    assert transcript.text.count("s") == 3
+
+    # Reported piece by piece, in order, ending at the full duration
+    assert [p[0] for p in progress] == [[s] for s in transcript.segments]
+    assert [p[1] for p in progress] == sorted(p[1] for p in progress)
+    assert progress[-1][1] == progress[-1][2] == pytest.approx(124)
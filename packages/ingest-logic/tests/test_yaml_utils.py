@@ -0,0 +1,36 @@
+import pytest
+from ingest_logic.common.yaml_utils import load_yaml, load_yaml_fast, save_yaml
+
+def test_load_yaml_fast_matches_round_trip(tmp_path):
+    path = tmp_path / "bio.yaml"
+    path.write_text(
+        "# user comment\n"
+        "id: abc\n"
+        "names:\n"
+        "  - type: primary\n"
+        "    given: Jane\n"
+        "    surname: Doe\n"
+        "vitals:\n"
+        "  birth:\n"
+        "    date: '1990-01-01'\n"
+    )
+
+    fast = load_yaml_fast(str(path))
+    assert type(fast) is dict
+    assert fast == load_yaml(str(path))
+    assert fast["vitals"]["birth"]["date"] == "1990-01-01"
+
+def test_load_yaml_fast_missing_file(tmp_path):
+    assert load_yaml_fast(str(tmp_path / "ghost.yaml")) is None
+
+def test_round_trip_still_preserves_comments(tmp_path):
+    path = tmp_path / "meta.yaml"
+    path.write_text("# keep me\nstatus: pending  # inline\n")
+
+    data = load_yaml(str(path))
+    data["status"] = "done"
+    save_yaml(str(path), data)
+
+    text = path.read_text()
+    assert "# keep me" in text
+    assert "# inline" in text
@@ -0,0 +1,81 @@
+"""
+Bulk-creates people in an archive from a CSV or JSONL file.
+
+Columns/keys: family_name, given_name, dob (required), suffix, bio.
+People whose ID already exists are skipped. A per-row report is printed
+as JSON (or written to --report).
+
+Usage:
+    python tools/import_people.py people.csv --archive /Volumes/Estate
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add packages to path so we can import ingest_logic and contracts
+package_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "packages")
+sys.path.append(os.path.join(package_root, "ingest-logic", "src"))
+sys.path.append(os.path.join(package_root, "contracts", "src"))
+
+from ingest_logic.archive import read_id_scheme
+from ingest_logic.config import ConfigManager
+from ingest_logic.index import open_archive_index
+from ingest_logic.people.bulk_import import detect_format, import_people, iter_rows
+from ingest_logic.people.manager import PersonManager
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("file", help="Path to a .csv or .jsonl file")
+    parser.add_argument("--archive", help="Archive root (default: configured archive root, then SSD_MOUNT_PATH)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Override format detection by extension")
+    parser.add_argument("--batch-size", type=int, default=500, help="People per group commit")
+    parser.add_argument("--workers", type=int, default=4, help="Batches written concurrently")
+    parser.add_argument("--report", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    config_manager = ConfigManager()
+    archive_root = args.archive or config_manager.get_archive_root() or os.getenv("SSD_MOUNT_PATH")
+    if not archive_root:
+        parser.error("No archive root: pass --archive or configure one in the app")
+    archive_root = os.path.abspath(str(archive_root))
+
+    try:
+        fmt = args.format or detect_format(args.file)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Keep the app's index in sync, and bring it up to date first so that
+    # duplicate detection sees people added outside the app. New IDs use
+    # the archive's own scheme, as in the app.
+    index = open_archive_index(str(config_manager.index_path(archive_root)))
+    manager = PersonManager(archive_root, index=index, id_scheme=read_id_scheme(archive_root))
+    if index.is_built():
+        manager.refresh_index()
+    else:
+        manager.rebuild_index()
+
+    started = time.perf_counter()
+    with open(args.file, "r", encoding="utf-8", newline="") as f:
+        report = import_people(manager, iter_rows(f, fmt), batch_size=args.batch_size, max_workers=args.workers)
+    elapsed = time.perf_counter() - started
+
+    output = report.model_dump_json(indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    print(
+        f"Imported {report.created} people, skipped {report.skipped}, failed {report.failed} "
+        f"in {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())